@@ -79,6 +79,7 @@ def run_migrations_online() -> None:
     并将连接与上下文关联。
     """
     # 从 alembic.ini 中的配置创建引擎
+    # 注意：整个迁移过程只使用下面这一个连接，NullPool 不会为每条语句新建连接
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -88,7 +89,10 @@ def run_migrations_online() -> None:
     with connectable.connect() as connection:
         context.configure(
             connection=connection,
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            # 每个迁移版本单独提交事务：多个版本连续升级时，
+            # 大批量数据迁移不会长时间持有同一个事务和锁，失败时也只回滚当前版本
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
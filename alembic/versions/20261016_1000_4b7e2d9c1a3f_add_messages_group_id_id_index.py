@@ -0,0 +1,26 @@
+"""Add messages (group_id, id) index for cursor pagination
+
+Revision ID: 4b7e2d9c1a3f
+Revises: 25c8f48abee5
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2d9c1a3f'
+down_revision: Union[str, None] = '25c8f48abee5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 游标分页（before_id）：WHERE group_id = ? AND id < ? ORDER BY id DESC
+    op.create_index('idx_messages_group_id_id', 'messages', ['group_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_messages_group_id_id', table_name='messages')
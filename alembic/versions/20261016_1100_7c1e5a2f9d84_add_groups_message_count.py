@@ -0,0 +1,38 @@
+"""Add groups.message_count denormalized counter
+
+Revision ID: 7c1e5a2f9d84
+Revises: 4b7e2d9c1a3f
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5a2f9d84'
+down_revision: Union[str, None] = '4b7e2d9c1a3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 消息列表分页的总数改为读取该计数，发送消息时在同一事务内递增
+    op.add_column(
+        'groups',
+        sa.Column('message_count', sa.Integer(), server_default='0', nullable=False, comment='群组消息数量'),
+    )
+    # 回填已有群组的消息数量
+    op.execute(
+        """
+        UPDATE groups SET message_count = (
+            SELECT COUNT(*) FROM messages WHERE messages.group_id = groups.group_id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('groups', 'message_count')
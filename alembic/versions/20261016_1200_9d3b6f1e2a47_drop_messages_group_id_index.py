@@ -0,0 +1,47 @@
+"""Drop redundant messages.group_id single-column index
+
+Revision ID: 9d3b6f1e2a47
+Revises: 7c1e5a2f9d84
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3b6f1e2a47'
+down_revision: Union[str, None] = '7c1e5a2f9d84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _messages_has_index(index_name: str) -> bool:
+    """检查 messages 表上是否存在指定名称的索引（只看 messages 表）"""
+    inspector = sa.inspect(op.get_bind())
+    return any(index["name"] == index_name for index in inspector.get_indexes('messages'))
+
+
+def upgrade() -> None:
+    # idx_group_created (group_id, created_at) 和 idx_messages_group_id_id (group_id, id)
+    # 均以 group_id 开头，已覆盖 WHERE group_id = ? 查询，单列索引只增加写入开销。
+    # PostgreSQL 中索引名全库唯一，初始迁移可能因 ai_interaction_records 已占用 idx_group_id
+    # 而未在 messages 上创建该索引，因此只在 messages 表确实存在时删除。
+    if _messages_has_index('idx_group_id'):
+        op.drop_index('idx_group_id', table_name='messages')
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # 索引名全库唯一：名称已被其他表占用时与初始迁移一致，跳过创建
+        taken = bind.execute(
+            sa.text("SELECT 1 FROM pg_indexes WHERE indexname = :index_name"),
+            {"index_name": 'idx_group_id'},
+        ).fetchone()
+        if taken is not None:
+            return
+    if not _messages_has_index('idx_group_id'):
+        op.create_index('idx_group_id', 'messages', ['group_id'], unique=False)
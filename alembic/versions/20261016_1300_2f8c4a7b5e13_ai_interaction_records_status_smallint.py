@@ -0,0 +1,41 @@
+"""Store ai_interaction_records.status as SMALLINT
+
+Revision ID: 2f8c4a7b5e13
+Revises: 9d3b6f1e2a47
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f8c4a7b5e13'
+down_revision: Union[str, None] = '9d3b6f1e2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 状态只有 0/1/2 三个取值，SMALLINT 足够，缩小行和 idx_status 索引的体积
+    op.alter_column(
+        'ai_interaction_records',
+        'status',
+        existing_type=sa.Integer(),
+        type_=sa.SmallInteger(),
+        existing_nullable=False,
+        existing_comment='状态：0-处理中，1-成功，2-失败',
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'ai_interaction_records',
+        'status',
+        existing_type=sa.SmallInteger(),
+        type_=sa.Integer(),
+        existing_nullable=False,
+        existing_comment='状态：0-处理中，1-成功，2-失败',
+    )
@@ -0,0 +1,54 @@
+"""Store ai_interaction_records request/response content as JSON
+
+Revision ID: 6a1d9e3c7b52
+Revises: 2f8c4a7b5e13
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1d9e3c7b52'
+down_revision: Union[str, None] = '2f8c4a7b5e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_CONTENT_COLUMNS = (
+    ('request_content', '请求内容（JSON格式）'),
+    ('response_content', '响应内容（JSON格式）'),
+)
+
+
+def upgrade() -> None:
+    # PostgreSQL 使用 JSONB，MySQL 使用原生 JSON；已有数据须为合法 JSON 文本
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+    for column_name, comment in _CONTENT_COLUMNS:
+        op.alter_column(
+            'ai_interaction_records',
+            column_name,
+            existing_type=sa.Text(),
+            type_=postgresql.JSONB() if is_postgresql else sa.JSON(),
+            existing_nullable=True,
+            existing_comment=comment,
+            postgresql_using=f'{column_name}::jsonb',
+        )
+
+
+def downgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+    for column_name, comment in _CONTENT_COLUMNS:
+        op.alter_column(
+            'ai_interaction_records',
+            column_name,
+            existing_type=postgresql.JSONB() if is_postgresql else sa.JSON(),
+            type_=sa.Text(),
+            existing_nullable=True,
+            existing_comment=comment,
+            postgresql_using=f'{column_name}::text',
+        )
@@ -0,0 +1,48 @@
+"""Replace group_members.group_id index with (group_id, joined_at)
+
+Revision ID: b8e3f5a1c726
+Revises: 6a1d9e3c7b52
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e3f5a1c726'
+down_revision: Union[str, None] = '6a1d9e3c7b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _group_members_has_index(index_name: str) -> bool:
+    """检查 group_members 表上是否存在指定名称的索引（只看 group_members 表）"""
+    inspector = sa.inspect(op.get_bind())
+    return any(index["name"] == index_name for index in inspector.get_indexes('group_members'))
+
+
+def upgrade() -> None:
+    # 成员列表查询：WHERE group_id = ? ORDER BY joined_at，复合索引按加入时间顺序直接读取，无需排序
+    op.create_index('idx_group_members_group_joined', 'group_members', ['group_id', 'joined_at'], unique=False)
+    # 新索引以 group_id 开头，覆盖单列索引的全部查询；
+    # PostgreSQL 中索引名全库唯一，初始迁移可能未在 group_members 上创建 idx_group_id，因此只在确实存在时删除。
+    if _group_members_has_index('idx_group_id'):
+        op.drop_index('idx_group_id', table_name='group_members')
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    recreate = not _group_members_has_index('idx_group_id')
+    if recreate and bind.dialect.name == 'postgresql':
+        # 索引名全库唯一：名称已被其他表占用时与初始迁移一致，跳过创建
+        taken = bind.execute(
+            sa.text("SELECT 1 FROM pg_indexes WHERE indexname = :index_name"),
+            {"index_name": 'idx_group_id'},
+        ).fetchone()
+        recreate = taken is None
+    if recreate:
+        op.create_index('idx_group_id', 'group_members', ['group_id'], unique=False)
+    op.drop_index('idx_group_members_group_joined', table_name='group_members')
@@ -4,14 +4,18 @@
 提供群组相关的HTTP API接口。
 """
 
-from fastapi import APIRouter, Depends, status, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import get_db
 from app.services.core.group_service import GroupService
-from app.schemas.group import GroupCreate, GroupResponse, GroupMemberAdd
-from app.utils.response import success_response
-from app.utils.exceptions import NotFoundError, ValidationError, ConflictError
+from app.schemas.group import GroupCreate, GroupResponse, GroupMemberAdd, GroupMemberBulkAdd
+from app.utils.response import (
+    success_response,
+    success_json_response,
+    etag_json_response,
+)
+from app.utils.exceptions import NotFoundError
 
 
 # 创建路由器
@@ -20,12 +24,12 @@ router = APIRouter(tags=["群组"])
 
 # ==================== 依赖注入 ====================
 
-def get_group_service(db: Session = Depends(get_db)) -> GroupService:
+async def get_group_service(db: AsyncSession = Depends(get_db)) -> GroupService:
     """
     获取群组服务实例（依赖注入）
     
     Args:
-        db: 数据库会话
+        db: 异步数据库会话
         
     Returns:
         GroupService: 群组服务实例
@@ -61,68 +65,51 @@ async def create_group(
         dict: 创建的群组信息
         
     Raises:
-        HTTPException: 当创建失败时抛出
+        NotFoundError: 当创建人不存在时抛出
+        ConflictError: 当群组ID冲突时抛出
+        ValidationError: 当创建失败时抛出
     """
-    try:
-        group_response = service.create_group(group_create, creator_id)
-        return success_response(
-            data=group_response.model_dump(),
-            message="群组创建成功"
-        )
-    except NotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message
-        )
-    except ValidationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=e.message
-        )
-    except ConflictError as e:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=e.message
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"创建群组失败: {str(e)}"
-        )
+    group_response = await service.create_group(group_create, creator_id)
+    return success_response(
+        data=group_response.model_dump(),
+        message="群组创建成功"
+    )
 
 
 @router.get(
     "/group/{group_id}",
     response_model=dict,
     summary="获取群组信息",
-    description="根据 group_id 获取群组信息",
+    description="根据 group_id 获取群组信息，支持 ETag / If-None-Match 条件请求",
 )
 async def get_group(
     group_id: str,
+    request: Request,
     service: GroupService = Depends(get_group_service),
-) -> dict:
+) -> Response:
     """
     获取群组信息
     
+    响应附带 ETag，客户端携带 If-None-Match 且群组信息未变化时返回 304。
+    
     Args:
         group_id: 群组唯一标识
+        request: 当前请求
         service: 群组服务（依赖注入）
         
     Returns:
         dict: 群组信息
         
     Raises:
-        HTTPException: 当群组不存在时抛出
+        NotFoundError: 当群组不存在时抛出
     """
-    group_response = service.get_group(group_id)
+    group_response = await service.get_group(group_id)
     if not group_response:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"群组 {group_id} 不存在"
-        )
+        raise NotFoundError(f"群组 {group_id} 不存在")
     
-    return success_response(
-        data=group_response.model_dump(),
+    return etag_json_response(
+        request,
+        data=group_response,
         message="获取群组成功"
     )
 
@@ -151,34 +138,50 @@ async def add_member(
         dict: 添加结果
         
     Raises:
-        HTTPException: 当添加失败时抛出
+        NotFoundError: 当群组不存在或用户不存在时抛出
+        ConflictError: 当用户已在群组中时抛出
+        ValidationError: 当user_role无效时抛出
     """
-    try:
-        success = service.add_member(group_id, member_add)
-        return success_response(
-            data={"success": success},
-            message="添加成员成功"
-        )
-    except NotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message
-        )
-    except ValidationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=e.message
-        )
-    except ConflictError as e:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=e.message
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"添加成员失败: {str(e)}"
-        )
+    success = await service.add_member(group_id, member_add)
+    return success_response(
+        data={"success": success},
+        message="添加成员成功"
+    )
+
+
+@router.post(
+    "/group/{group_id}/members/bulk",
+    response_model=dict,
+    status_code=status.HTTP_201_CREATED,
+    summary="批量添加群组成员",
+    description="向群组批量添加成员（一次最多500个），任一成员校验失败时不会添加任何成员",
+)
+async def add_members(
+    group_id: str,
+    member_bulk_add: GroupMemberBulkAdd,
+    service: GroupService = Depends(get_group_service),
+) -> dict:
+    """
+    批量添加群组成员
+    
+    Args:
+        group_id: 群组ID
+        member_bulk_add: 成员批量添加数据
+        service: 群组服务（依赖注入）
+        
+    Returns:
+        dict: 添加结果（添加的成员数量）
+        
+    Raises:
+        NotFoundError: 当群组不存在或有用户不存在时抛出
+        ConflictError: 当有用户已在群组中时抛出
+        ValidationError: 当user_id重复或user_role无效时抛出
+    """
+    count = await service.add_members(group_id, member_bulk_add.members)
+    return success_response(
+        data={"count": count},
+        message="批量添加成员成功"
+    )
 
 
 @router.get(
@@ -190,7 +193,7 @@ async def add_member(
 async def get_group_members(
     group_id: str,
     service: GroupService = Depends(get_group_service),
-) -> dict:
+) -> Response:
     """
     获取群组成员列表
     
@@ -202,21 +205,10 @@ async def get_group_members(
         dict: 成员列表
         
     Raises:
-        HTTPException: 当群组不存在时抛出
+        NotFoundError: 当群组不存在时抛出
     """
-    try:
-        members = service.get_group_members(group_id)
-        return success_response(
-            data={"members": members},
-            message="获取成员列表成功"
-        )
-    except NotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"获取成员列表失败: {str(e)}"
-        )
+    members = await service.get_group_members(group_id)
+    return success_json_response(
+        data={"members": members},
+        message="获取成员列表成功"
+    )
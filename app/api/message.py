@@ -4,15 +4,20 @@
 提供消息相关的HTTP API接口。
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, status, HTTPException, Query
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.session import get_async_db_session
 from app.dependencies import get_db
 from app.services.core.message_service import MessageService
 from app.schemas.message import MessageCreate, MessageResponse, MessageListResponse
-from app.utils.response import success_response
-from app.utils.exceptions import NotFoundError, ValidationError, ConflictError
+from app.utils.response import (
+    success_response,
+    success_json_response,
+    etag_json_response,
+)
 
 
 # 创建路由器
@@ -21,12 +26,12 @@ router = APIRouter(tags=["消息"])
 
 # ==================== 依赖注入 ====================
 
-def get_message_service(db: Session = Depends(get_db)) -> MessageService:
+async def get_message_service(db: AsyncSession = Depends(get_db)) -> MessageService:
     """
     获取消息服务实例（依赖注入）
     
     Args:
-        db: 数据库会话
+        db: 异步数据库会话
         
     Returns:
         MessageService: 消息服务实例
@@ -62,133 +67,156 @@ async def send_message(
         dict: 创建的消息信息
         
     Raises:
-        HTTPException: 当发送失败时抛出
+        NotFoundError: 当群组不存在或发送人不在群组中时抛出
+        ValidationError: 当发送失败时抛出
     """
-    try:
-        message_response = service.send_message(message_create, from_user_id)
-        return success_response(
-            data=message_response.model_dump(),
-            message="消息发送成功"
-        )
-    except NotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message
-        )
-    except ValidationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=e.message
-        )
-    except ConflictError as e:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=e.message
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"发送消息失败: {str(e)}"
-        )
+    message_response = await service.send_message(message_create, from_user_id)
+    return success_response(
+        data=message_response.model_dump(),
+        message="消息发送成功"
+    )
 
 
 @router.get(
-    "/message/{message_id}",
+    "/message/list",
     response_model=dict,
-    summary="获取单条消息",
-    description="根据 message_id 获取单条消息详情",
+    summary="获取消息列表",
+    description="获取群组的消息列表，支持页码分页和游标分页（before_id）",
 )
-async def get_message(
-    message_id: str,
+async def get_messages(
+    group_id: str = Query(..., description="群组ID"),
+    page: int = Query(1, ge=1, description="页码（从1开始）"),
+    page_size: int = Query(20, ge=1, le=100, description="每页数量（1-100）"),
+    before_id: Optional[int] = Query(
+        None,
+        ge=1,
+        description="游标：返回 id 小于该值的消息（传入后忽略 page，取上一页返回的 next_before_id）",
+    ),
     service: MessageService = Depends(get_message_service),
-) -> dict:
+) -> Response:
     """
-    获取单条消息
+    获取消息列表
+    
+    获取群组的消息列表，支持分页。消息按时间倒序排列。
+    深度翻页建议使用游标分页：首次请求不传 before_id，之后传入响应中的 next_before_id。
     
     Args:
-        message_id: 消息唯一标识
+        group_id: 群组ID（查询参数）
+        page: 页码（从1开始，默认1）
+        page_size: 每页数量（1-100，默认20）
+        before_id: 游标（可选），传入时使用游标分页
         service: 消息服务（依赖注入）
         
     Returns:
-        dict: 消息信息
+        dict: 消息列表和分页信息
         
     Raises:
-        HTTPException: 当消息不存在时抛出
+        NotFoundError: 当群组不存在时抛出
+        ValidationError: 当分页参数无效时抛出
     """
-    try:
-        message_response = service.get_message(message_id)
-        return success_response(
-            data=message_response.model_dump(),
-            message="获取消息成功"
-        )
-    except NotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"获取消息失败: {str(e)}"
-        )
+    messages, total, next_before_id = await service.get_messages(group_id, page, page_size, before_id)
+
+    # 直接序列化为 JSON，避免逐条 model_dump() 后再二次编码
+    return success_json_response(
+        data=MessageListResponse(
+            messages=messages,
+            total=total,
+            page=page,
+            page_size=page_size,
+            has_more=next_before_id is not None,
+            next_before_id=next_before_id
+        ),
+        message="获取消息列表成功"
+    )
 
 
 @router.get(
-    "/message/list",
-    response_model=dict,
-    summary="获取消息列表",
-    description="获取群组的消息列表，支持分页",
+    "/message/export",
+    summary="导出群组消息",
+    description="以 NDJSON（每行一条消息）流式导出群组的全部消息，按时间正序",
+    response_class=StreamingResponse,
 )
-async def get_messages(
+async def export_messages(
     group_id: str = Query(..., description="群组ID"),
-    page: int = Query(1, ge=1, description="页码（从1开始）"),
-    page_size: int = Query(20, ge=1, le=100, description="每页数量（1-100）"),
     service: MessageService = Depends(get_message_service),
-) -> dict:
+) -> StreamingResponse:
     """
-    获取消息列表
+    导出群组消息
     
-    获取群组的消息列表，支持分页。消息按创建时间倒序排列。
+    边从数据库读取边输出，服务端内存占用与消息总数无关，首字节无需等待全部消息查询完成。
     
     Args:
         group_id: 群组ID（查询参数）
-        page: 页码（从1开始，默认1）
-        page_size: 每页数量（1-100，默认20）
         service: 消息服务（依赖注入）
         
     Returns:
-        dict: 消息列表和分页信息
+        StreamingResponse: NDJSON 流，每行一条消息
         
     Raises:
-        HTTPException: 当获取失败时抛出
+        NotFoundError: 当群组不存在时抛出
+    """
+    # 开始输出前校验群组，保证错误仍以正常的错误响应返回
+    await service.ensure_group_exists(group_id)
+    
+    return StreamingResponse(
+        _export_messages_ndjson(group_id),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _export_messages_ndjson(group_id: str) -> AsyncIterator[str]:
+    """
+    生成群组消息的 NDJSON 流
+    
+    使用独立的数据库会话，会话生命周期与响应流一致，不依赖请求依赖项的关闭时机。
+    
+    Args:
+        group_id: 群组ID
+        
+    Yields:
+        str: 一条消息的 JSON 及换行符
     """
+    db = get_async_db_session()
     try:
-        messages, total = service.get_messages(group_id, page, page_size)
+        service = MessageService(db)
+        async for message in service.iter_messages(group_id):
+            yield message.model_dump_json() + "\n"
+    finally:
+        await db.close()
+
+
+# 注意：路径参数路由必须在 /message/list、/message/export 等固定路径之后注册，
+# 否则固定路径的请求会先被 /message/{message_id} 匹配
+@router.get(
+    "/message/{message_id}",
+    response_model=dict,
+    summary="获取单条消息",
+    description="根据 message_id 获取单条消息详情，支持 ETag / If-None-Match 条件请求",
+)
+async def get_message(
+    message_id: str,
+    request: Request,
+    service: MessageService = Depends(get_message_service),
+) -> Response:
+    """
+    获取单条消息
+    
+    响应附带 ETag，客户端携带 If-None-Match 时返回 304（消息创建后不再修改）。
+    
+    Args:
+        message_id: 消息唯一标识
+        request: 当前请求
+        service: 消息服务（依赖注入）
         
-        # 转换为字典列表
-        messages_data = [msg.model_dump() for msg in messages]
+    Returns:
+        dict: 消息信息
         
-        return success_response(
-            data={
-                "messages": messages_data,
-                "total": total,
-                "page": page,
-                "page_size": page_size
-            },
-            message="获取消息列表成功"
-        )
-    except NotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message
-        )
-    except ValidationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=e.message
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"获取消息列表失败: {str(e)}"
-        )
+    Raises:
+        NotFoundError: 当消息不存在时抛出
+    """
+    message_response = await service.get_message(message_id)
+    return etag_json_response(
+        request,
+        data=message_response,
+        message="获取消息成功"
+    )
@@ -5,15 +5,15 @@
 """
 
 from typing import Optional
-from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from app.dependencies import get_db
 from app.services.core.user_service import UserService
 from app.schemas.user import UserCreate, UserResponse
-from app.utils.response import success_response
-from app.utils.exceptions import NotFoundError, ValidationError, ConflictError
+from app.utils.response import success_response, etag_json_response
+from app.utils.exceptions import NotFoundError
 
 
 # 创建路由器
@@ -22,12 +22,12 @@ router = APIRouter(tags=["用户"])
 
 # ==================== 依赖注入 ====================
 
-def get_user_service(db: Session = Depends(get_db)) -> UserService:
+async def get_user_service(db: AsyncSession = Depends(get_db)) -> UserService:
     """
     获取用户服务实例（依赖注入）
     
     Args:
-        db: 数据库会话
+        db: 异步数据库会话
         
     Returns:
         UserService: 用户服务实例
@@ -66,63 +66,50 @@ async def create_user(
         dict: 创建的用户信息
         
     Raises:
-        HTTPException: 当创建失败时抛出
+        ValidationError: 当user_role无效时抛出
+        ConflictError: 当user_id已存在时抛出
     """
-    try:
-        user_response = service.create_user(user_create)
-        return success_response(
-            data=user_response.model_dump(),
-            message="用户创建成功"
-        )
-    except ValidationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=e.message
-        )
-    except ConflictError as e:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=e.message
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"创建用户失败: {str(e)}"
-        )
+    user_response = await service.create_user(user_create)
+    return success_response(
+        data=user_response.model_dump(),
+        message="用户创建成功"
+    )
 
 
 @router.get(
     "/user/{user_id}",
     response_model=dict,
     summary="获取用户信息",
-    description="根据 user_id 获取用户信息",
+    description="根据 user_id 获取用户信息，支持 ETag / If-None-Match 条件请求",
 )
 async def get_user(
     user_id: str,
+    request: Request,
     service: UserService = Depends(get_user_service),
-) -> dict:
+) -> Response:
     """
     获取用户信息
     
+    响应附带 ETag，客户端携带 If-None-Match 且用户信息未变化时返回 304。
+    
     Args:
         user_id: 用户唯一标识
+        request: 当前请求
         service: 用户服务（依赖注入）
         
     Returns:
         dict: 用户信息
         
     Raises:
-        HTTPException: 当用户不存在时抛出
+        NotFoundError: 当用户不存在时抛出
     """
-    user_response = service.get_user(user_id)
+    user_response = await service.get_user(user_id)
     if not user_response:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"用户 {user_id} 不存在"
-        )
+        raise NotFoundError(f"用户 {user_id} 不存在")
     
-    return success_response(
-        data=user_response.model_dump(),
+    return etag_json_response(
+        request,
+        data=user_response,
         message="获取用户成功"
     )
 
@@ -150,26 +137,11 @@ async def update_user_role(
         dict: 更新后的用户信息
         
     Raises:
-        HTTPException: 当用户不存在或user_role无效时抛出
+        NotFoundError: 当用户不存在时抛出
+        ValidationError: 当user_role无效时抛出
     """
-    try:
-        user_response = service.update_user_role(user_id, request.user_role)
-        return success_response(
-            data=user_response.model_dump(),
-            message="用户身份更新成功"
-        )
-    except NotFoundError as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message
-        )
-    except ValidationError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=e.message
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"更新用户身份失败: {str(e)}"
-        )
+    user_response = await service.update_user_role(user_id, request.user_role)
+    return success_response(
+        data=user_response.model_dump(),
+        message="用户身份更新成功"
+    )
@@ -6,7 +6,7 @@
 
 from typing import Optional
 from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import get_db
 from app.services.user_service import UserService
@@ -26,12 +26,12 @@ router = APIRouter(prefix="/users", tags=["用户"])
 
 # ==================== 依赖注入 ====================
 
-def get_user_service(db: Session = Depends(get_db)) -> UserService:
+async def get_user_service(db: AsyncSession = Depends(get_db)) -> UserService:
     """
     获取用户服务实例（依赖注入）
     
     Args:
-        db: 数据库会话
+        db: 异步数据库会话
         
     Returns:
         UserService: 用户服务实例
@@ -62,7 +62,7 @@ async def create_user(
     Returns:
         dict: 创建的用户信息
     """
-    user = service.create_user(user_data)
+    user = await service.create_user(user_data)
     return success_response(
         data=UserResponse.model_validate(user).model_dump(),
         message="用户创建成功"
@@ -89,7 +89,7 @@ async def get_user(
     Returns:
         dict: 用户信息
     """
-    user = service.get_user_by_id(user_id)
+    user = await service.get_user_by_id(user_id)
     return success_response(
         data=UserResponse.model_validate(user).model_dump(),
         message="获取用户成功"
@@ -118,7 +118,7 @@ async def update_user(
     Returns:
         dict: 更新后的用户信息
     """
-    user = service.update_user(user_id, user_data)
+    user = await service.update_user(user_id, user_data)
     return success_response(
         data=UserResponse.model_validate(user).model_dump(),
         message="用户更新成功"
@@ -146,7 +146,7 @@ async def delete_user(
     Returns:
         dict: 删除结果
     """
-    service.delete_user(user_id)
+    await service.delete_user(user_id)
     return success_response(message="用户删除成功")
 
 
@@ -174,7 +174,7 @@ async def get_users(
     Returns:
         dict: 用户列表（分页）
     """
-    result: PaginationResult[User] = service.get_users(
+    result: PaginationResult[User] = await service.get_users(
         page=page,
         page_size=page_size,
         is_active=is_active
@@ -221,7 +221,7 @@ async def search_users(
     Returns:
         dict: 搜索结果（分页）
     """
-    result: PaginationResult[User] = service.search_users(
+    result: PaginationResult[User] = await service.search_users(
         keyword=keyword,
         page=page,
         page_size=page_size
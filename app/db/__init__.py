@@ -2,20 +2,56 @@
 数据库模块
 
 提供数据库连接、基础模型、会话管理等功能。
+
+导出的名称按需从子模块加载（PEP 562），导入 app.db.base 等子模块时
+不会连带加载引擎、会话等其他子模块。
 """
 
-from app.db.database import get_engine, check_connection, close_engine
-from app.db.base import Base, BaseModel
-from app.db.session import get_db, get_db_session, SessionLocal
+import importlib
+from typing import Any
+
+# 导出名称 -> 所在子模块
+_LAZY_EXPORTS = {
+    "get_engine": "app.db.database",
+    "get_async_engine": "app.db.database",
+    "check_connection": "app.db.database",
+    "check_async_connection": "app.db.database",
+    "close_engine": "app.db.database",
+    "close_async_engine": "app.db.database",
+    "Base": "app.db.base",
+    "BaseModel": "app.db.base",
+    "get_db": "app.db.session",
+    "get_db_session": "app.db.session",
+    "get_async_db_session": "app.db.session",
+    "SessionLocal": "app.db.session",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """首次访问导出名称时加载对应子模块，并缓存到模块全局变量"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "get_engine",
+    "get_async_engine",
     "check_connection",
+    "check_async_connection",
     "close_engine",
+    "close_async_engine",
     "Base",
     "BaseModel",
     "get_db",
     "get_db_session",
+    "get_async_db_session",
     "SessionLocal",
 ]
-
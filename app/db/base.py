@@ -4,11 +4,14 @@
 提供基础模型类和 DeclarativeBase，所有数据模型都应继承自 BaseModel。
 """
 
-from datetime import datetime
-from typing import Any
+import re
+from typing import Any, ClassVar, Optional, Tuple
 from sqlalchemy import Column, Integer, DateTime, func
 from sqlalchemy.orm import DeclarativeBase, declared_attr
 
+# 驼峰命名拆分位置（非开头的大写字母之前）
+_CAMEL_CASE_BOUNDARY = re.compile(r'(?<!^)(?=[A-Z])')
+
 
 class Base(DeclarativeBase):
     """
@@ -29,8 +32,7 @@ class Base(DeclarativeBase):
             str: 表名
         """
         # 将驼峰命名转换为下划线命名
-        import re
-        name = re.sub(r'(?<!^)(?=[A-Z])', '_', cls.__name__).lower()
+        name = _CAMEL_CASE_BOUNDARY.sub('_', cls.__name__).lower()
         # 如果类名以 Model 结尾，去掉 Model
         if name.endswith('_model'):
             name = name[:-6]
@@ -87,6 +89,27 @@ class BaseModel(Base):
         comment="更新时间",
     )
     
+    # to_dict 使用的 (列名, 是否为时间类型) 列表，每个模型类首次调用时计算
+    _to_dict_columns: ClassVar[Optional[Tuple[Tuple[str, bool], ...]]] = None
+    
+    @classmethod
+    def _get_to_dict_columns(cls) -> Tuple[Tuple[str, bool], ...]:
+        """
+        获取 to_dict 使用的列信息（按模型类缓存）
+        
+        Returns:
+            Tuple[Tuple[str, bool], ...]: (列名, 是否为时间类型) 列表
+        """
+        # 只读取当前类自身的缓存，避免子类复用父类的列信息
+        columns = cls.__dict__.get("_to_dict_columns")
+        if columns is None:
+            columns = tuple(
+                (column.name, isinstance(column.type, DateTime))
+                for column in cls.__table__.columns
+            )
+            cls._to_dict_columns = columns
+        return columns
+    
     def to_dict(self) -> dict[str, Any]:
         """
         将模型实例转换为字典
@@ -95,11 +118,11 @@ class BaseModel(Base):
             dict: 包含模型字段的字典
         """
         result = {}
-        for column in self.__table__.columns:
-            value = getattr(self, column.name)
-            if isinstance(value, datetime):
+        for name, is_datetime in self._get_to_dict_columns():
+            value = getattr(self, name)
+            if is_datetime and value is not None:
                 value = value.isoformat()
-            result[column.name] = value
+            result[name] = value
         return result
     
     def __repr__(self) -> str:
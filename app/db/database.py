@@ -2,12 +2,15 @@
 数据库连接模块
 
 提供 SQLAlchemy Engine 的创建和配置，支持连接池管理和健康检查。
+同时提供异步 Engine（AsyncEngine），供 FastAPI 请求处理等异步场景使用。
 """
 
+import os
 from typing import Optional
-from sqlalchemy import create_engine, Engine, event
-from sqlalchemy.pool import QueuePool
+from sqlalchemy import create_engine, Engine, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlalchemy.engine import Engine as EngineType
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from app.config import settings
 
@@ -15,6 +18,12 @@ from app.config import settings
 # 全局数据库引擎实例
 _engine: Optional[Engine] = None
 
+# 全局异步数据库引擎实例
+_async_engine: Optional[AsyncEngine] = None
+
+# 连接检查语句（模块级复用，避免每次检查都构建新的 TextClause）
+_HEALTHCHECK_SQL = text("SELECT 1")
+
 
 def get_engine(allow_placeholder: bool = False) -> Engine:
     """
@@ -39,28 +48,78 @@ def get_engine(allow_placeholder: bool = False) -> Engine:
             database_url,
             # 连接池配置
             poolclass=QueuePool,
-            pool_size=5,  # 连接池大小
-            max_overflow=10,  # 最大溢出连接数
+            pool_size=get_pool_size(),  # 连接池大小
+            max_overflow=settings.db_max_overflow,  # 最大溢出连接数
+            pool_timeout=settings.db_pool_timeout,  # 获取连接超时时间（秒）
             pool_pre_ping=True,  # 连接前 ping，确保连接有效
-            pool_recycle=3600,  # 连接回收时间（秒），1小时
+            pool_recycle=settings.db_pool_recycle,  # 连接回收时间（秒）
+            pool_use_lifo=settings.db_pool_use_lifo,  # 优先复用最近使用的连接
+            query_cache_size=settings.db_query_cache_size,  # SQL 编译缓存大小
             echo=settings.debug,  # 调试模式下打印 SQL 语句
         )
-        
-        # 注册连接事件监听器（可选，用于日志记录）
-        if settings.debug:
-            @event.listens_for(_engine, "connect")
-            def set_sqlite_pragma(dbapi_conn, connection_record):
-                """连接建立时的回调（可用于设置数据库参数）"""
-                pass
-            
-            @event.listens_for(_engine, "checkout")
-            def receive_checkout(dbapi_conn, connection_record, connection_proxy):
-                """从连接池获取连接时的回调"""
-                pass
     
     return _engine
 
 
+def get_pool_size() -> int:
+    """
+    计算连接池大小（同步、异步引擎共用）
+
+    优先使用配置项 db_pool_size；未配置时按经验公式
+    min(32, 2 * CPU 核数 + db_effective_io_concurrency) 计算。
+    请求处理以 I/O 等待为主，连接数略多于 CPU 核数即可保持连接常驻复用，
+    上限 32 避免压垮数据库。
+
+    Returns:
+        int: 连接池大小
+    """
+    if settings.db_pool_size is not None:
+        return settings.db_pool_size
+    cpu_count = os.cpu_count() or 1
+    return min(32, 2 * cpu_count + settings.db_effective_io_concurrency)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    获取异步数据库引擎实例（单例模式）
+    
+    使用 settings.get_database_url_async() 转换后的异步驱动 URL
+    （postgresql+asyncpg / mysql+aiomysql），供 AsyncSession 使用，
+    避免在事件循环中执行阻塞的数据库 I/O。
+    
+    连接池（AsyncAdaptedQueuePool）在请求间复用连接，避免每个请求重新建立连接，
+    池大小见 get_pool_size()。Repository 中的查询均为 select() 构造并使用绑定参数，
+    可命中 SQL 编译缓存（query_cache_size），重复请求无需重新编译语句。
+    
+    Returns:
+        AsyncEngine: SQLAlchemy 异步数据库引擎实例
+        
+    Raises:
+        ValueError: 当数据库 URL 配置无效时抛出
+    """
+    global _async_engine
+    
+    if _async_engine is None:
+        database_url = settings.get_database_url_async()
+        
+        # 创建异步引擎，配置连接池
+        _async_engine = create_async_engine(
+            database_url,
+            # 连接池配置
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=get_pool_size(),  # 连接池大小
+            max_overflow=settings.db_max_overflow,  # 最大溢出连接数
+            pool_timeout=settings.db_pool_timeout,  # 获取连接超时时间（秒）
+            pool_pre_ping=True,  # 连接前 ping，确保连接有效
+            pool_recycle=settings.db_pool_recycle,  # 连接回收时间（秒）
+            pool_use_lifo=settings.db_pool_use_lifo,  # 优先复用最近使用的连接
+            query_cache_size=settings.db_query_cache_size,  # SQL 编译缓存大小
+            echo=settings.debug,  # 调试模式下打印 SQL 语句
+        )
+    
+    return _async_engine
+
+
 def close_engine() -> None:
     """
     关闭数据库引擎（应用关闭时调用）
@@ -74,6 +133,19 @@ def close_engine() -> None:
         _engine = None
 
 
+async def close_async_engine() -> None:
+    """
+    关闭异步数据库引擎（应用关闭时调用）
+    
+    注意：此方法会关闭异步连接池中的所有连接，通常在应用关闭时调用。
+    """
+    global _async_engine
+    
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
 def check_connection() -> bool:
     """
     检查数据库连接是否正常
@@ -82,11 +154,26 @@ def check_connection() -> bool:
         bool: 连接正常返回 True，否则返回 False
     """
     try:
-        from sqlalchemy import text
         engine = get_engine()
         with engine.connect() as conn:
-            result = conn.execute(text("SELECT 1"))
-            return result.scalar() == 1
+            return conn.scalar(_HEALTHCHECK_SQL) == 1
+    except Exception:
+        return False
+
+
+async def check_async_connection() -> bool:
+    """
+    检查异步数据库连接是否正常
+    
+    会创建异步引擎并从连接池取出一个连接，启动时调用可预热连接池。
+    
+    Returns:
+        bool: 连接正常返回 True，否则返回 False
+    """
+    try:
+        engine = get_async_engine()
+        async with engine.connect() as conn:
+            return await conn.scalar(_HEALTHCHECK_SQL) == 1
     except Exception:
         return False
 
@@ -2,28 +2,34 @@
 数据库会话管理模块
 
 提供数据库会话的创建、管理和依赖注入功能。
+- 异步会话（AsyncSession）：用于 FastAPI 请求处理、WebSocket 等异步场景
+- 同步会话（Session）：用于脚本、Celery 任务等非异步场景
 """
 
-from typing import Generator, Optional
+from typing import AsyncGenerator, Optional
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy import event
 
-from app.db.database import get_engine
+from app.db.database import get_engine, get_async_engine
 
 
 # 全局会话工厂
 _SessionLocal: Optional[sessionmaker[Session]] = None
 
+# 全局异步会话工厂
+_AsyncSessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+
 
 def get_session_local() -> sessionmaker[Session]:
     """
     获取或创建会话工厂（单例模式）
-    
+
     Returns:
         sessionmaker[Session]: 数据库会话工厂
     """
     global _SessionLocal
-    
+
     if _SessionLocal is None:
         engine = get_engine()
         _SessionLocal = sessionmaker(
@@ -31,10 +37,33 @@ def get_session_local() -> sessionmaker[Session]:
             autoflush=False,
             bind=engine,
         )
-    
+
     return _SessionLocal
 
 
+def get_async_session_local() -> async_sessionmaker[AsyncSession]:
+    """
+    获取或创建异步会话工厂（单例模式）
+
+    注意：expire_on_commit=False，提交后对象属性仍可直接访问，
+    避免在异步场景下触发隐式的延迟加载（lazy load）。
+
+    Returns:
+        async_sessionmaker[AsyncSession]: 异步数据库会话工厂
+    """
+    global _AsyncSessionLocal
+
+    if _AsyncSessionLocal is None:
+        engine = get_async_engine()
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+    return _AsyncSessionLocal
+
+
 # 导出会话工厂（用于直接访问）
 # 延迟创建，避免在导入时就尝试连接数据库
 # 注意：如果需要在导入时创建，可以调用 get_session_local(allow_placeholder=True)
@@ -45,65 +74,76 @@ def _get_session_local_lazy():
 
 # 为了保持向后兼容，提供一个属性访问方式
 class SessionLocalProxy:
-    """SessionLocal 的代理类，延迟创建实际的 SessionLocal"""
+    """
+    SessionLocal 的代理类，延迟创建实际的 SessionLocal
+    
+    仅供脚本等同步场景使用；请求处理路径（get_db）直接使用 get_async_session_local()，
+    不经过此代理。
+    """
+    
+    # 无实例属性：不创建实例 __dict__，属性查找直接落到 __getattr__ 转发
+    __slots__ = ()
+    
     def __call__(self):
         return get_session_local()()
-    
+
     def __getattr__(self, name):
         return getattr(get_session_local(), name)
 
 SessionLocal = SessionLocalProxy()
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     获取数据库会话的依赖注入函数（用于 FastAPI）
-    
-    此函数用于 FastAPI 的依赖注入，自动管理数据库会话的生命周期：
+
+    此函数用于 FastAPI 的依赖注入，自动管理异步数据库会话的生命周期：
     - 创建会话
     - 在请求处理完成后自动提交或回滚
     - 自动关闭会话
-    
+
     Yields:
-        Session: 数据库会话实例
-        
+        AsyncSession: 异步数据库会话实例
+
     Example:
         ```python
         from fastapi import Depends
+        from sqlalchemy import select
+        from sqlalchemy.ext.asyncio import AsyncSession
         from app.db.session import get_db
-        
+
         @app.get("/users")
-        def get_users(db: Session = Depends(get_db)):
-            users = db.query(User).all()
-            return users
+        async def get_users(db: AsyncSession = Depends(get_db)):
+            result = await db.execute(select(User))
+            return result.scalars().all()
         ```
     """
-    session_local = get_session_local()
-    db = session_local()
+    # 会话工厂创建后直接使用模块级引用，只有首次请求才经过 get_async_session_local()
+    db = (_AsyncSessionLocal or get_async_session_local())()
     try:
         yield db
-        db.commit()
+        await db.commit()
     except Exception:
-        db.rollback()
+        await db.rollback()
         raise
     finally:
-        db.close()
+        await db.close()
 
 
 def get_db_session() -> Session:
     """
     获取数据库会话（用于非 FastAPI 场景）
-    
+
     注意：使用此方法获取的会话需要手动管理生命周期。
     建议使用上下文管理器或 try-finally 确保会话正确关闭。
-    
+
     Returns:
         Session: 数据库会话实例
-        
+
     Example:
         ```python
         from app.db.session import get_db_session
-        
+
         db = get_db_session()
         try:
             users = db.query(User).all()
@@ -119,6 +159,36 @@ def get_db_session() -> Session:
     return session_local()
 
 
+def get_async_db_session() -> AsyncSession:
+    """
+    获取异步数据库会话（用于非 FastAPI 依赖注入的异步场景，如 WebSocket）
+
+    注意：使用此方法获取的会话需要手动管理生命周期。
+    建议使用 try-finally 确保会话正确关闭。
+
+    Returns:
+        AsyncSession: 异步数据库会话实例
+
+    Example:
+        ```python
+        from sqlalchemy import select
+        from app.db.session import get_async_db_session
+
+        db = get_async_db_session()
+        try:
+            result = await db.execute(select(User))
+            users = result.scalars().all()
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await db.close()
+        ```
+    """
+    session_local = get_async_session_local()
+    return session_local()
+
+
 # 初始化会话工厂（延迟创建，避免在导入时就尝试连接数据库）
 # get_session_local()  # 注释掉，改为按需调用
-
@@ -36,12 +36,20 @@ class AuthenticatedUser(Protocol):
     email: Optional[str] = None  # 邮箱
 
 
-# 全局认证函数（可扩展）
-_authentication_function: Optional[Callable[[Request], Optional[AuthenticatedUser]]] = None
+def _unconfigured_authentication(request: Request) -> Optional[AuthenticatedUser]:
+    """未设置认证函数时使用的默认认证函数，直接抛出 UnauthorizedError"""
+    raise UnauthorizedError(
+        message="认证功能未配置，请先设置认证函数",
+        details="调用 set_authentication_function() 设置认证函数"
+    )
+
+
+# 全局认证函数（可扩展），默认为未配置占位函数，请求时无需再判断 None
+_authentication_function: Callable[[Request], Optional[AuthenticatedUser]] = _unconfigured_authentication
 
 
 def set_authentication_function(
-    func: Callable[[Request], Optional[AuthenticatedUser]]
+    func: Optional[Callable[[Request], Optional[AuthenticatedUser]]]
 ) -> None:
     """
     设置认证函数
@@ -53,7 +61,7 @@ def set_authentication_function(
     - 返回 None（如果认证失败，依赖会自动抛出 UnauthorizedError）
     
     Args:
-        func: 认证函数，接收 Request，返回用户对象或 None
+        func: 认证函数，接收 Request，返回用户对象或 None；传入 None 表示清除已设置的认证函数
         
     Example:
         ```python
@@ -75,7 +83,7 @@ def set_authentication_function(
         ```
     """
     global _authentication_function
-    _authentication_function = func
+    _authentication_function = func if func is not None else _unconfigured_authentication
 
 
 def get_authentication_function() -> Optional[Callable[[Request], Optional[AuthenticatedUser]]]:
@@ -83,8 +91,10 @@ def get_authentication_function() -> Optional[Callable[[Request], Optional[Authe
     获取当前设置的认证函数
     
     Returns:
-        认证函数或 None
+        认证函数，未设置时返回 None
     """
+    if _authentication_function is _unconfigured_authentication:
+        return None
     return _authentication_function
 
 
@@ -118,17 +128,8 @@ def get_current_user(
             return {"user_id": user.id, "username": user.username}
         ```
     """
-    # 使用传入的认证函数或全局认证函数
-    auth_function = auth_func or _authentication_function
-    
-    if auth_function is None:
-        raise UnauthorizedError(
-            message="认证功能未配置，请先设置认证函数",
-            details="调用 set_authentication_function() 设置认证函数"
-        )
-    
-    # 执行认证
-    user = auth_function(request)
+    # 使用传入的认证函数或全局认证函数（未设置时由占位函数抛出 UnauthorizedError）
+    user = (auth_func or _authentication_function)(request)
     
     if user is None:
         raise UnauthorizedError(message="认证失败，请提供有效的认证信息")
@@ -160,12 +161,24 @@ class PermissionChecker(Protocol):
         ...
 
 
-# 全局权限检查函数（可扩展）
-_permission_check_function: Optional[Callable[[AuthenticatedUser, Optional[str], Optional[str]], bool]] = None
+def _unconfigured_permission_check(
+    user: AuthenticatedUser,
+    resource: Optional[str] = None,
+    action: Optional[str] = None
+) -> bool:
+    """未设置权限检查函数时使用的默认检查函数，直接抛出 ForbiddenError"""
+    raise ForbiddenError(
+        message="权限检查功能未配置，请先设置权限检查函数",
+        details="调用 set_permission_check_function() 设置权限检查函数"
+    )
+
+
+# 全局权限检查函数（可扩展），默认为未配置占位函数，请求时无需再判断 None
+_permission_check_function: Callable[[AuthenticatedUser, Optional[str], Optional[str]], bool] = _unconfigured_permission_check
 
 
 def set_permission_check_function(
-    func: Callable[[AuthenticatedUser, Optional[str], Optional[str]], bool]
+    func: Optional[Callable[[AuthenticatedUser, Optional[str], Optional[str]], bool]]
 ) -> None:
     """
     设置权限检查函数
@@ -176,7 +189,7 @@ def set_permission_check_function(
     - 返回 True（有权限）或 False（无权限）
     
     Args:
-        func: 权限检查函数
+        func: 权限检查函数；传入 None 表示清除已设置的权限检查函数
         
     Example:
         ```python
@@ -197,7 +210,7 @@ def set_permission_check_function(
         ```
     """
     global _permission_check_function
-    _permission_check_function = func
+    _permission_check_function = func if func is not None else _unconfigured_permission_check
 
 
 def get_permission_check_function() -> Optional[Callable[[AuthenticatedUser, Optional[str], Optional[str]], bool]]:
@@ -205,60 +218,36 @@ def get_permission_check_function() -> Optional[Callable[[AuthenticatedUser, Opt
     获取当前设置的权限检查函数
     
     Returns:
-        权限检查函数或 None
+        权限检查函数，未设置时返回 None
     """
+    if _permission_check_function is _unconfigured_permission_check:
+        return None
     return _permission_check_function
 
 
-def require_permission(
+def _check_permission(
+    user: AuthenticatedUser,
     resource: Optional[str] = None,
     action: Optional[str] = None,
-    user: AuthenticatedUser = Depends(get_current_user),
     check_func: Optional[Callable[[AuthenticatedUser, Optional[str], Optional[str]], bool]] = None
 ) -> AuthenticatedUser:
     """
-    权限检查依赖
-    
-    此依赖用于需要特定权限的路由中，会自动检查用户权限。
-    如果权限检查失败，会抛出 ForbiddenError（403）。
+    执行权限检查（纯函数，不涉及 FastAPI 依赖注入）
     
     Args:
+        user: 认证用户对象
         resource: 资源标识（可选）
         action: 操作类型（可选）
-        user: 认证用户对象（自动注入）
         check_func: 可选的权限检查函数，如果不提供则使用全局设置的权限检查函数
         
     Returns:
         AuthenticatedUser: 认证用户对象（权限检查通过后）
         
     Raises:
-        ForbiddenError: 当权限检查失败时抛出
-        
-    Example:
-        ```python
-        from fastapi import Depends
-        from app.dependencies import require_permission
-        
-        @app.delete("/users/{user_id}")
-        def delete_user(
-            user_id: int,
-            user = Depends(require_permission(resource="user", action="delete"))
-        ):
-            # 只有有权限的用户才能执行删除操作
-            return {"message": "用户已删除"}
-        ```
+        ForbiddenError: 当权限检查失败或权限检查功能未配置时抛出
     """
-    # 使用传入的权限检查函数或全局权限检查函数
-    permission_check = check_func or _permission_check_function
-    
-    if permission_check is None:
-        raise ForbiddenError(
-            message="权限检查功能未配置，请先设置权限检查函数",
-            details="调用 set_permission_check_function() 设置权限检查函数"
-        )
-    
-    # 执行权限检查
-    has_permission = permission_check(user, resource, action)
+    # 使用传入的权限检查函数或全局权限检查函数（未设置时由占位函数抛出 ForbiddenError）
+    has_permission = (check_func or _permission_check_function)(user, resource, action)
     
     if not has_permission:
         error_msg = "权限不足"
@@ -274,6 +263,41 @@ def require_permission(
     return user
 
 
+def require_permission(
+    resource: Optional[str] = None,
+    action: Optional[str] = None,
+    user: AuthenticatedUser = Depends(get_current_user),
+    check_func: Optional[Callable[[AuthenticatedUser, Optional[str], Optional[str]], bool]] = None
+) -> AuthenticatedUser:
+    """
+    权限检查
+    
+    保留用于向后兼容，直接调用时需要传入已认证的用户。
+    在路由中声明权限依赖请使用 create_permission_dependency()。
+    
+    Args:
+        resource: 资源标识（可选）
+        action: 操作类型（可选）
+        user: 认证用户对象
+        check_func: 可选的权限检查函数，如果不提供则使用全局设置的权限检查函数
+        
+    Returns:
+        AuthenticatedUser: 认证用户对象（权限检查通过后）
+        
+    Raises:
+        ForbiddenError: 当权限检查失败时抛出
+        
+    Example:
+        ```python
+        from app.dependencies import get_current_user, require_permission
+        
+        user = get_current_user(request)
+        require_permission(resource="user", action="delete", user=user)
+        ```
+    """
+    return _check_permission(user, resource, action, check_func)
+
+
 # ==================== 便捷函数 ====================
 
 def create_permission_dependency(
@@ -284,6 +308,7 @@ def create_permission_dependency(
     创建权限检查依赖的便捷函数
     
     用于创建特定资源/操作的权限检查依赖。
+    返回的依赖只通过 Depends(get_current_user) 获取用户，再执行权限检查。
     
     Args:
         resource: 资源标识
@@ -307,8 +332,10 @@ def create_permission_dependency(
     def permission_dependency(
         user: AuthenticatedUser = Depends(get_current_user)
     ) -> AuthenticatedUser:
-        return require_permission(resource=resource, action=action, user=user)
+        return _check_permission(user, resource, action)
     
+    # 按资源/操作命名，便于在日志和 OpenAPI 中区分不同的权限依赖
+    permission_dependency.__name__ = f"require_{resource or 'any'}_{action or 'any'}"
     return permission_dependency
 
 
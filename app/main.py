@@ -12,23 +12,37 @@
 import logging
 import time
 from contextlib import asynccontextmanager
-from typing import Dict, Any
+from typing import Dict
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi.exceptions import RequestValidationError
+from pydantic_core import to_json
+from starlette.concurrency import run_in_threadpool
 from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy.orm import configure_mappers
 
 from app.config import settings
-from app.db.database import get_engine, close_engine, check_connection
+from app.db.database import (
+    get_engine,
+    close_engine,
+    close_async_engine,
+    check_connection,
+    check_async_connection,
+)
 from app.utils.exceptions import BaseAppException
-from app.utils.response import success_response
+from app.utils.logger import start_queue_logging, stop_queue_logging
+from app.utils.response import error_json_response, payload_json_response, success_json_response
 
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 是否为生产环境（运行期间不会变化，导入时确定一次）
+_IS_PRODUCTION = settings.is_production()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -40,6 +54,9 @@ async def lifespan(app: FastAPI):
     Args:
         app: FastAPI 应用实例
     """
+    # app.services.core 与 app.websocket 相互导入，在此处导入以避免模块加载时的循环导入
+    from app.services.core.ai_record_batcher import ai_record_batcher
+    
     # 启动事件
     logger.info("应用启动中...")
     
@@ -61,21 +78,45 @@ async def lifespan(app: FastAPI):
             logger.info("数据库连接测试成功")
         else:
             logger.warning("数据库连接测试失败，但应用将继续启动")
+        
+        # 预热：ORM 映射配置和异步连接池的首个连接都是延迟完成的，
+        # 在启动阶段完成，避免由第一个请求承担这部分开销
+        configure_mappers()
+        if await check_async_connection():
+            logger.info("异步数据库连接池预热成功")
+        else:
+            logger.warning("异步数据库连接测试失败，但应用将继续启动")
     except Exception as e:
         logger.error(f"数据库初始化失败: {e}")
         # 在开发环境中，允许数据库未配置时继续启动
-        if settings.is_production():
+        if _IS_PRODUCTION:
             raise
     
+    # 启动 AI 交互记录批量写入任务
+    await ai_record_batcher.start()
+    
     logger.info(f"应用启动完成 - {settings.app_name} v{settings.app_version}")
     
+    # 启动完成后日志改由后台线程写出，请求处理中的日志调用只需入队
+    start_queue_logging()
+    
     yield
     
+    # 恢复同步输出，写出队列中剩余的日志
+    stop_queue_logging()
+    
     # 关闭事件
     logger.info("应用关闭中...")
     
+    # 写入剩余的 AI 交互记录（需在关闭数据库连接之前）
+    try:
+        await ai_record_batcher.stop()
+    except Exception as e:
+        logger.error(f"写入剩余 AI 交互记录时出错: {e}")
+    
     # 关闭数据库连接
     try:
+        await close_async_engine()
         close_engine()
         logger.info("数据库连接已关闭")
     except Exception as e:
@@ -89,58 +130,86 @@ app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="FastAPI 后端脚手架 - 通用的项目基础框架",
-    docs_url="/docs" if not settings.is_production() else None,  # 生产环境禁用文档
-    redoc_url="/redoc" if not settings.is_production() else None,  # 生产环境禁用文档
-    openapi_url="/openapi.json" if not settings.is_production() else None,  # 生产环境禁用 OpenAPI
+    docs_url="/docs" if not _IS_PRODUCTION else None,  # 生产环境禁用文档
+    redoc_url="/redoc" if not _IS_PRODUCTION else None,  # 生产环境禁用文档
+    openapi_url="/openapi.json" if not _IS_PRODUCTION else None,  # 生产环境禁用 OpenAPI
     lifespan=lifespan,
 )
 
 
 # ==================== 中间件配置 ====================
 
+# CORS 允许的请求方法和请求头（显式列出接口实际使用的取值，预检时按集合匹配，不走通配分支）
+_CORS_ALLOW_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+_CORS_ALLOW_HEADERS = ("Authorization", "Content-Type", "If-None-Match", "X-Request-ID")
+
 # CORS 中间件
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=_CORS_ALLOW_METHODS,
+    allow_headers=_CORS_ALLOW_HEADERS,
 )
 
 
 # 请求日志中间件（可选）
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
+class LogRequestsMiddleware:
     """
     请求日志中间件
     
-    记录每个请求的基本信息，包括请求路径、方法、处理时间等。
-    """
-    start_time = time.time()
-    
-    # 记录请求信息
-    logger.info(
-        f"请求: {request.method} {request.url.path} - "
-        f"客户端: {request.client.host if request.client else 'unknown'}"
-    )
-    
-    # 处理请求
-    response = await call_next(request)
-    
-    # 计算处理时间
-    process_time = time.time() - start_time
+    记录每个请求的基本信息，包括请求路径、方法、处理时间等，
+    并在响应头中添加 X-Process-Time（处理时间，秒，保留三位小数）。
     
-    # 记录响应信息
-    logger.info(
-        f"响应: {request.method} {request.url.path} - "
-        f"状态码: {response.status_code} - "
-        f"处理时间: {process_time:.3f}s"
-    )
+    以纯 ASGI 中间件实现（而非 @app.middleware("http")），不经过 BaseHTTPMiddleware
+    的响应体转发，流式响应也能直接透传。
+    """
     
-    # 添加处理时间到响应头
-    response.headers["X-Process-Time"] = str(process_time)
+    def __init__(self, app: ASGIApp):
+        self.app = app
     
-    return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        # 日志级别高于 INFO 时（如生产环境）跳过日志参数的准备
+        log_enabled = logger.isEnabledFor(logging.INFO)
+        
+        # 记录请求信息
+        if log_enabled:
+            client = scope.get("client")
+            logger.info(
+                "请求: %s %s - 客户端: %s",
+                method, path, client[0] if client else "unknown",
+            )
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # 计算处理时间（到响应头发出为止）
+                process_time = time.perf_counter() - start_time
+                
+                # 记录响应信息
+                if log_enabled:
+                    logger.info(
+                        "响应: %s %s - 状态码: %s - 处理时间: %.3fs",
+                        method, path, message["status"], process_time,
+                    )
+                
+                # 添加处理时间到响应头（毫秒精度，直接追加原始头部字节）
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"x-process-time", f"{process_time:.3f}".encode()),
+                ]
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+
+
+app.add_middleware(LogRequestsMiddleware)
 
 
 # ==================== 异常处理 ====================
@@ -151,21 +220,14 @@ async def app_exception_handler(request: Request, exc: BaseAppException):
     应用自定义异常处理器
     
     处理所有继承自 BaseAppException 的自定义异常。
+    路由处理函数无需捕获服务层异常，直接抛出即可由此统一转换为错误响应。
     """
     logger.error(
-        f"应用异常: {exc.message} (代码: {exc.code}) - "
-        f"路径: {request.url.path}"
+        "应用异常: %s (代码: %s) - 路径: %s",
+        exc.message, exc.code, request.url.path,
     )
     
-    return JSONResponse(
-        status_code=exc.code,
-        content={
-            "code": exc.code,
-            "message": exc.message,
-            "details": exc.details,
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
-        },
-    )
+    return error_json_response(code=exc.code, message=exc.message, details=exc.details)
 
 
 @app.exception_handler(StarletteHTTPException)
@@ -176,18 +238,11 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     处理 FastAPI 和 Starlette 的 HTTP 异常。
     """
     logger.warning(
-        f"HTTP 异常: {exc.status_code} - {exc.detail} - "
-        f"路径: {request.url.path}"
+        "HTTP 异常: %s - %s - 路径: %s",
+        exc.status_code, exc.detail, request.url.path,
     )
     
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "code": exc.status_code,
-            "message": exc.detail,
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
-        },
-    )
+    return error_json_response(code=exc.status_code, message=exc.detail, include_details=False)
 
 
 @app.exception_handler(RequestValidationError)
@@ -197,18 +252,13 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     
     处理 Pydantic 验证错误。
     """
-    logger.warning(
-        f"请求验证失败: {exc.errors()} - 路径: {request.url.path}"
-    )
+    errors = exc.errors()
+    logger.warning("请求验证失败: %s - 路径: %s", errors, request.url.path)
     
-    return JSONResponse(
-        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={
-            "code": 422,
-            "message": "请求数据验证失败",
-            "details": exc.errors(),
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
-        },
+    return error_json_response(
+        code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        message="请求数据验证失败",
+        details=errors,
     )
 
 
@@ -220,71 +270,103 @@ async def general_exception_handler(request: Request, exc: Exception):
     处理所有未捕获的异常。
     """
     logger.exception(
-        f"未处理的异常: {type(exc).__name__} - {str(exc)} - "
-        f"路径: {request.url.path}"
+        "未处理的异常: %s - %s - 路径: %s",
+        type(exc).__name__, exc, request.url.path,
     )
     
     # 在生产环境中，不暴露详细的错误信息
-    if settings.is_production():
+    if _IS_PRODUCTION:
         message = "内部服务器错误"
         details = None
     else:
-        message = f"内部服务器错误: {str(exc)}"
+        exc_message = str(exc)
+        message = f"内部服务器错误: {exc_message}"
         details = {
             "type": type(exc).__name__,
-            "message": str(exc),
+            "message": exc_message,
         }
     
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "code": 500,
-            "message": message,
-            "details": details,
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
-        },
+    return error_json_response(
+        code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        message=message,
+        details=details,
     )
 
 
 # ==================== 基础路由 ====================
 
-@app.get("/health", tags=["系统"])
-async def health_check() -> Dict[str, Any]:
+# 健康检查中数据库状态的缓存时间（秒）：负载均衡器频繁探测 /health 时，
+# 每个缓存周期内只真正检查一次数据库
+_HEALTH_DB_CHECK_TTL = 2.0
+
+# 最近一次数据库检查结果：[检查时间（time.monotonic()）, 数据库状态]
+_health_db_status: list = [float("-inf"), "disconnected"]
+
+
+# 健康检查响应数据：数据库状态 -> data 的 JSON 字节（除数据库状态外均为固定配置，启动时序列化一次）
+_HEALTH_PAYLOADS: Dict[str, bytes] = {
+    db_status: to_json({
+        "status": "healthy",
+        "app_name": settings.app_name,
+        "version": settings.app_version,
+        "environment": settings.environment,
+        "database": db_status,
+    })
+    for db_status in ("connected", "disconnected", "error")
+}
+
+
+async def _get_database_health() -> str:
     """
-    健康检查接口
+    获取数据库健康状态（带短时缓存）
     
-    用于检查应用和数据库的健康状态。
+    check_connection() 是同步的数据库往返，缓存失效时放到线程池执行，避免阻塞事件循环。
     
     Returns:
-        dict: 健康状态信息
+        str: connected、disconnected 或 error
     """
-    health_status = {
-        "status": "healthy",
-        "app_name": settings.app_name,
-        "version": settings.app_version,
-        "environment": settings.environment,
-    }
+    now = time.monotonic()
+    if now - _health_db_status[0] < _HEALTH_DB_CHECK_TTL:
+        return _health_db_status[1]
     
-    # 检查数据库连接
     try:
-        db_healthy = check_connection()
-        health_status["database"] = "connected" if db_healthy else "disconnected"
+        db_status = "connected" if await run_in_threadpool(check_connection) else "disconnected"
     except Exception as e:
-        logger.warning(f"数据库健康检查失败: {e}")
-        health_status["database"] = "error"
+        logger.warning("数据库健康检查失败: %s", e)
+        db_status = "error"
+    
+    _health_db_status[0] = now
+    _health_db_status[1] = db_status
+    return db_status
+
+
+@app.get("/health", tags=["系统"])
+async def health_check() -> Response:
+    """
+    健康检查接口
     
-    return success_response(data=health_status, message="服务运行正常")
+    用于检查应用和数据库的健康状态。
+    数据库状态会缓存 _HEALTH_DB_CHECK_TTL 秒，频繁探测时不会每次都访问数据库；
+    响应数据按数据库状态预先序列化（见 _HEALTH_PAYLOADS），每次请求只拼接外层结构。
+    
+    Returns:
+        Response: 健康状态信息
+    """
+    # 检查数据库连接（结果缓存 _HEALTH_DB_CHECK_TTL 秒）
+    db_status = await _get_database_health()
+    
+    return payload_json_response(_HEALTH_PAYLOADS[db_status], message="服务运行正常")
 
 
 @app.get("/version", tags=["系统"])
-async def get_version() -> Dict[str, Any]:
+async def get_version() -> Response:
     """
     版本信息接口
     
     返回应用的版本信息。
     
     Returns:
-        dict: 版本信息
+        Response: 版本信息
     """
     version_info = {
         "app_name": settings.app_name,
@@ -292,7 +374,7 @@ async def get_version() -> Dict[str, Any]:
         "environment": settings.environment,
     }
     
-    return success_response(data=version_info, message="版本信息获取成功")
+    return success_json_response(data=version_info, message="版本信息获取成功")
 
 
 # ==================== WebSocket 路由 ====================
@@ -342,22 +424,26 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
 
 
 @app.get("/ws/stats", tags=["WebSocket"])
-async def websocket_stats() -> Dict[str, Any]:
+async def websocket_stats(verbose: bool = False) -> Response:
     """
     WebSocket 连接统计接口
     
-    返回当前 WebSocket 连接的统计信息。
+    返回当前 WebSocket 连接的统计信息。连接数和用户数由连接管理器计数维护，
+    默认不返回用户列表；传入 verbose=1 时才列出所有已连接的用户 ID。
+    
+    Args:
+        verbose: 是否返回已连接用户 ID 列表
     
     Returns:
-        dict: 连接统计信息，包括总连接数、已连接用户数等
+        Response: 连接统计信息，包括总连接数、已连接用户数等
     """
     stats = {
         "total_connections": manager.get_total_connections_count(),
-        "connected_users_count": len(manager.get_connected_users()),
-        "connected_users": list(manager.get_connected_users()),
+        "connected_users_count": manager.get_connected_users_count(),
+        "connected_users": list(manager.active_connections) if verbose else [],
     }
     
-    return success_response(data=stats, message="WebSocket 统计信息获取成功")
+    return success_json_response(data=stats, message="WebSocket 统计信息获取成功")
 
 
 # ==================== API 路由注册 ====================
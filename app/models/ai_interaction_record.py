@@ -4,10 +4,16 @@ AI交互记录模型
 定义 AI 交互记录表的数据模型，用于存储 AI 服务调用情况。
 """
 
-from sqlalchemy import Column, String, Text, Integer, BigInteger, Index
+from sqlalchemy import JSON, Column, String, SmallInteger, BigInteger, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from app.db.base import BaseModel
 
 
+# 请求/响应内容的列类型：PostgreSQL 使用 JSONB（二进制存储，读取时无需重新解析），
+# MySQL 使用原生 JSON，其他数据库（如 SQLite）以文本形式存储 JSON
+_JSON_CONTENT = JSON().with_variant(JSONB(), "postgresql")
+
+
 class AIInteractionRecord(BaseModel):
     """
     AI交互记录模型
@@ -27,6 +33,8 @@ class AIInteractionRecord(BaseModel):
             user_message_id="msg_001",
             ai_message_id="msg_002",
             ai_service_url="https://ai.example.com/api",
+            request_content={"prompt": "你好"},
+            response_content={"reply": "你好，有什么可以帮你？"},
             status=1,
             duration_ms=500
         )
@@ -73,23 +81,23 @@ class AIInteractionRecord(BaseModel):
         comment="AI服务URL",
     )
     
-    # 请求内容（JSON格式）
+    # 请求内容（JSON，直接存取 dict/list，无需手动 json.dumps / json.loads）
     request_content = Column(
-        Text,
+        _JSON_CONTENT,
         nullable=True,
         comment="请求内容（JSON格式）",
     )
     
-    # 响应内容（JSON格式）
+    # 响应内容（JSON，直接存取 dict/list，无需手动 json.dumps / json.loads）
     response_content = Column(
-        Text,
+        _JSON_CONTENT,
         nullable=True,
         comment="响应内容（JSON格式）",
     )
     
     # 状态：0-处理中，1-成功，2-失败
     status = Column(
-        Integer,
+        SmallInteger,
         nullable=False,
         default=0,
         comment="状态：0-处理中，1-成功，2-失败",
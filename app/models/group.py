@@ -4,7 +4,7 @@
 定义群组表的数据模型，用于存储群组信息。
 """
 
-from sqlalchemy import Column, String, Text, Index
+from sqlalchemy import Column, Integer, String, Text, Index
 from app.db.base import BaseModel
 
 
@@ -63,6 +63,15 @@ class Group(BaseModel):
         comment="创建人ID",
     )
     
+    # 群组消息数量（冗余字段，发送消息时在同一事务内递增，避免分页时 COUNT(*)）
+    message_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="群组消息数量",
+    )
+    
     # 添加索引以提高查询性能
     __table_args__ = (
         Index("idx_group_id", "group_id"),
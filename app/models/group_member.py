@@ -70,7 +70,8 @@ class GroupMember(BaseModel):
     # 添加联合唯一约束和索引
     __table_args__ = (
         UniqueConstraint("group_id", "user_id", name="uk_group_user"),
-        Index("idx_group_id", "group_id"),
+        # 成员列表按加入时间排序，复合索引同时覆盖按 group_id 过滤的查询
+        Index("idx_group_members_group_joined", "group_id", "joined_at"),
         Index("idx_user_id", "user_id"),
         Index("idx_user_role", "user_role"),
     )
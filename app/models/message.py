@@ -78,10 +78,11 @@ class Message(BaseModel):
     
     # 添加索引以提高查询性能
     __table_args__ = (
-        Index("idx_group_id", "group_id"),
+        # 按 group_id 过滤的查询由下面两个以 group_id 开头的复合索引覆盖，不再单独建索引
         Index("idx_from_user_id", "from_user_id"),
         Index("idx_created_at", "created_at"),
         Index("idx_group_created", "group_id", "created_at"),
+        Index("idx_messages_group_id_id", "group_id", "id"),  # 群组消息按 id 倒序分页及游标分页（before_id）
     )
     
     def __repr__(self) -> str:
@@ -8,6 +8,7 @@ from app.repositories.base import (
     BaseRepository,
     PaginationParams,
     PaginationResult,
+    CursorPaginationResult,
     ModelType,
 )
 
@@ -15,16 +16,19 @@ from app.repositories.user_repository import UserRepository
 from app.repositories.group_repository import GroupRepository
 from app.repositories.group_member_repository import GroupMemberRepository
 from app.repositories.message_repository import MessageRepository
+from app.repositories.ai_interaction_record_repository import AIInteractionRecordRepository
 
 __all__ = [
     # 基础类
     "BaseRepository",
     "PaginationParams",
     "PaginationResult",
+    "CursorPaginationResult",
     "ModelType",
     # 业务 Repository
     "UserRepository",
     "GroupRepository",
     "GroupMemberRepository",
     "MessageRepository",
+    "AIInteractionRecordRepository",
 ]
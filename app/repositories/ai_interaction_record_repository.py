@@ -0,0 +1,40 @@
+"""
+AI交互记录 Repository
+
+提供 AI 交互记录数据访问层，继承自 BaseRepository。
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ai_interaction_record import AIInteractionRecord
+from app.repositories.base import BaseRepository
+
+
+class AIInteractionRecordRepository(BaseRepository[AIInteractionRecord]):
+    """
+    AI交互记录 Repository
+    
+    继承自 BaseRepository，提供 AI 交互记录相关的数据访问方法。
+    
+    示例：
+        ```python
+        from app.repositories.ai_interaction_record_repository import AIInteractionRecordRepository
+        from app.db.session import get_async_db_session
+        
+        db = get_async_db_session()
+        repo = AIInteractionRecordRepository(db)
+        
+        # 批量写入记录（只写不读，不取回实例）
+        await repo.create_many([
+            {
+                "record_id": "record_001",
+                "group_id": "group_001",
+                "user_message_id": "msg_001",
+                "status": 1,
+            },
+        ], return_defaults=False)
+        ```
+    """
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(AIInteractionRecord, db)
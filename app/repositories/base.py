@@ -5,17 +5,72 @@ Repository 基础类模块
 所有业务 Repository 都应继承自 BaseRepository。
 """
 
-from typing import Generic, TypeVar, Type, Optional, List, Dict, Any, Union
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from functools import cached_property
+from typing import Generic, TypeVar, Type, Optional, List, Dict, Any, AsyncIterator, Tuple, Union, cast
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    PrimaryKeyConstraint,
+    Row,
+    Select,
+    UniqueConstraint,
+    and_,
+    or_,
+    desc,
+    asc,
+    delete,
+    exists,
+    func,
+    inspect,
+    insert,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 
+from app.config import settings
 from app.db.base import BaseModel
+from app.utils.cache import TTLCache
 
 
 # 定义泛型类型变量
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
+# 分页总数缓存：(表名, 写入代数) -> 总数，只缓存达到 count_cache_min_total 的总数
+_count_cache = TTLCache(max_size=1024, ttl=settings.count_cache_ttl)
+
+# 各表的写入代数：通过 Repository 写入或删除时递增，使该表已缓存的总数失效
+_count_generations: Dict[str, int] = {}
+
+# 模型的列属性：模型 -> {属性名: 列属性}（每个模型只计算一次，供过滤、排序、更新时校验字段名）
+_model_columns: Dict[type, Dict[str, Any]] = {}
+
+# 估算表行数的语句（读取数据库统计信息）：方言 -> 语句
+_APPROXIMATE_COUNT_SQL = {
+    "postgresql": text(
+        "SELECT reltuples::BIGINT FROM pg_class "
+        "WHERE oid = to_regclass(:table_name)"
+    ),
+    "mysql": text(
+        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+    ),
+}
+
+# IN 列表每批的最大元素数：方言 -> 批大小（每个元素占一个绑定参数，避免超出数据库的参数个数上限）
+_IN_BATCH_SIZES = {
+    "sqlite": 500,
+}
+_DEFAULT_IN_BATCH_SIZE = 10000
+
+# 支持 INSERT ... ON CONFLICT（DO UPDATE / DO NOTHING）... RETURNING 的方言 -> 对应的 insert 构造函数
+_UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
 
 class PaginationParams:
     """
@@ -53,6 +108,13 @@ class PaginationParams:
         return self.page_size
 
 
+def _items_to_dicts(items: List[Any]) -> List[Any]:
+    """分页数据转换为字典列表（同一页的数据类型相同，只对第一条判断是否有 to_dict()）"""
+    if items and hasattr(items[0], "to_dict"):
+        return [item.to_dict() for item in items]
+    return list(items)
+
+
 class PaginationResult(Generic[ModelType]):
     """
     分页结果类
@@ -63,34 +125,46 @@ class PaginationResult(Generic[ModelType]):
     def __init__(
         self,
         items: List[ModelType],
-        total: int,
+        total: Optional[int],
         page: int,
-        page_size: int
+        page_size: int,
+        has_next: Optional[bool] = None
     ):
         """
         初始化分页结果
         
         Args:
             items: 当前页的数据列表
-            total: 总记录数
+            total: 总记录数（未统计总数时为 None）
             page: 当前页码
             page_size: 每页数量
+            has_next: 是否有下一页（未统计总数时由查询结果得出；为 None 时按总数计算）
         """
         self.items = items
         self.total = total
         self.page = page
         self.page_size = page_size
+        self._has_next = has_next
     
-    @property
-    def total_pages(self) -> int:
-        """计算总页数"""
+    # 分页信息在实例创建后不再变化，首次访问时计算并缓存到实例上，序列化时重复访问不再重新计算
+    
+    @cached_property
+    def total_pages(self) -> Optional[int]:
+        """计算总页数（未统计总数时为 None）"""
+        if self.total is None:
+            return None
         if self.page_size == 0:
             return 0
         return (self.total + self.page_size - 1) // self.page_size
     
-    @property
+    @cached_property
     def has_next(self) -> bool:
         """是否有下一页"""
+        if self._has_next is not None:
+            return self._has_next
+        # 未统计总数且未给出 has_next 时无法判断，视为没有下一页
+        if self.total_pages is None:
+            return False
         return self.page < self.total_pages
     
     @property
@@ -106,7 +180,7 @@ class PaginationResult(Generic[ModelType]):
             dict: 包含分页信息和数据列表的字典
         """
         return {
-            "items": [item.to_dict() if hasattr(item, "to_dict") else item for item in self.items],
+            "items": _items_to_dicts(self.items),
             "pagination": {
                 "total": self.total,
                 "page": self.page,
@@ -118,6 +192,52 @@ class PaginationResult(Generic[ModelType]):
         }
 
 
+class CursorPaginationResult(Generic[ModelType]):
+    """
+    游标分页结果类
+    
+    封装游标（keyset）分页查询的结果。游标为当前页最后一条记录的 (排序字段值, id)，
+    作为下一页查询的 cursor 参数传入；不统计总数，has_next 通过多查一条记录得出。
+    """
+    
+    def __init__(
+        self,
+        items: List[ModelType],
+        page_size: int,
+        has_next: bool,
+        next_cursor: Optional[Tuple[Any, int]] = None
+    ):
+        """
+        初始化游标分页结果
+        
+        Args:
+            items: 当前页的数据列表
+            page_size: 每页数量
+            has_next: 是否有下一页
+            next_cursor: 下一页的游标（没有下一页时为 None）
+        """
+        self.items = items
+        self.page_size = page_size
+        self.has_next = has_next
+        self.next_cursor = next_cursor
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为字典格式
+        
+        Returns:
+            dict: 包含分页信息和数据列表的字典
+        """
+        return {
+            "items": _items_to_dicts(self.items),
+            "pagination": {
+                "page_size": self.page_size,
+                "has_next": self.has_next,
+                "next_cursor": list(self.next_cursor) if self.next_cursor is not None else None,
+            }
+        }
+
+
 class BaseRepository(Generic[ModelType]):
     """
     Repository 基础类
@@ -133,37 +253,44 @@ class BaseRepository(Generic[ModelType]):
         ```python
         from app.db.base import BaseModel
         from app.repositories.base import BaseRepository
-        from sqlalchemy.orm import Session
+        from sqlalchemy.ext.asyncio import AsyncSession
         
         class User(BaseModel):
             __tablename__ = "users"
             name = Column(String(100), nullable=False)
         
         class UserRepository(BaseRepository[User]):
-            def __init__(self, db: Session):
+            def __init__(self, db: AsyncSession):
                 super().__init__(User, db)
         
         # 使用
         user_repo = UserRepository(db)
-        user = user_repo.create({"name": "张三"})
-        users = user_repo.get_all()
+        user = await user_repo.create({"name": "张三"})
+        users = await user_repo.get_all()
         ```
     """
     
-    def __init__(self, model: Type[ModelType], db: Session):
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
         """
         初始化 Repository
         
         Args:
             model: SQLAlchemy 模型类
-            db: 数据库会话
+            db: 异步数据库会话
         """
         self.model = model
         self.db = db
+        
+        columns = _model_columns.get(model)
+        if columns is None:
+            columns = _model_columns[model] = {
+                attr.key: getattr(model, attr.key) for attr in inspect(model).column_attrs
+            }
+        self._columns = columns
     
     # ==================== Create 操作 ====================
     
-    def create(self, data: Dict[str, Any]) -> ModelType:
+    async def create(self, data: Dict[str, Any]) -> ModelType:
         """
         创建新记录
         
@@ -178,54 +305,87 @@ class BaseRepository(Generic[ModelType]):
             
         Example:
             ```python
-            user = user_repo.create({"name": "张三", "email": "zhangsan@example.com"})
+            user = await user_repo.create({"name": "张三", "email": "zhangsan@example.com"})
             ```
         """
         instance = self.model(**data)
         self.db.add(instance)
         try:
-            self.db.commit()
-            self.db.refresh(instance)
+            await self.db.commit()
+            self._invalidate_count_cache()
+            await self._load_server_defaults(instance)
             return instance
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
     
-    def create_many(self, data_list: List[Dict[str, Any]]) -> List[ModelType]:
+    async def create_many(
+        self,
+        data_list: List[Dict[str, Any]],
+        return_defaults: bool = True
+    ) -> List[ModelType]:
         """
         批量创建记录
         
+        支持 executemany RETURNING 的数据库（PostgreSQL、SQLite）使用 ORM 批量 INSERT ... RETURNING，
+        由 SQLAlchemy 合并为多行 VALUES 语句（每批行数由方言的 insertmanyvalues_page_size 控制），
+        同时取回主键和服务端默认值，不再逐条 refresh；其他数据库（如 MySQL）
+        逐条插入后用一条 SELECT 加载服务端默认值。
+        
+        return_defaults=False 时只执行一条 executemany INSERT，不创建实例、不经过工作单元（unit of work），
+        也不取回主键和默认值，适用于只写不读的批量写入（如日志类记录）。
+        
         Args:
             data_list: 包含多个记录数据的字典列表
+            return_defaults: 是否返回创建的实例（含主键和服务端默认值）
             
         Returns:
-            List[ModelType]: 创建的模型实例列表
+            List[ModelType]: 创建的模型实例列表；return_defaults=False 时返回空列表
             
         Raises:
             IntegrityError: 当违反唯一性约束或其他完整性约束时抛出
             
         Example:
             ```python
-            users = user_repo.create_many([
+            users = await user_repo.create_many([
                 {"name": "张三", "email": "zhangsan@example.com"},
                 {"name": "李四", "email": "lisi@example.com"},
             ])
             ```
         """
-        instances = [self.model(**data) for data in data_list]
-        self.db.add_all(instances)
+        if not data_list:
+            return []
+        
+        dialect = self.db.get_bind().dialect
+        instances: List[ModelType] = []
         try:
-            self.db.commit()
-            for instance in instances:
-                self.db.refresh(instance)
-            return instances
+            if not return_defaults:
+                await self.db.execute(insert(self.model), data_list)
+                await self.db.commit()
+            elif dialect.insert_executemany_returning_sort_by_parameter_order:
+                # 返回的实例与 data_list 顺序一致
+                stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+                instances = list((await self.db.scalars(stmt, data_list)).all())
+                await self.db.commit()
+            else:
+                instances = [self.model(**data) for data in data_list]
+                self.db.add_all(instances)
+                await self.db.commit()
+                await self.db.execute(
+                    select(self.model)
+                    .where(self.model.id.in_([instance.id for instance in instances]))
+                    .execution_options(populate_existing=True)
+                )
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
+        
+        self._invalidate_count_cache()
+        return instances
     
     # ==================== Read 操作 ====================
     
-    def get_by_id(self, id: int) -> Optional[ModelType]:
+    async def get_by_id(self, id: int) -> Optional[ModelType]:
         """
         根据 ID 获取记录
         
@@ -237,14 +397,15 @@ class BaseRepository(Generic[ModelType]):
             
         Example:
             ```python
-            user = user_repo.get_by_id(1)
+            user = await user_repo.get_by_id(1)
             if user:
                 print(user.name)
             ```
         """
-        return self.db.query(self.model).filter(self.model.id == id).first()
+        # Session.get 先查会话的标识映射（identity map），本会话已加载过的记录直接返回，不访问数据库
+        return await self.db.get(self.model, id)
     
-    def get_all(self, skip: int = 0, limit: Optional[int] = None) -> List[ModelType]:
+    async def get_all(self, skip: int = 0, limit: Optional[int] = None) -> List[ModelType]:
         """
         获取所有记录（支持分页）
         
@@ -258,20 +419,44 @@ class BaseRepository(Generic[ModelType]):
         Example:
             ```python
             # 获取所有记录
-            users = user_repo.get_all()
+            users = await user_repo.get_all()
             
             # 分页获取
-            users = user_repo.get_all(skip=10, limit=20)
+            users = await user_repo.get_all(skip=10, limit=20)
             ```
         """
-        query = self.db.query(self.model)
+        stmt = select(self.model)
         if skip > 0:
-            query = query.offset(skip)
+            stmt = stmt.offset(skip)
         if limit is not None:
-            query = query.limit(limit)
-        return query.all()
+            stmt = stmt.limit(limit)
+        return list((await self.db.scalars(stmt)).all())
+    
+    async def stream_all(self, batch_size: int = 1000) -> AsyncIterator[ModelType]:
+        """
+        流式读取所有记录
+        
+        使用服务端游标按批次拉取（yield_per），内存占用与记录总数无关，
+        适用于导出等大结果集场景。需在会话关闭前迭代完毕。
+        
+        Args:
+            batch_size: 每批从数据库拉取的行数
+            
+        Yields:
+            ModelType: 模型实例（按 id 正序）
+            
+        Example:
+            ```python
+            async for user in user_repo.stream_all(batch_size=500):
+                writer.writerow(user.to_dict())
+            ```
+        """
+        stmt = select(self.model).order_by(self.model.id).execution_options(yield_per=batch_size)
+        result = await self.db.stream_scalars(stmt)
+        async for instance in result:
+            yield instance
     
-    def get_count(self) -> int:
+    async def get_count(self) -> int:
         """
         获取记录总数
         
@@ -280,12 +465,40 @@ class BaseRepository(Generic[ModelType]):
             
         Example:
             ```python
-            total = user_repo.get_count()
+            total = await user_repo.get_count()
             ```
         """
-        return self.db.query(self.model).count()
+        stmt = select(func.count()).select_from(self.model)
+        return (await self.db.execute(stmt)).scalar_one()
     
-    def exists(self, id: int) -> bool:
+    async def get_approximate_count(self) -> int:
+        """
+        获取记录总数的估算值
+        
+        从数据库统计信息中读取表的估算行数（PostgreSQL 的 pg_class.reltuples、
+        MySQL 的 information_schema.TABLES.TABLE_ROWS），只查询系统目录，耗时与表大小无关。
+        估算值在 ANALYZE（或自动统计）后更新，可能与实际行数有偏差，
+        适用于"约 N 条结果"之类不要求精确的展示；需要精确总数时使用 get_count()。
+        其他数据库或表尚无统计信息时返回精确总数。
+        
+        Returns:
+            int: 估算的记录总数
+            
+        Example:
+            ```python
+            approximate_total = await message_repo.get_approximate_count()
+            ```
+        """
+        stmt = _APPROXIMATE_COUNT_SQL.get(self.db.get_bind().dialect.name)
+        if stmt is not None:
+            result = await self.db.execute(stmt, {"table_name": self.model.__tablename__})
+            estimate = result.scalar()
+            # PostgreSQL 14+ 中从未 ANALYZE 的表 reltuples 为 -1
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+        return await self.get_count()
+    
+    async def exists(self, id: int) -> bool:
         """
         检查记录是否存在
         
@@ -297,15 +510,17 @@ class BaseRepository(Generic[ModelType]):
             
         Example:
             ```python
-            if user_repo.exists(1):
+            if await user_repo.exists(1):
                 print("用户存在")
             ```
         """
-        return self.db.query(self.model).filter(self.model.id == id).first() is not None
+        # SELECT EXISTS(SELECT ... WHERE id = ?)：数据库找到第一条即返回布尔值，不取回行数据
+        stmt = select(exists().where(self.model.id == id))
+        return bool(await self.db.scalar(stmt))
     
     # ==================== Update 操作 ====================
     
-    def update(self, id: int, data: Dict[str, Any]) -> Optional[ModelType]:
+    async def update(self, id: int, data: Dict[str, Any]) -> Optional[ModelType]:
         """
         更新记录
         
@@ -321,28 +536,28 @@ class BaseRepository(Generic[ModelType]):
             
         Example:
             ```python
-            user = user_repo.update(1, {"name": "新名称"})
+            user = await user_repo.update(1, {"name": "新名称"})
             if user:
                 print(f"更新成功: {user.name}")
             ```
         """
-        instance = self.get_by_id(id)
+        instance = await self.get_by_id(id)
         if instance is None:
             return None
         
         for key, value in data.items():
-            if hasattr(instance, key):
+            if key in self._columns:
                 setattr(instance, key, value)
         
         try:
-            self.db.commit()
-            self.db.refresh(instance)
+            await self.db.commit()
+            await self._load_expired_attributes(instance)
             return instance
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
     
-    def update_or_create(
+    async def update_or_create(
         self,
         filter_data: Dict[str, Any],
         update_data: Dict[str, Any],
@@ -353,6 +568,10 @@ class BaseRepository(Generic[ModelType]):
         
         如果记录存在（根据 filter_data 查找），则更新；否则创建新记录。
         
+        filter_data 的字段恰好构成唯一约束（或主键）且数据库支持 ON CONFLICT 时
+        （PostgreSQL、SQLite），使用一条 INSERT ... ON CONFLICT DO UPDATE ... RETURNING 完成，
+        只需一次数据库往返，并由数据库保证并发下不会重复插入；否则先查询再更新或创建。
+        
         Args:
             filter_data: 用于查找记录的过滤条件
             update_data: 更新数据
@@ -364,37 +583,122 @@ class BaseRepository(Generic[ModelType]):
         Example:
             ```python
             # 如果邮箱为 "test@example.com" 的用户存在，则更新；否则创建
-            user = user_repo.update_or_create(
+            user = await user_repo.update_or_create(
                 filter_data={"email": "test@example.com"},
                 update_data={"name": "新名称"},
                 create_data={"name": "新名称", "email": "test@example.com"}
             )
             ```
         """
+        create_dict = create_data if create_data is not None else {**filter_data, **update_data}
+        
+        upsert_stmt = self._build_upsert({**filter_data, **create_dict}, filter_data, update_data)
+        if upsert_stmt is not None:
+            try:
+                upserted = await self.db.scalars(upsert_stmt, execution_options={"populate_existing": True})
+                instance = upserted.one()
+                await self.db.commit()
+            except IntegrityError as e:
+                await self.db.rollback()
+                raise e
+            self._invalidate_count_cache()
+            return instance
+        
         # 构建查询条件
-        filters = [getattr(self.model, key) == value for key, value in filter_data.items()]
-        instance = self.db.query(self.model).filter(and_(*filters)).first()
+        filters = [self._columns[key] == value for key, value in filter_data.items()]
+        result = await self.db.execute(select(self.model).where(and_(*filters)))
+        instance = result.scalars().first()
         
         if instance:
             # 更新现有记录
             for key, value in update_data.items():
-                if hasattr(instance, key):
+                if key in self._columns:
                     setattr(instance, key, value)
             try:
-                self.db.commit()
-                self.db.refresh(instance)
+                await self.db.commit()
+                await self.db.refresh(instance)
                 return instance
             except IntegrityError as e:
-                self.db.rollback()
+                await self.db.rollback()
                 raise e
         else:
             # 创建新记录
-            create_dict = create_data if create_data is not None else {**filter_data, **update_data}
-            return self.create(create_dict)
+            return await self.create(create_dict)
+    
+    def _build_upsert(
+        self,
+        values: Dict[str, Any],
+        filter_data: Dict[str, Any],
+        update_data: Dict[str, Any]
+    ) -> Optional[Any]:
+        """
+        构建 INSERT ... ON CONFLICT DO UPDATE ... RETURNING 语句
+        
+        Args:
+            values: 插入的字段值
+            filter_data: 冲突判断字段（需恰好构成唯一约束或主键）
+            update_data: 冲突时更新的字段值
+            
+        Returns:
+            Optional[Insert]: upsert 语句；方言不支持、filter_data 不是唯一键或没有要更新的字段时返回 None
+        """
+        dialect_insert = _UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+        if dialect_insert is None or not filter_data:
+            return None
+        
+        table = self.model.__table__
+        key_columns = set(filter_data)
+        if not key_columns.issubset(table.c.keys()) or not self._is_unique_key(key_columns):
+            return None
+        
+        set_ = {
+            key: value for key, value in update_data.items()
+            if key in table.c and key not in key_columns
+        }
+        if not set_:
+            return None
+        
+        # ON CONFLICT 的更新不会触发列的 onupdate（如 updated_at），需显式写入
+        for column in table.c:
+            if column.onupdate is not None and column.onupdate.is_clause_element and column.key not in set_:
+                set_[column.key] = column.onupdate.arg
+        
+        return (
+            dialect_insert(self.model)
+            .values(values)
+            .on_conflict_do_update(index_elements=[table.c[key] for key in filter_data], set_=set_)
+            .returning(self.model)
+        )
+    
+    def _is_unique_key(self, column_names: set) -> bool:
+        """
+        判断一组列是否恰好构成表的主键、唯一约束或唯一索引
+        
+        Args:
+            column_names: 列名集合
+            
+        Returns:
+            bool: 构成唯一键返回 True
+        """
+        table = self.model.__table__
+        if len(column_names) == 1:
+            column = table.c[next(iter(column_names))]
+            if column.unique or (column.primary_key and len(table.primary_key.columns) == 1):
+                return True
+        
+        for constraint in table.constraints:
+            if isinstance(constraint, (UniqueConstraint, PrimaryKeyConstraint)):
+                if {column.key for column in constraint.columns} == column_names:
+                    return True
+        
+        return any(
+            index.unique and {column.key for column in index.columns} == column_names
+            for index in table.indexes
+        )
     
     # ==================== Delete 操作 ====================
     
-    def delete(self, id: int) -> bool:
+    async def delete(self, id: int) -> bool:
         """
         删除记录
         
@@ -406,22 +710,27 @@ class BaseRepository(Generic[ModelType]):
             
         Example:
             ```python
-            if user_repo.delete(1):
+            if await user_repo.delete(1):
                 print("删除成功")
             ```
         """
-        instance = self.get_by_id(id)
-        if instance is None:
+        # 一条 DELETE 语句完成删除，按影响行数判断记录是否存在，不先查询再删除
+        # 按主键条件在内存中同步会话（evaluate），已加载的实例被标记为删除，get_by_id 不会从标识映射返回已删除的记录
+        stmt = delete(self.model).where(self.model.id == id)
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        if result.rowcount == 0:
             return False
-        
-        self.db.delete(instance)
-        self.db.commit()
+        self._invalidate_count_cache()
         return True
     
-    def delete_many(self, ids: List[int]) -> int:
+    async def delete_many(self, ids: List[int]) -> int:
         """
         批量删除记录
         
+        ID 列表按批拆分为多条 DELETE（每批的 IN 列表不超过数据库的绑定参数上限），
+        在同一事务中执行并只提交一次。
+        
         Args:
             ids: 要删除的记录 ID 列表
             
@@ -430,15 +739,24 @@ class BaseRepository(Generic[ModelType]):
             
         Example:
             ```python
-            deleted_count = user_repo.delete_many([1, 2, 3])
+            deleted_count = await user_repo.delete_many([1, 2, 3])
             print(f"删除了 {deleted_count} 条记录")
             ```
         """
-        deleted_count = self.db.query(self.model).filter(self.model.id.in_(ids)).delete(synchronize_session=False)
-        self.db.commit()
+        if not ids:
+            return 0
+        
+        batch_size = self._in_batch_size()
+        deleted_count = 0
+        for start in range(0, len(ids), batch_size):
+            stmt = delete(self.model).where(self.model.id.in_(ids[start:start + batch_size]))
+            result = await self.db.execute(stmt)
+            deleted_count += result.rowcount
+        await self.db.commit()
+        self._invalidate_count_cache()
         return deleted_count
     
-    def delete_all(self) -> int:
+    async def delete_all(self) -> int:
         """
         删除所有记录
         
@@ -449,33 +767,40 @@ class BaseRepository(Generic[ModelType]):
             
         Example:
             ```python
-            deleted_count = user_repo.delete_all()
+            deleted_count = await user_repo.delete_all()
             print(f"删除了 {deleted_count} 条记录")
             ```
         """
-        deleted_count = self.db.query(self.model).delete()
-        self.db.commit()
-        return deleted_count
+        result = await self.db.execute(delete(self.model))
+        await self.db.commit()
+        self._invalidate_count_cache()
+        return result.rowcount
     
     # ==================== 分页查询 ====================
     
-    def paginate(
+    async def paginate(
         self,
         page: int = 1,
         page_size: int = 10,
         max_page_size: int = 100,
         order_by: Optional[str] = None,
-        order_desc: bool = False
+        order_desc: bool = False,
+        with_total: bool = True
     ) -> PaginationResult[ModelType]:
         """
         分页查询
         
+        with_total=True 时统计总数（见 _get_total_count，大表的总数会短时缓存）；
+        调用方只需要当前页和是否有下一页时传入 with_total=False，
+        不执行 COUNT，改为多查一条记录判断 has_next，结果的 total 为 None。
+        
         Args:
             page: 页码（从 1 开始）
             page_size: 每页数量
             max_page_size: 最大每页数量
             order_by: 排序字段名（可选）
             order_desc: 是否降序排列（默认 False，即升序）
+            with_total: 是否统计总记录数（默认 True）
             
         Returns:
             PaginationResult[ModelType]: 分页结果对象
@@ -483,13 +808,13 @@ class BaseRepository(Generic[ModelType]):
         Example:
             ```python
             # 基本分页
-            result = user_repo.paginate(page=1, page_size=10)
+            result = await user_repo.paginate(page=1, page_size=10)
             print(f"总数: {result.total}, 当前页: {result.page}")
             for user in result.items:
                 print(user.name)
             
             # 带排序的分页
-            result = user_repo.paginate(
+            result = await user_repo.paginate(
                 page=1,
                 page_size=10,
                 order_by="created_at",
@@ -500,21 +825,36 @@ class BaseRepository(Generic[ModelType]):
         pagination = PaginationParams(page=page, page_size=page_size, max_page_size=max_page_size)
         
         # 构建查询
-        query = self.db.query(self.model)
+        stmt = select(self.model)
         
         # 排序
-        if order_by and hasattr(self.model, order_by):
-            order_column = getattr(self.model, order_by)
+        if order_by and order_by in self._columns:
+            order_column = self._columns[order_by]
             if order_desc:
-                query = query.order_by(desc(order_column))
+                stmt = stmt.order_by(desc(order_column))
             else:
-                query = query.order_by(asc(order_column))
+                stmt = stmt.order_by(asc(order_column))
+        
+        if not with_total:
+            # 多查一条用于判断是否有下一页，无需 COUNT
+            result = await self.db.execute(stmt.offset(pagination.offset).limit(pagination.limit + 1))
+            items = list(result.scalars().all())
+            has_next = len(items) > pagination.limit
+            del items[pagination.limit:]
+            return PaginationResult(
+                items=items,
+                total=None,
+                page=pagination.page,
+                page_size=pagination.page_size,
+                has_next=has_next
+            )
         
         # 获取总数
-        total = query.count()
+        total = await self._get_total_count()
         
         # 分页查询
-        items = query.offset(pagination.offset).limit(pagination.limit).all()
+        result = await self.db.execute(stmt.offset(pagination.offset).limit(pagination.limit))
+        items = list(result.scalars().all())
         
         return PaginationResult(
             items=items,
@@ -523,9 +863,146 @@ class BaseRepository(Generic[ModelType]):
             page_size=pagination.page_size
         )
     
+    async def _get_total_count(self) -> int:
+        """
+        获取分页总数（带短时缓存）
+        
+        大表的 COUNT(*) 需要扫描整个索引，是分页查询的主要开销。总数达到
+        count_cache_min_total 时按 (表名, 写入代数) 缓存 count_cache_ttl 秒；
+        通过 Repository 写入或删除会递增写入代数，使缓存立即失效。
+        其他途径（其他进程、直接 SQL）的写入最多在 count_cache_ttl 秒后反映到总数。
+        
+        Returns:
+            int: 记录总数
+        """
+        table_name = self.model.__tablename__
+        key = (table_name, _count_generations.get(table_name, 0))
+        total = _count_cache.get(key)
+        if total is None:
+            count_stmt = select(func.count()).select_from(self.model)
+            total = (await self.db.execute(count_stmt)).scalar_one()
+            if total >= settings.count_cache_min_total:
+                _count_cache.set(key, total)
+        return total
+    
+    async def _load_server_defaults(self, instance: ModelType) -> None:
+        """
+        加载新插入记录的服务端默认值（如 created_at）
+        
+        支持 INSERT ... RETURNING 的数据库（PostgreSQL、SQLite）在插入时已由 ORM 一并取回
+        主键和服务端默认值（eager_defaults="auto"），无需再查询；其他数据库（如 MySQL）
+        这些属性处于过期状态，异步会话中无法延迟加载，需 refresh 一次。
+        """
+        if not self.db.get_bind().dialect.insert_returning:
+            await self.db.refresh(instance)
+    
+    async def _load_expired_attributes(self, instance: ModelType) -> None:
+        """
+        加载更新后过期的属性（如 onupdate 生成的 updated_at）
+    
+        UPDATE 提交后，由数据库计算的列（onupdate=func.now()）处于过期状态，
+        异步会话中无法延迟加载；这里只 SELECT 这些列，没有过期属性时不查询。
+        """
+        expired = inspect(instance).expired_attributes
+        if expired:
+            await self.db.refresh(instance, attribute_names=list(expired))
+    
+    def _in_batch_size(self) -> int:
+        """获取当前数据库 IN 列表每批的最大元素数"""
+        return _IN_BATCH_SIZES.get(self.db.get_bind().dialect.name, _DEFAULT_IN_BATCH_SIZE)
+    
+    def _invalidate_count_cache(self) -> None:
+        """递增当前表的写入代数，使已缓存的分页总数失效（写入或删除提交后调用）"""
+        table_name = self.model.__tablename__
+        _count_generations[table_name] = _count_generations.get(table_name, 0) + 1
+    
+    async def paginate_keyset(
+        self,
+        cursor: Optional[Tuple[Any, int]] = None,
+        page_size: int = 10,
+        max_page_size: int = 100,
+        order_by: str = "created_at",
+        order_desc: bool = True,
+        **filters
+    ) -> CursorPaginationResult[ModelType]:
+        """
+        游标（keyset）分页查询
+        
+        以 (排序字段, id) 作为游标，下一页通过 WHERE (排序字段, id) < (游标值) 定位，
+        配合以过滤字段、排序字段、id 组成的复合索引做范围扫描，查询耗时与翻页深度无关
+        （OFFSET 分页需要扫描并丢弃前面所有记录）。id 用于区分排序字段值相同的记录。
+        
+        Args:
+            cursor: 上一页返回的 next_cursor，为 None 时查询第一页
+            page_size: 每页数量
+            max_page_size: 最大每页数量
+            order_by: 排序字段名（默认 created_at）
+            order_desc: 是否降序排列（默认 True，即从新到旧）
+            **filters: 过滤条件（字段名=值）
+            
+        Returns:
+            CursorPaginationResult[ModelType]: 游标分页结果对象
+            
+        Raises:
+            ValueError: 当排序字段不存在时抛出
+            
+        Example:
+            ```python
+            # 第一页
+            result = await user_repo.paginate_keyset(page_size=20, is_active=True)
+            
+            # 下一页
+            if result.has_next:
+                result = await user_repo.paginate_keyset(
+                    cursor=result.next_cursor, page_size=20, is_active=True
+                )
+            ```
+        """
+        if order_by not in self._columns:
+            raise ValueError(f"排序字段不存在: {order_by}")
+        
+        page_size = min(max(1, page_size), max_page_size)
+        order_column = self._columns[order_by]
+        
+        stmt = select(self.model)
+        for key, value in filters.items():
+            column = self._columns.get(key)
+            if column is not None:
+                stmt = stmt.where(column == value)
+        
+        # 游标条件：行值比较，降序取更小的记录，升序取更大的记录
+        if cursor is not None:
+            row = tuple_(order_column, self.model.id)
+            bound = tuple_(*cursor, types=[order_column.type, self.model.id.type])
+            stmt = stmt.where(row < bound if order_desc else row > bound)
+        
+        if order_desc:
+            stmt = stmt.order_by(desc(order_column), desc(self.model.id))
+        else:
+            stmt = stmt.order_by(asc(order_column), asc(self.model.id))
+        
+        # 多查一条用于判断是否有下一页，无需 COUNT
+        result = await self.db.execute(stmt.limit(page_size + 1))
+        items = list(result.scalars().all())
+        has_next = len(items) > page_size
+        if has_next:
+            del items[page_size:]
+        
+        next_cursor: Optional[Tuple[Any, int]] = None
+        if has_next:
+            last = items[-1]
+            next_cursor = (getattr(last, order_by), cast(int, last.id))
+        
+        return CursorPaginationResult(
+            items=items,
+            page_size=page_size,
+            has_next=has_next,
+            next_cursor=next_cursor
+        )
+    
     # ==================== 通用查询方法 ====================
     
-    def filter_by(self, **filters) -> List[ModelType]:
+    async def filter_by(self, **filters) -> List[ModelType]:
         """
         根据条件过滤查询
         
@@ -538,19 +1015,20 @@ class BaseRepository(Generic[ModelType]):
         Example:
             ```python
             # 查询 name 为 "张三" 的用户
-            users = user_repo.filter_by(name="张三")
+            users = await user_repo.filter_by(name="张三")
             
             # 多条件查询
-            users = user_repo.filter_by(name="张三", email="zhangsan@example.com")
+            users = await user_repo.filter_by(name="张三", email="zhangsan@example.com")
             ```
         """
-        query = self.db.query(self.model)
+        stmt = select(self.model)
         for key, value in filters.items():
-            if hasattr(self.model, key):
-                query = query.filter(getattr(self.model, key) == value)
-        return query.all()
+            column = self._columns.get(key)
+            if column is not None:
+                stmt = stmt.where(column == value)
+        return list((await self.db.scalars(stmt)).all())
     
-    def filter_one(self, **filters) -> Optional[ModelType]:
+    async def filter_one(self, **filters) -> Optional[ModelType]:
         """
         根据条件查询单条记录
         
@@ -562,18 +1040,19 @@ class BaseRepository(Generic[ModelType]):
             
         Example:
             ```python
-            user = user_repo.filter_one(email="zhangsan@example.com")
+            user = await user_repo.filter_one(email="zhangsan@example.com")
             if user:
                 print(user.name)
             ```
         """
-        query = self.db.query(self.model)
+        stmt = select(self.model)
         for key, value in filters.items():
-            if hasattr(self.model, key):
-                query = query.filter(getattr(self.model, key) == value)
-        return query.first()
+            column = self._columns.get(key)
+            if column is not None:
+                stmt = stmt.where(column == value)
+        return (await self.db.scalars(stmt.limit(1))).first()
     
-    def filter_by_dict(self, filters: Dict[str, Any]) -> List[ModelType]:
+    async def filter_by_dict(self, filters: Dict[str, Any]) -> List[ModelType]:
         """
         根据字典条件过滤查询
         
@@ -585,79 +1064,103 @@ class BaseRepository(Generic[ModelType]):
             
         Example:
             ```python
-            users = user_repo.filter_by_dict({"name": "张三", "email": "zhangsan@example.com"})
+            users = await user_repo.filter_by_dict({"name": "张三", "email": "zhangsan@example.com"})
             ```
         """
-        return self.filter_by(**filters)
+        return await self.filter_by(**filters)
     
-    def search(
+    async def search(
         self,
         search_fields: List[str],
         keyword: str,
         skip: int = 0,
-        limit: Optional[int] = None
-    ) -> List[ModelType]:
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Union[List[ModelType], List[Row]]:
         """
         关键字搜索（模糊匹配）
         
         在指定的多个字段中搜索包含关键字的记录。
         
+        只需要展示部分字段时传入 fields：只查询这些列，返回行元组而不是模型实例，
+        宽表（如包含长文本的消息表）可省去其余列的传输和 ORM 实例构建。
+        
         Args:
             search_fields: 要搜索的字段名列表
             keyword: 搜索关键字
             skip: 跳过的记录数
             limit: 返回的最大记录数
+            fields: 要返回的字段名列表（可选，不传时返回完整的模型实例）
             
         Returns:
-            List[ModelType]: 符合条件的记录列表
+            Union[List[ModelType], List[Row]]: 符合条件的记录列表；传入 fields 时为行元组列表
+            
+        Raises:
+            ValueError: 当 fields 中有不存在的字段时抛出
             
         Example:
             ```python
             # 在 name 和 email 字段中搜索 "张"
-            users = user_repo.search(["name", "email"], "张")
+            users = await user_repo.search(["name", "email"], "张")
+            
+            # 只返回 id 和 name
+            rows = await user_repo.search(["name", "email"], "张", fields=["id", "name"])
+            for user_id, name in rows:
+                print(user_id, name)
             ```
         """
         if not keyword or not search_fields:
             return []
         
-        query = self.db.query(self.model)
+        if fields:
+            unknown = [field for field in fields if field not in self._columns]
+            if unknown:
+                raise ValueError(f"返回字段不存在: {', '.join(unknown)}")
+            stmt = select(*[self._columns[field] for field in fields])
+        else:
+            stmt = select(self.model)
         
         # 构建 OR 条件：任一字段包含关键字
         conditions = []
         for field in search_fields:
-            if hasattr(self.model, field):
-                column = getattr(self.model, field)
+            column = self._columns.get(field)
+            if column is not None:
                 # 使用 LIKE 进行模糊匹配
                 conditions.append(column.like(f"%{keyword}%"))
         
         if conditions:
-            query = query.filter(or_(*conditions))
+            stmt = stmt.where(or_(*conditions))
         
         if skip > 0:
-            query = query.offset(skip)
+            stmt = stmt.offset(skip)
         if limit is not None:
-            query = query.limit(limit)
+            stmt = stmt.limit(limit)
         
-        return query.all()
+        result = await self.db.execute(stmt)
+        if fields:
+            return list(result.all())
+        return list(result.scalars().all())
     
-    def query_builder(self):
+    def query_builder(self) -> Select:
         """
         获取查询构建器
         
-        返回 SQLAlchemy Query 对象，用于构建复杂的自定义查询。
+        返回 SQLAlchemy Select 语句对象，用于构建复杂的自定义查询。
+        构建完成后需通过 `await db.execute(stmt)` 执行。
         
         Returns:
-            Query: SQLAlchemy Query 对象
+            Select: SQLAlchemy Select 语句对象
             
         Example:
             ```python
             # 使用查询构建器进行复杂查询
-            query = user_repo.query_builder()
-            users = query.filter(
+            stmt = user_repo.query_builder().where(
                 User.age >= 18,
                 User.status == "active"
-            ).order_by(User.created_at.desc()).all()
+            ).order_by(User.created_at.desc())
+            result = await db.execute(stmt)
+            users = result.scalars().all()
             ```
         """
-        return self.db.query(self.model)
+        return select(self.model)
 
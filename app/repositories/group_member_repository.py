@@ -4,12 +4,63 @@
 提供群组成员数据访问层，继承自 BaseRepository。
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, bindparam, delete, exists, insert, select
+from sqlalchemy.exc import IntegrityError
 
+from app.models.group import Group
 from app.models.group_member import GroupMember
-from app.repositories.base import BaseRepository
+from app.models.user import User
+from app.repositories.base import _UPSERT_INSERTS, BaseRepository
+
+
+# 高频查询语句在模块级构建一次，参数通过 bindparam 传入，直接命中引擎的 SQL 编译缓存
+_SELECT_MEMBER = select(GroupMember).where(
+    and_(
+        GroupMember.group_id == bindparam("group_id"),
+        GroupMember.user_id == bindparam("user_id")
+    )
+)
+
+_DELETE_MEMBER = delete(GroupMember).where(
+    and_(
+        GroupMember.group_id == bindparam("group_id"),
+        GroupMember.user_id == bindparam("user_id")
+    )
+)
+
+_SELECT_MEMBERS_BY_GROUP = select(GroupMember).where(
+    GroupMember.group_id == bindparam("group_id")
+).order_by(GroupMember.joined_at)
+
+# 单条插入并通过 RETURNING 取回整行（主键、joined_at 等服务端默认值），参数在执行时传入
+_INSERT_MEMBER = insert(GroupMember).returning(GroupMember)
+
+# 群组和用户都存在时才产生一行待插入的成员数据（INSERT ... SELECT 的数据来源）
+_MEMBER_COLUMNS = ["group_id", "user_id", "user_role"]
+_SELECT_VALID_MEMBER = select(
+    bindparam("group_id", type_=GroupMember.group_id.type),
+    bindparam("user_id", type_=GroupMember.user_id.type),
+    bindparam("user_role", type_=GroupMember.user_role.type),
+).where(
+    exists().where(Group.group_id == bindparam("group_id")),
+    exists().where(User.user_id == bindparam("user_id")),
+)
+
+# 校验与插入合并为一条语句：群组或用户不存在时不插入，已是成员时忽略冲突：方言 -> 语句
+_INSERT_VALID_MEMBER = {
+    name: dialect_insert(GroupMember.__table__)
+    .from_select(_MEMBER_COLUMNS, _SELECT_VALID_MEMBER)
+    .on_conflict_do_nothing(index_elements=["group_id", "user_id"])
+    for name, dialect_insert in _UPSERT_INSERTS.items()
+}
+_INSERT_VALID_MEMBER["mysql"] = (
+    insert(GroupMember.__table__)
+    .from_select(_MEMBER_COLUMNS, _SELECT_VALID_MEMBER)
+    .prefix_with("IGNORE")
+)
 
 
 class GroupMemberRepository(BaseRepository[GroupMember]):
@@ -21,33 +72,45 @@ class GroupMemberRepository(BaseRepository[GroupMember]):
     示例：
         ```python
         from app.repositories.group_member_repository import GroupMemberRepository
-        from app.db.session import get_db_session
+        from app.db.session import get_async_db_session
         
-        db = get_db_session()
+        db = get_async_db_session()
         repo = GroupMemberRepository(db)
         
         # 添加成员
-        member = repo.add_member(
+        member = await repo.add_member(
             group_id="group_001",
             user_id="user_001",
             user_role="PATIENT"
         )
         
+        # 群组和用户都存在且尚不是成员时添加（一条语句完成校验和插入）
+        added = await repo.try_add_member("group_001", "user_004", "PATIENT")
+        
+        # 批量添加成员
+        count = await repo.add_members("group_001", [
+            {"user_id": "user_002", "user_role": "PATIENT"},
+            {"user_id": "user_003", "user_role": "DOCTOR"},
+        ])
+        
         # 获取成员
-        member = repo.get_member("group_001", "user_001")
+        member = await repo.get_member("group_001", "user_001")
         
         # 获取群组所有成员
-        members = repo.get_members_by_group("group_001")
+        members = await repo.get_members_by_group("group_001")
+        
+        # 批量获取多个群组的成员
+        members_by_group = await repo.get_members_by_groups(["group_001", "group_002"])
         
         # 移除成员
-        success = repo.remove_member("group_001", "user_001")
+        success = await repo.remove_member("group_001", "user_001")
         ```
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(GroupMember, db)
     
-    def add_member(
+    async def add_member(
         self,
         group_id: str,
         user_id: str,
@@ -67,17 +130,133 @@ class GroupMemberRepository(BaseRepository[GroupMember]):
         Raises:
             IntegrityError: 如果用户已在群组中（联合唯一约束）
         """
-        member = GroupMember(
-            group_id=group_id,
-            user_id=user_id,
-            user_role=user_role
-        )
-        self.db.add(member)
-        self.db.commit()
-        self.db.refresh(member)
+        params = {"group_id": group_id, "user_id": user_id, "user_role": user_role}
+        if not self.db.get_bind().dialect.insert_returning:
+            # 不支持 RETURNING 的数据库（如 MySQL）插入后再加载服务端默认值
+            members = await self.create_many([params])
+            return members[0]
+        
+        # 使用模块级 INSERT ... RETURNING 语句，一次往返写入并取回整行，不经过工作单元（unit of work）
+        try:
+            member = (await self.db.scalars(_INSERT_MEMBER, params)).one()
+            await self.db.commit()
+        except IntegrityError as e:
+            await self.db.rollback()
+            raise e
+        self._invalidate_count_cache()
         return member
     
-    def get_member(
+    async def try_add_member(
+        self,
+        group_id: str,
+        user_id: str,
+        user_role: str
+    ) -> bool:
+        """
+        群组和用户都存在且用户尚不是成员时添加成员
+        
+        校验和插入由一条 INSERT ... SELECT ... WHERE EXISTS 语句完成（已是成员时由
+        ON CONFLICT DO NOTHING / INSERT IGNORE 忽略），常规路径只需一次数据库往返。
+        未插入时可调用 get_membership_status 区分原因。
+        
+        Args:
+            group_id: 群组ID
+            user_id: 用户ID
+            user_role: 用户在群组中的身份标签（PATIENT/DOCTOR/AI_ASSISTANT）
+            
+        Returns:
+            bool: 插入成功返回 True；群组或用户不存在、或用户已在群组中时返回 False
+        """
+        params = {"group_id": group_id, "user_id": user_id, "user_role": user_role}
+        stmt = _INSERT_VALID_MEMBER.get(self.db.get_bind().dialect.name)
+        if stmt is None:
+            group_exists, user_exists, is_member = await self.get_membership_status(group_id, user_id)
+            if not group_exists or not user_exists or is_member:
+                return False
+            await self.add_member(**params)
+            return True
+        
+        result = await self.db.execute(stmt, params)
+        await self.db.commit()
+        if result.rowcount == 0:
+            return False
+        self._invalidate_count_cache()
+        return True
+    
+    async def add_members(
+        self,
+        group_id: str,
+        members: List[Dict[str, str]],
+        ignore_existing: bool = False
+    ) -> int:
+        """
+        批量添加群组成员
+        
+        使用一条 INSERT 语句（executemany）写入所有成员，并只提交一次事务，
+        避免逐条 add + commit 带来的多次数据库往返。
+        
+        ignore_existing=True 时跳过已在群组中的用户而不是报错：PostgreSQL、SQLite 使用
+        INSERT ... ON CONFLICT (group_id, user_id) DO NOTHING 由数据库去重；
+        其他数据库先查询已有成员再写入其余用户。
+        
+        Args:
+            group_id: 群组ID
+            members: 成员列表，每项包含 user_id 和 user_role
+            ignore_existing: 是否跳过已在群组中的用户（默认 False）
+            
+        Returns:
+            int: 实际添加的成员数量
+            
+        Raises:
+            IntegrityError: ignore_existing 为 False 且有用户已在群组中（联合唯一约束）时抛出
+        """
+        if not members:
+            return 0
+        
+        rows = [
+            {
+                "group_id": group_id,
+                "user_id": member["user_id"],
+                "user_role": member["user_role"],
+            }
+            for member in members
+        ]
+        
+        if ignore_existing:
+            dialect_insert = _UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+            if dialect_insert is not None:
+                stmt = (
+                    dialect_insert(GroupMember)
+                    .on_conflict_do_nothing(index_elements=["group_id", "user_id"])
+                    .returning(GroupMember.user_id)
+                )
+                # RETURNING 只返回实际插入的行
+                result = await self.db.execute(stmt, rows)
+                count = len(result.all())
+                await self.db.commit()
+                if count:
+                    self._invalidate_count_cache()
+                return count
+            
+            result = await self.db.execute(
+                select(GroupMember.user_id).where(
+                    and_(
+                        GroupMember.group_id == group_id,
+                        GroupMember.user_id.in_([row["user_id"] for row in rows])
+                    )
+                )
+            )
+            existing_user_ids = set(result.scalars().all())
+            rows = [row for row in rows if row["user_id"] not in existing_user_ids]
+            if not rows:
+                return 0
+        
+        await self.db.execute(insert(GroupMember), rows)
+        await self.db.commit()
+        self._invalidate_count_cache()
+        return len(rows)
+    
+    async def get_member(
         self,
         group_id: str,
         user_id: str
@@ -92,14 +271,80 @@ class GroupMemberRepository(BaseRepository[GroupMember]):
         Returns:
             Optional[GroupMember]: 群组成员对象，如果不存在返回 None
         """
-        return self.db.query(GroupMember).filter(
-            and_(
-                GroupMember.group_id == group_id,
-                GroupMember.user_id == user_id
+        result = await self.db.execute(_SELECT_MEMBER, {"group_id": group_id, "user_id": user_id})
+        return result.scalar_one_or_none()
+    
+    async def get_membership_status(
+        self,
+        group_id: str,
+        user_id: str
+    ) -> Tuple[bool, bool, bool]:
+        """
+        一次查询获取群组、用户及成员关系的存在状态
+        
+        将三个相互独立的存在性检查合并为一条 SELECT EXISTS 语句，
+        只需一次数据库往返。
+        
+        Args:
+            group_id: 群组ID
+            user_id: 用户ID
+            
+        Returns:
+            Tuple[bool, bool, bool]: (群组是否存在, 用户是否存在, 用户是否已在群组中)
+        """
+        stmt = select(
+            exists().where(Group.group_id == group_id),
+            exists().where(User.user_id == user_id),
+            exists().where(
+                and_(
+                    GroupMember.group_id == group_id,
+                    GroupMember.user_id == user_id
+                )
+            ),
+        )
+        result = await self.db.execute(stmt)
+        group_exists, user_exists, is_member = result.one()
+        return bool(group_exists), bool(user_exists), bool(is_member)
+    
+    async def get_bulk_membership_status(
+        self,
+        group_id: str,
+        user_ids: List[str]
+    ) -> Tuple[bool, Set[str], Set[str]]:
+        """
+        批量获取群组、用户及成员关系的存在状态
+        
+        用于批量添加成员前的校验，查询次数与用户数量无关。
+        
+        Args:
+            group_id: 群组ID
+            user_ids: 用户ID列表
+            
+        Returns:
+            Tuple[bool, Set[str], Set[str]]: (群组是否存在, 已存在的用户ID集合, 已在群组中的用户ID集合)
+        """
+        group_exists = await self.db.scalar(
+            select(exists().where(Group.group_id == group_id))
+        )
+        
+        result = await self.db.execute(
+            select(User.user_id).where(User.user_id.in_(user_ids))
+        )
+        existing_user_ids = set(result.scalars().all())
+        
+        result = await self.db.execute(
+            select(GroupMember.user_id).where(
+                and_(
+                    GroupMember.group_id == group_id,
+                    GroupMember.user_id.in_(user_ids)
+                )
             )
-        ).first()
+        )
+        member_user_ids = set(result.scalars().all())
+        
+        return bool(group_exists), existing_user_ids, member_user_ids
     
-    def get_members_by_group(self, group_id: str) -> List[GroupMember]:
+    async def get_members_by_group(self, group_id: str) -> List[GroupMember]:
         """
         获取群组的所有成员
         
@@ -109,11 +354,41 @@ class GroupMemberRepository(BaseRepository[GroupMember]):
         Returns:
             List[GroupMember]: 群组成员列表
         """
-        return self.db.query(GroupMember).filter(
-            GroupMember.group_id == group_id
-        ).order_by(GroupMember.joined_at).all()
+        result = await self.db.execute(_SELECT_MEMBERS_BY_GROUP, {"group_id": group_id})
+        return list(result.scalars().all())
+    
+    async def get_members_by_groups(
+        self,
+        group_ids: List[str],
+        batch_size: int = 1000
+    ) -> Dict[str, List[GroupMember]]:
+        """
+        批量获取多个群组的成员
+        
+        每 batch_size 个群组一条 WHERE group_id IN (...) 查询，避免逐个群组查询（N+1），
+        也避免单条语句的参数过多。
+        
+        Args:
+            group_ids: 群组ID列表
+            batch_size: 每条查询包含的群组数量
+            
+        Returns:
+            Dict[str, List[GroupMember]]: 群组ID -> 成员列表（按加入时间排序）；没有成员的群组不在结果中
+        """
+        members_by_group: Dict[str, List[GroupMember]] = defaultdict(list)
+        unique_ids = list(dict.fromkeys(group_ids))
+        
+        for start in range(0, len(unique_ids), batch_size):
+            stmt = select(GroupMember).where(
+                GroupMember.group_id.in_(unique_ids[start:start + batch_size])
+            ).order_by(GroupMember.group_id, GroupMember.joined_at)
+            result = await self.db.execute(stmt)
+            for member in result.scalars():
+                members_by_group[member.group_id].append(member)
+        
+        return dict(members_by_group)
     
-    def remove_member(
+    async def remove_member(
         self,
         group_id: str,
         user_id: str
@@ -128,15 +403,19 @@ class GroupMemberRepository(BaseRepository[GroupMember]):
         Returns:
             bool: 是否移除成功（如果成员不存在返回 False）
         """
-        member = self.get_member(group_id, user_id)
-        if not member:
+        # 一条 DELETE 语句完成移除，按影响行数判断成员是否存在
+        result = await self.db.execute(
+            _DELETE_MEMBER,
+            {"group_id": group_id, "user_id": user_id},
+            execution_options={"synchronize_session": False}
+        )
+        await self.db.commit()
+        if result.rowcount == 0:
             return False
-        
-        self.db.delete(member)
-        self.db.commit()
+        self._invalidate_count_cache()
         return True
     
-    def get_groups_by_user(self, user_id: str) -> List[GroupMember]:
+    async def get_groups_by_user(self, user_id: str) -> List[GroupMember]:
         """
         获取用户所在的所有群组
         
@@ -146,11 +425,13 @@ class GroupMemberRepository(BaseRepository[GroupMember]):
         Returns:
             List[GroupMember]: 群组成员列表（每个成员代表一个群组）
         """
-        return self.db.query(GroupMember).filter(
+        stmt = select(GroupMember).where(
             GroupMember.user_id == user_id
-        ).order_by(GroupMember.joined_at).all()
+        ).order_by(GroupMember.joined_at)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
     
-    def get_members_by_role(
+    async def get_members_by_role(
         self,
         group_id: str,
         user_role: str
@@ -165,9 +446,11 @@ class GroupMemberRepository(BaseRepository[GroupMember]):
         Returns:
             List[GroupMember]: 群组成员列表
         """
-        return self.db.query(GroupMember).filter(
+        stmt = select(GroupMember).where(
             and_(
                 GroupMember.group_id == group_id,
                 GroupMember.user_role == user_role
             )
-        ).order_by(GroupMember.joined_at).all()
+        ).order_by(GroupMember.joined_at)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
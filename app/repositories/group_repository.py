@@ -5,12 +5,17 @@
 """
 
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, exists, select
 
 from app.models.group import Group
 from app.repositories.base import BaseRepository
 
 
+# 高频查询语句在模块级构建一次，参数通过 bindparam 传入，直接命中引擎的 SQL 编译缓存
+_SELECT_BY_ID = select(Group).where(Group.group_id == bindparam("group_id"))
+
+
 class GroupRepository(BaseRepository[Group]):
     """
     群组 Repository
@@ -20,13 +25,13 @@ class GroupRepository(BaseRepository[Group]):
     示例：
         ```python
         from app.repositories.group_repository import GroupRepository
-        from app.db.session import get_db_session
+        from app.db.session import get_async_db_session
         
-        db = get_db_session()
+        db = get_async_db_session()
         repo = GroupRepository(db)
         
         # 创建群组
-        group = repo.create(
+        group = await repo.create(
             group_id="group_001",
             group_name="医疗咨询群",
             description="患者和医生的咨询群组",
@@ -34,18 +39,22 @@ class GroupRepository(BaseRepository[Group]):
         )
         
         # 根据 group_id 查询
-        group = repo.get_by_id("group_001")
+        group = await repo.get_by_id("group_001")
+        
+        # 检查是否存在
+        if await repo.exists("group_001"):
+            ...
         
         # 更新群组
         group.group_name = "新群组名"
-        updated_group = repo.update(group)
+        updated_group = await repo.update(group)
         ```
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(Group, db)
     
-    def create(
+    async def create(
         self,
         group_id: str,
         group_name: str,
@@ -74,11 +83,12 @@ class GroupRepository(BaseRepository[Group]):
             created_by=created_by
         )
         self.db.add(group)
-        self.db.commit()
-        self.db.refresh(group)
+        await self.db.commit()
+        self._invalidate_count_cache()
+        await self._load_server_defaults(group)
         return group
     
-    def get_by_id(self, group_id: str) -> Optional[Group]:
+    async def get_by_id(self, group_id: str) -> Optional[Group]:
         """
         根据 group_id 获取群组
         
@@ -88,23 +98,40 @@ class GroupRepository(BaseRepository[Group]):
         Returns:
             Optional[Group]: 群组对象，如果不存在返回 None
         """
-        return self.db.query(Group).filter(Group.group_id == group_id).first()
+        result = await self.db.execute(_SELECT_BY_ID, {"group_id": group_id})
+        return result.scalar_one_or_none()
     
-    def update(self, group: Group) -> Group:
+    async def exists(self, group_id: str) -> bool:
+        """
+        检查群组是否存在
+        
+        只需判断存在性时使用，不取回整行、不构建 ORM 实例。
+        
+        Args:
+            group_id: 群组唯一标识
+            
+        Returns:
+            bool: 存在返回 True，否则返回 False
+        """
+        return bool(await self.db.scalar(select(exists().where(Group.group_id == group_id))))
+    
+    async def update(self, group: Group) -> Group:
         """
         更新群组
         
+        提交后只加载 onupdate 生成的 updated_at，不再 refresh 整行。
+        
         Args:
             group: 群组对象（已修改）
             
         Returns:
             Group: 更新后的群组对象
         """
-        self.db.commit()
-        self.db.refresh(group)
+        await self.db.commit()
+        await self._load_expired_attributes(group)
         return group
     
-    def get_by_creator(self, created_by: str) -> list[Group]:
+    async def get_by_creator(self, created_by: str) -> list[Group]:
         """
         根据创建人获取群组列表
         
@@ -114,4 +141,5 @@ class GroupRepository(BaseRepository[Group]):
         Returns:
             list[Group]: 群组列表
         """
-        return self.db.query(Group).filter(Group.created_by == created_by).all()
+        result = await self.db.execute(select(Group).where(Group.created_by == created_by))
+        return list(result.scalars().all())
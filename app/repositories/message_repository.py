@@ -4,14 +4,43 @@
 提供消息数据访问层，继承自 BaseRepository。
 """
 
-from typing import Optional, Tuple, List
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, desc, func, select, update
 
+from app.models.group import Group
 from app.models.message import Message
 from app.repositories.base import BaseRepository
 
 
+# 高频查询语句在模块级构建一次，参数通过 bindparam 传入：
+# 每次调用不再重新构建语句和生成缓存键，直接命中引擎的 SQL 编译缓存
+_SELECT_MESSAGE_BY_ID = select(Message).where(Message.message_id == bindparam("message_id"))
+
+# 按主键倒序（即从新到旧）：与 before_id 游标分页的顺序一致，页码分页的最后一条可直接作为游标；
+# created_at 精度有限（MySQL/SQLite 为秒，PostgreSQL 为事务开始时间），不能作为唯一的排序依据
+_SELECT_GROUP_MESSAGES = (
+    select(Message)
+    .where(Message.group_id == bindparam("group_id"))
+    .order_by(desc(Message.id))
+)
+
+_SELECT_GROUP_MESSAGE_PAGE = _SELECT_GROUP_MESSAGES.offset(bindparam("offset")).limit(bindparam("limit"))
+
+_SELECT_RECENT_GROUP_MESSAGES = _SELECT_GROUP_MESSAGES.limit(bindparam("limit"))
+
+_SELECT_GROUP_MESSAGE_COUNT = select(Group.message_count).where(Group.group_id == bindparam("group_id"))
+
+# 群组消息计数（groups.message_count）增加 count，可按群组 executemany
+_groups = Group.__table__
+_INCREMENT_MESSAGE_COUNT = (
+    update(_groups)
+    .where(_groups.c.group_id == bindparam("target_group_id"))
+    .values(message_count=_groups.c.message_count + bindparam("count"))
+)
+
+
 class MessageRepository(BaseRepository[Message]):
     """
     消息 Repository
@@ -21,13 +50,13 @@ class MessageRepository(BaseRepository[Message]):
     示例：
         ```python
         from app.repositories.message_repository import MessageRepository
-        from app.db.session import get_db_session
+        from app.db.session import get_async_db_session
         
-        db = get_db_session()
+        db = get_async_db_session()
         repo = MessageRepository(db)
         
         # 创建消息
-        message = repo.create(
+        message = await repo.create(
             message_id="msg_001",
             group_id="group_001",
             from_user_id="user_001",
@@ -36,17 +65,17 @@ class MessageRepository(BaseRepository[Message]):
         )
         
         # 根据 message_id 查询
-        message = repo.get_by_id("msg_001")
+        message = await repo.get_by_id("msg_001")
         
         # 获取群组消息（分页）
-        messages, total = repo.get_by_group("group_001", page=1, page_size=20)
+        messages, total, has_next = await repo.get_by_group("group_001", page=1, page_size=20)
         ```
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(Message, db)
     
-    def create(
+    async def create(
         self,
         message_id: str,
         group_id: str,
@@ -57,6 +86,8 @@ class MessageRepository(BaseRepository[Message]):
         """
         创建消息
         
+        同一事务内递增所属群组的 message_count，保证计数与消息一致。
+        
         Args:
             message_id: 消息唯一标识
             group_id: 群组ID
@@ -78,11 +109,105 @@ class MessageRepository(BaseRepository[Message]):
             msg_content=msg_content
         )
         self.db.add(message)
-        self.db.commit()
-        self.db.refresh(message)
+        await self.db.execute(_INCREMENT_MESSAGE_COUNT, {"target_group_id": group_id, "count": 1})
+        await self.db.commit()
+        self._invalidate_count_cache()
+        await self._load_server_defaults(message)
         return message
     
-    def get_by_id(self, message_id: str) -> Optional[Message]:
+    async def create_many(
+        self,
+        data_list: List[Dict[str, Any]],
+        return_defaults: bool = True
+    ) -> List[Message]:
+        """
+        批量创建消息
+        
+        同一事务内按群组递增 message_count（每个群组一条 UPDATE，executemany）。
+        
+        Args:
+            data_list: 消息字段字典列表
+            return_defaults: 是否返回创建的实例（含主键和服务端默认值）
+            
+        Returns:
+            List[Message]: 创建的消息列表；return_defaults=False 时返回空列表
+            
+        Raises:
+            IntegrityError: 如果 message_id 已存在（计数的更新一并回滚）
+        """
+        if not data_list:
+            return []
+        
+        counts = Counter(data["group_id"] for data in data_list)
+        await self.db.execute(
+            _INCREMENT_MESSAGE_COUNT,
+            [{"target_group_id": group_id, "count": count} for group_id, count in counts.items()]
+        )
+        # 由基类插入并提交，计数的更新在同一事务中
+        return await super().create_many(data_list, return_defaults=return_defaults)
+    
+    async def delete(self, id: int) -> bool:
+        """
+        删除消息
+        
+        同一事务内递减所属群组的 message_count（消息不存在时不更新）。
+        
+        Args:
+            id: 消息主键 ID
+            
+        Returns:
+            bool: 删除成功返回 True，消息不存在返回 False
+        """
+        await self.db.execute(
+            update(Group)
+            .where(Group.group_id == select(Message.group_id).where(Message.id == id).scalar_subquery())
+            .values(message_count=Group.message_count - 1)
+        )
+        return await super().delete(id)
+    
+    async def delete_many(self, ids: List[int]) -> int:
+        """
+        批量删除消息
+        
+        同一事务内按群组递减 message_count，按与基类相同的批大小拆分 IN 列表。
+        
+        Args:
+            ids: 消息主键 ID 列表
+            
+        Returns:
+            int: 实际删除的消息数
+        """
+        if not ids:
+            return 0
+        
+        batch_size = self._in_batch_size()
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            deleted_in_group = (
+                select(func.count(Message.id))
+                .where(Message.group_id == Group.group_id, Message.id.in_(batch))
+                .scalar_subquery()
+            )
+            await self.db.execute(
+                update(Group)
+                .where(Group.group_id.in_(select(Message.group_id).where(Message.id.in_(batch))))
+                .values(message_count=Group.message_count - deleted_in_group)
+            )
+        return await super().delete_many(ids)
+    
+    async def delete_all(self) -> int:
+        """
+        删除所有消息
+        
+        警告：此操作会删除所有群组的全部消息，请谨慎使用！同一事务内将所有群组的 message_count 置为 0。
+        
+        Returns:
+            int: 删除的消息数
+        """
+        await self.db.execute(update(Group).values(message_count=0))
+        return await super().delete_all()
+    
+    async def get_by_id(self, message_id: str) -> Optional[Message]:
         """
         根据 message_id 获取消息
         
@@ -92,43 +217,110 @@ class MessageRepository(BaseRepository[Message]):
         Returns:
             Optional[Message]: 消息对象，如果不存在返回 None
         """
-        return self.db.query(Message).filter(
-            Message.message_id == message_id
-        ).first()
+        result = await self.db.execute(_SELECT_MESSAGE_BY_ID, {"message_id": message_id})
+        return result.scalars().first()
     
-    def get_by_group(
+    async def get_by_group(
         self,
         group_id: str,
         page: int = 1,
         page_size: int = 20
-    ) -> Tuple[List[Message], int]:
+    ) -> Tuple[List[Message], int, bool]:
         """
         获取群组消息（分页）
         
+        按 id 倒序（即从新到旧）分页，与 get_by_group_before 的顺序一致，
+        当前页最后一条消息的 id 可作为 before_id 继续向后翻页。
+        
+        先查询当前页消息，多查询一条判断是否还有下一页（不依赖群组的冗余计数）；
+        第一页没有下一页时，消息数即总记录数，不再读取群组计数。
+        
         Args:
             group_id: 群组ID
             page: 页码（从1开始）
             page_size: 每页数量
             
         Returns:
-            Tuple[List[Message], int]: (消息列表, 总记录数)
+            Tuple[List[Message], int, bool]: (消息列表, 总记录数, 是否还有下一页)，群组不存在时总记录数为 0
         """
         # 计算偏移量
         offset = (page - 1) * page_size
         
-        # 查询总数
-        total = self.db.query(Message).filter(
-            Message.group_id == group_id
-        ).count()
+        # 查询消息列表（按 id 倒序，即从新到旧）
+        result = await self.db.execute(
+            _SELECT_GROUP_MESSAGE_PAGE,
+            {"group_id": group_id, "offset": offset, "limit": page_size + 1}
+        )
+        messages = list(result.scalars().all())
+        has_next = len(messages) > page_size
+        messages = messages[:page_size]
+        
+        # 第一页且没有下一页：消息已全部取回，无需再查总数
+        if page == 1 and not has_next:
+            return messages, len(messages), has_next
+        
+        # 总数读取群组的冗余计数（按唯一索引查一行），不再对消息表 COUNT(*)
+        result = await self.db.execute(_SELECT_GROUP_MESSAGE_COUNT, {"group_id": group_id})
+        total = result.scalar_one_or_none() or 0
+        
+        return messages, total, has_next
+    
+    async def get_by_group_before(
+        self,
+        group_id: str,
+        before_id: Optional[int] = None,
+        limit: int = 20
+    ) -> List[Message]:
+        """
+        获取群组消息（游标分页）
+        
+        按主键倒序返回 id 小于 before_id 的消息，使用 (group_id, id) 索引做范围扫描，
+        查询耗时与翻页深度无关（OFFSET 分页需要扫描并丢弃前面所有记录）。
         
-        # 查询消息列表（按创建时间倒序）
-        messages = self.db.query(Message).filter(
-            Message.group_id == group_id
-        ).order_by(desc(Message.created_at)).offset(offset).limit(page_size).all()
+        Args:
+            group_id: 群组ID
+            before_id: 游标，只返回 id 小于该值的消息；为 None 时从最新消息开始
+            limit: 返回数量
+            
+        Returns:
+            List[Message]: 消息列表（按 id 倒序，即从新到旧）
+        """
+        stmt = select(Message).where(Message.group_id == group_id)
+        if before_id is not None:
+            stmt = stmt.where(Message.id < before_id)
+        stmt = stmt.order_by(desc(Message.id)).limit(limit)
         
-        return messages, total
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
     
-    def get_by_user(
+    async def stream_by_group(
+        self,
+        group_id: str,
+        batch_size: int = 500
+    ) -> AsyncIterator[Message]:
+        """
+        流式读取群组的全部消息
+        
+        使用服务端游标按批次拉取，内存占用与消息总数无关，适用于导出等大结果集场景。
+        
+        Args:
+            group_id: 群组ID
+            batch_size: 每批从数据库拉取的行数
+            
+        Yields:
+            Message: 消息对象（按 id 正序，即从旧到新）
+        """
+        stmt = (
+            select(Message)
+            .where(Message.group_id == group_id)
+            .order_by(Message.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream_scalars(stmt)
+        async for message in result:
+            yield message
+    
+    async def get_by_user(
         self,
         from_user_id: str,
         limit: Optional[int] = None
@@ -143,16 +335,17 @@ class MessageRepository(BaseRepository[Message]):
         Returns:
             List[Message]: 消息列表（按创建时间倒序）
         """
-        query = self.db.query(Message).filter(
+        stmt = select(Message).where(
             Message.from_user_id == from_user_id
         ).order_by(desc(Message.created_at))
         
         if limit:
-            query = query.limit(limit)
+            stmt = stmt.limit(limit)
         
-        return query.all()
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
     
-    def get_recent_messages(
+    async def get_recent_messages(
         self,
         group_id: str,
         limit: int = 10
@@ -165,8 +358,10 @@ class MessageRepository(BaseRepository[Message]):
             limit: 返回数量，默认10条
             
         Returns:
-            List[Message]: 消息列表（按创建时间倒序）
+            List[Message]: 消息列表（按 id 倒序，即从新到旧）
         """
-        return self.db.query(Message).filter(
-            Message.group_id == group_id
-        ).order_by(desc(Message.created_at)).limit(limit).all()
+        result = await self.db.execute(
+            _SELECT_RECENT_GROUP_MESSAGES,
+            {"group_id": group_id, "limit": limit}
+        )
+        return list(result.scalars().all())
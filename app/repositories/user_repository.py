@@ -4,14 +4,18 @@
 提供用户数据访问层，继承自 BaseRepository。
 """
 
-from typing import Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from typing import AsyncIterator, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, exists, select
 
 from app.models.user import User
 from app.repositories.base import BaseRepository
 
 
+# 高频查询语句在模块级构建一次，参数通过 bindparam 传入，直接命中引擎的 SQL 编译缓存
+_SELECT_BY_ID = select(User).where(User.user_id == bindparam("user_id"))
+
+
 class UserRepository(BaseRepository[User]):
     """
     用户 Repository
@@ -21,27 +25,31 @@ class UserRepository(BaseRepository[User]):
     示例：
         ```python
         from app.repositories.user_repository import UserRepository
-        from app.db.session import get_db_session
+        from app.db.session import get_async_db_session
         
-        db = get_db_session()
+        db = get_async_db_session()
         repo = UserRepository(db)
         
         # 创建用户
-        user = repo.create(user_id="user_001", username="张三", user_role="PATIENT")
+        user = await repo.create(user_id="user_001", username="张三", user_role="PATIENT")
         
         # 根据 user_id 查询
-        user = repo.get_by_id("user_001")
+        user = await repo.get_by_id("user_001")
+        
+        # 检查是否存在
+        if await repo.exists("user_001"):
+            ...
         
         # 更新用户
         user.username = "李四"
-        updated_user = repo.update(user)
+        updated_user = await repo.update(user)
         ```
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(User, db)
     
-    def create(
+    async def create(
         self,
         user_id: str,
         username: str,
@@ -67,11 +75,12 @@ class UserRepository(BaseRepository[User]):
             user_role=user_role
         )
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        self._invalidate_count_cache()
+        await self._load_server_defaults(user)
         return user
     
-    def get_by_id(self, user_id: str) -> Optional[User]:
+    async def get_by_id(self, user_id: str) -> Optional[User]:
         """
         根据 user_id 获取用户
         
@@ -81,23 +90,40 @@ class UserRepository(BaseRepository[User]):
         Returns:
             Optional[User]: 用户对象，如果不存在返回 None
         """
-        return self.db.query(User).filter(User.user_id == user_id).first()
+        result = await self.db.execute(_SELECT_BY_ID, {"user_id": user_id})
+        return result.scalar_one_or_none()
+    
+    async def exists(self, user_id: str) -> bool:
+        """
+        检查用户是否存在
+        
+        只需判断存在性时使用，不取回整行、不构建 ORM 实例。
+        
+        Args:
+            user_id: 用户唯一标识
+            
+        Returns:
+            bool: 存在返回 True，否则返回 False
+        """
+        return bool(await self.db.scalar(select(exists().where(User.user_id == user_id))))
     
-    def update(self, user: User) -> User:
+    async def update(self, user: User) -> User:
         """
         更新用户
         
+        提交后只加载 onupdate 生成的 updated_at，不再 refresh 整行。
+        
         Args:
             user: 用户对象（已修改）
             
         Returns:
             User: 更新后的用户对象
         """
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self._load_expired_attributes(user)
         return user
     
-    def get_by_role(self, user_role: str) -> list[User]:
+    async def get_by_role(self, user_role: str) -> list[User]:
         """
         根据用户身份获取用户列表
         
@@ -107,4 +133,33 @@ class UserRepository(BaseRepository[User]):
         Returns:
             list[User]: 用户列表
         """
-        return self.db.query(User).filter(User.user_role == user_role).all()
+        result = await self.db.execute(select(User).where(User.user_role == user_role))
+        return list(result.scalars().all())
+    
+    async def iter_by_role(
+        self,
+        user_role: str,
+        batch_size: int = 500
+    ) -> AsyncIterator[User]:
+        """
+        流式读取指定身份的全部用户
+        
+        使用服务端游标按批次拉取，内存占用与用户数量无关；用户较多（如 PATIENT）时
+        代替 get_by_role 一次性加载全部记录。需在会话关闭前迭代完毕。
+        
+        Args:
+            user_role: 用户身份（PATIENT/DOCTOR/AI_ASSISTANT）
+            batch_size: 每批从数据库拉取的行数
+            
+        Yields:
+            User: 用户对象（按 id 正序）
+        """
+        stmt = (
+            select(User)
+            .where(User.user_role == user_role)
+            .order_by(User.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream_scalars(stmt)
+        async for user in result:
+            yield user
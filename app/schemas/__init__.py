@@ -14,6 +14,7 @@ from app.schemas.group import (
     GroupCreate,
     GroupResponse,
     GroupMemberAdd,
+    GroupMemberBulkAdd,
 )
 
 from app.schemas.message import (
@@ -31,6 +32,7 @@ __all__ = [
     "GroupCreate",
     "GroupResponse",
     "GroupMemberAdd",
+    "GroupMemberBulkAdd",
     # 消息 Schema
     "MessageCreate",
     "MessageResponse",
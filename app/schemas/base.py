@@ -0,0 +1,63 @@
+"""
+Schema 基础类
+
+提供由 ORM 模型创建响应数据的公共基类。
+"""
+
+from typing import Any, ClassVar, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+ResponseType = TypeVar("ResponseType", bound="ORMResponseModel")
+
+
+class ORMResponseModel(BaseModel):
+    """
+    ORM 响应 Schema 基类
+
+    子类可通过 model_validate 从 ORM 模型创建（from_attributes=True）；
+    对于刚从数据库读出的记录（字段类型已由列类型保证），可使用 from_orm_trusted
+    跳过逐字段校验，直接构建实例。
+
+    示例：
+        ```python
+        from app.schemas.base import ORMResponseModel
+
+        class MessageResponse(ORMResponseModel):
+            id: int
+            msg_content: str
+
+        response = MessageResponse.from_orm_trusted(message)
+        ```
+    """
+
+    model_config = ConfigDict(from_attributes=True)  # 允许从 ORM 模型创建
+
+    # 字段名缓存（每个响应类首次调用 _field_names 时写入）
+    _orm_field_names: ClassVar[Tuple[str, ...]]
+
+    @classmethod
+    def _field_names(cls) -> Tuple[str, ...]:
+        """获取字段名列表（按响应类缓存）"""
+        # 只读取当前类自身的缓存，避免子类复用父类的字段列表
+        names = cls.__dict__.get("_orm_field_names")
+        if names is None:
+            names = tuple(cls.model_fields)
+            cls._orm_field_names = names
+        return names
+
+    @classmethod
+    def from_orm_trusted(cls: Type[ResponseType], obj: Any) -> ResponseType:
+        """
+        由数据库读出的 ORM 实例构建响应（不做校验）
+
+        使用 model_construct 直接赋值，跳过 Pydantic 的类型校验和转换。
+        只用于字段类型已由数据库列保证的可信数据，请求数据仍应使用 model_validate。
+
+        Args:
+            obj: ORM 模型实例
+
+        Returns:
+            响应 Schema 实例
+        """
+        return cls.model_construct(**{name: getattr(obj, name) for name in cls._field_names()})
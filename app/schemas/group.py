@@ -5,8 +5,10 @@
 """
 
 from datetime import datetime
-from typing import Optional, Literal
-from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional, Literal
+from pydantic import BaseModel, Field
+
+from app.schemas.base import ORMResponseModel
 
 
 class GroupCreate(BaseModel):
@@ -29,7 +31,7 @@ class GroupCreate(BaseModel):
     )
 
 
-class GroupResponse(BaseModel):
+class GroupResponse(ORMResponseModel):
     """
     群组响应 Schema
     
@@ -43,8 +45,6 @@ class GroupResponse(BaseModel):
     created_by: str = Field(..., description="创建人ID")
     created_at: datetime = Field(..., description="创建时间")
     updated_at: datetime = Field(..., description="更新时间")
-    
-    model_config = ConfigDict(from_attributes=True)  # 允许从 ORM 模型创建
 
 
 class GroupMemberAdd(BaseModel):
@@ -65,3 +65,18 @@ class GroupMemberAdd(BaseModel):
         ...,
         description="用户在群组中的身份标签：PATIENT/DOCTOR/AI_ASSISTANT"
     )
+
+
+class GroupMemberBulkAdd(BaseModel):
+    """
+    群组成员批量添加 Schema
+    
+    用于批量添加群组成员的请求数据验证。
+    """
+    
+    members: List[GroupMemberAdd] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="成员列表（1-500）"
+    )
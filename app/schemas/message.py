@@ -5,8 +5,10 @@
 """
 
 from datetime import datetime
-from typing import List
-from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from app.schemas.base import ORMResponseModel
 
 
 class MessageCreate(BaseModel):
@@ -31,7 +33,7 @@ class MessageCreate(BaseModel):
     )
 
 
-class MessageResponse(BaseModel):
+class MessageResponse(ORMResponseModel):
     """
     消息响应 Schema
     
@@ -46,8 +48,6 @@ class MessageResponse(BaseModel):
     msg_content: str = Field(..., description="消息内容")
     created_at: datetime = Field(..., description="创建时间")
     updated_at: datetime = Field(..., description="更新时间")
-    
-    model_config = ConfigDict(from_attributes=True)  # 允许从 ORM 模型创建
 
 
 class MessageListResponse(BaseModel):
@@ -58,6 +58,11 @@ class MessageListResponse(BaseModel):
     """
     
     messages: List[MessageResponse] = Field(..., description="消息列表")
-    total: int = Field(..., description="总记录数")
+    total: Optional[int] = Field(None, description="总记录数（游标分页时不统计，为 None）")
     page: int = Field(..., description="当前页码")
     page_size: int = Field(..., description="每页数量")
+    has_more: bool = Field(False, description="是否还有更多消息（可继续翻页）")
+    next_before_id: Optional[int] = Field(
+        None,
+        description="下一页游标（作为 before_id 传入），没有更多消息时为 None",
+    )
@@ -6,7 +6,14 @@
 
 from datetime import datetime
 from typing import Optional, Literal
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field
+
+from app.schemas.base import ORMResponseModel
+
+
+# 用户身份取值（与下方 Literal 一致），供服务层校验未经 Schema 约束的字符串输入
+USER_ROLES = ("PATIENT", "DOCTOR", "AI_ASSISTANT")
+VALID_ROLES = frozenset(USER_ROLES)
 
 
 class UserCreate(BaseModel):
@@ -49,7 +56,7 @@ class UserUpdate(BaseModel):
     )
 
 
-class UserResponse(BaseModel):
+class UserResponse(ORMResponseModel):
     """
     用户响应 Schema
     
@@ -62,5 +69,3 @@ class UserResponse(BaseModel):
     user_role: str = Field(..., description="用户身份")
     created_at: datetime = Field(..., description="创建时间")
     updated_at: datetime = Field(..., description="更新时间")
-    
-    model_config = ConfigDict(from_attributes=True)  # 允许从 ORM 模型创建
@@ -8,10 +8,13 @@ from app.services.core.user_service import UserService
 from app.services.core.group_service import GroupService
 from app.services.core.message_service import MessageService
 from app.services.core.websocket_service import WebSocketService
+from app.services.core.ai_record_batcher import AIRecordBatcher, ai_record_batcher
 
 __all__ = [
     "UserService",
     "GroupService",
     "MessageService",
     "WebSocketService",
+    "AIRecordBatcher",
+    "ai_record_batcher",
 ]
@@ -0,0 +1,196 @@
+"""
+AI交互记录批量写入
+
+将 AI 交互记录放入内存队列，由后台任务攒批后一次写入数据库。
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.db.session import get_async_db_session
+from app.repositories.ai_interaction_record_repository import AIInteractionRecordRepository
+from app.utils.logger import get_logger
+
+# 配置日志
+logger = get_logger(__name__)
+
+# 停止信号（放入队列，保证之前提交的记录都被写入）
+_STOP = object()
+
+
+class AIRecordBatcher:
+    """
+    AI交互记录批量写入器
+
+    调用方通过 submit() 提交记录后立即返回，不等待数据库写入；
+    后台任务每攒满 batch_size 条或等待 flush_interval 秒后，在一个事务中批量写入，
+    将逐条提交的多次数据库往返合并为一次。
+
+    队列容量有限，队列满时新记录被丢弃并记录警告，避免写入积压导致内存无限增长。
+    应用关闭时 stop() 会写入队列中剩余的记录。
+
+    示例：
+        ```python
+        from app.services.core.ai_record_batcher import ai_record_batcher
+
+        # 应用启动时（lifespan）
+        await ai_record_batcher.start()
+
+        # 请求处理中
+        ai_record_batcher.submit({
+            "record_id": "record_001",
+            "group_id": "group_001",
+            "user_message_id": "msg_001",
+            "status": 1,
+            "duration_ms": 500,
+        })
+
+        # 应用关闭时（lifespan）
+        await ai_record_batcher.stop()
+        ```
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 0.2,
+        max_queue_size: int = 10000,
+    ):
+        """
+        初始化批量写入器
+
+        Args:
+            batch_size: 每批写入的最大条数
+            flush_interval: 最长攒批时间（秒）
+            max_queue_size: 待写入队列的容量
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """后台写入任务是否在运行"""
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """启动后台写入任务（需在事件循环中调用，重复调用无效果）"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run(self._queue))
+
+    async def stop(self) -> None:
+        """停止后台写入任务，并写入队列中剩余的记录"""
+        queue, task = self._queue, self._task
+        if queue is None or task is None or task.done():
+            return
+        # 先停止接收新记录，再放入停止信号，等待后台任务写完剩余记录
+        self._queue = None
+        await queue.put(_STOP)
+        await task
+        self._task = None
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        提交一条 AI 交互记录（不等待写入）
+
+        Args:
+            record: AIInteractionRecord 的字段字典
+
+        Returns:
+            bool: 成功放入队列返回 True；写入器未启动或队列已满时返回 False
+        """
+        queue = self._queue
+        if queue is None:
+            logger.warning("AI交互记录写入器未启动，记录被丢弃: %s", record.get("record_id"))
+            return False
+        try:
+            queue.put_nowait(record)
+        except asyncio.QueueFull:
+            logger.warning("AI交互记录队列已满，记录被丢弃: %s", record.get("record_id"))
+            return False
+        return True
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """后台任务：攒批并写入，收到停止信号后写完当前批次退出"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            item = await queue.get()
+            if item is _STOP:
+                return
+
+            batch: List[Dict[str, Any]] = [item]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._write(batch)
+            if stopping:
+                return
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        在一个事务中写入一批记录
+
+        批次中有记录违反约束（如 record_id 重复）时整批回滚，改为逐条重试，只丢弃出错的记录；
+        写入失败只记录日志（含被丢弃的 record_id），不影响后续批次。
+        """
+        db = get_async_db_session()
+        repo = AIInteractionRecordRepository(db)
+        try:
+            await repo.create_many(batch, return_defaults=False)
+        except IntegrityError:
+            await db.rollback()
+            logger.warning("AI交互记录批量写入违反约束，逐条重试（%d 条）", len(batch))
+            await self._write_each(repo, batch)
+        except Exception:
+            logger.exception(
+                "AI交互记录批量写入失败，丢弃 %d 条: %s",
+                len(batch),
+                [record.get("record_id") for record in batch],
+            )
+            await db.rollback()
+        finally:
+            await db.close()
+
+    async def _write_each(
+        self,
+        repo: AIInteractionRecordRepository,
+        batch: List[Dict[str, Any]],
+    ) -> None:
+        """逐条写入一批记录（每条单独提交），出错的记录被丢弃并记录 record_id"""
+        dropped = []
+        for record in batch:
+            try:
+                await repo.create_many([record], return_defaults=False)
+            except Exception:
+                await repo.db.rollback()
+                dropped.append(record.get("record_id"))
+        if dropped:
+            logger.error("AI交互记录写入失败，丢弃 %d 条: %s", len(dropped), dropped)
+
+
+# 全局批量写入器实例
+ai_record_batcher = AIRecordBatcher(
+    batch_size=settings.ai_record_batch_size,
+    flush_interval=settings.ai_record_flush_interval_ms / 1000,
+    max_queue_size=settings.ai_record_queue_size,
+)
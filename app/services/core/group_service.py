@@ -4,14 +4,16 @@
 提供群组相关的业务逻辑处理，包括群组创建、成员管理等。
 """
 
+from collections import Counter
 from typing import List, Dict, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from app.repositories.group_repository import GroupRepository
 from app.repositories.group_member_repository import GroupMemberRepository
 from app.repositories.user_repository import UserRepository
 from app.schemas.group import GroupCreate, GroupResponse, GroupMemberAdd
+from app.utils.cache import entity_cache
 from app.utils.exceptions import NotFoundError, ValidationError, ConflictError
 from app.utils.id_generator import generate_group_id
 
@@ -29,41 +31,47 @@ class GroupService:
     示例：
         ```python
         from app.services.core.group_service import GroupService
-        from app.db.session import get_db
+        from app.db.session import get_async_db_session
         
-        db = next(get_db())
+        db = get_async_db_session()
         service = GroupService(db)
         
         # 创建群组
-        group_response = service.create_group(
+        group_response = await service.create_group(
             GroupCreate(group_name="医疗咨询群", description="测试"),
             creator_id="user_001"
         )
         
         # 添加成员
-        success = service.add_member("group_001", GroupMemberAdd(
+        success = await service.add_member("group_001", GroupMemberAdd(
             user_id="user_002",
             user_role="PATIENT"
         ))
         
+        # 批量添加成员
+        count = await service.add_members("group_001", [
+            GroupMemberAdd(user_id="user_003", user_role="PATIENT"),
+            GroupMemberAdd(user_id="user_004", user_role="DOCTOR"),
+        ])
+        
         # 获取群组成员列表
-        members = service.get_group_members("group_001")
+        members = await service.get_group_members("group_001")
         ```
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         初始化群组服务
         
         Args:
-            db: 数据库会话
+            db: 异步数据库会话
         """
         self.db = db
         self.group_repo = GroupRepository(db)
         self.member_repo = GroupMemberRepository(db)
         self.user_repo = UserRepository(db)
     
-    def create_group(
+    async def create_group(
         self,
         group_create: GroupCreate,
         creator_id: str
@@ -85,8 +93,7 @@ class GroupService:
             ValidationError: 当创建失败时抛出
         """
         # 验证创建人是否存在
-        creator = self.user_repo.get_by_id(creator_id)
-        if not creator:
+        if not await self.user_repo.exists(creator_id):
             raise NotFoundError(f"创建人 {creator_id} 不存在")
         
         # 生成group_id
@@ -94,7 +101,7 @@ class GroupService:
         
         # 创建群组
         try:
-            group = self.group_repo.create(
+            group = await self.group_repo.create(
                 group_id=group_id,
                 group_name=group_create.group_name,
                 description=group_create.description,
@@ -103,24 +110,24 @@ class GroupService:
             
             # 自动添加创建人为成员，身份为DOCTOR
             try:
-                self.member_repo.add_member(
+                await self.member_repo.add_member(
                     group_id=group_id,
                     user_id=creator_id,
                     user_role="DOCTOR"
                 )
             except IntegrityError:
                 # 如果创建人已经在群组中（理论上不应该发生），忽略错误
-                self.db.rollback()
+                await self.db.rollback()
                 pass
             
-            return GroupResponse.model_validate(group)
+            return GroupResponse.from_orm_trusted(group)
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             if "group_id" in str(e).lower() or "unique" in str(e).lower():
                 raise ConflictError(f"群组ID冲突，请重试: {str(e)}")
             raise ValidationError(f"创建群组失败: {str(e)}")
     
-    def get_group(self, group_id: str) -> Optional[GroupResponse]:
+    async def get_group(self, group_id: str) -> Optional[GroupResponse]:
         """
         获取群组信息
         
@@ -130,12 +137,19 @@ class GroupService:
         Returns:
             Optional[GroupResponse]: 群组信息，如果不存在返回 None
         """
-        group = self.group_repo.get_by_id(group_id)
+        cache_key = ("group", group_id)
+        cached = entity_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        group = await self.group_repo.get_by_id(group_id)
         if not group:
             return None
-        return GroupResponse.model_validate(group)
+        group_response = GroupResponse.from_orm_trusted(group)
+        entity_cache.set(cache_key, group_response)
+        return group_response
     
-    def add_member(
+    async def add_member(
         self,
         group_id: str,
         member_add: GroupMemberAdd
@@ -153,45 +167,87 @@ class GroupService:
         Raises:
             NotFoundError: 当群组不存在或用户不存在时抛出
             ConflictError: 当用户已在群组中时抛出
-            ValidationError: 当user_role无效时抛出
         """
-        # 验证群组是否存在
-        group = self.group_repo.get_by_id(group_id)
-        if not group:
+        # 校验与插入由一条语句完成，常规路径只需一次数据库往返
+        if await self.member_repo.try_add_member(
+            group_id=group_id,
+            user_id=member_add.user_id,
+            user_role=member_add.user_role
+        ):
+            return True
+        
+        # 未插入时再查询原因
+        group_exists, user_exists, _ = await self.member_repo.get_membership_status(
+            group_id,
+            member_add.user_id
+        )
+        if not group_exists:
             raise NotFoundError(f"群组 {group_id} 不存在")
         
-        # 验证用户是否存在
-        user = self.user_repo.get_by_id(member_add.user_id)
-        if not user:
+        if not user_exists:
             raise NotFoundError(f"用户 {member_add.user_id} 不存在")
         
-        # 验证user_role
-        valid_roles = ["PATIENT", "DOCTOR", "AI_ASSISTANT"]
-        if member_add.user_role not in valid_roles:
-            raise ValidationError(
-                f"无效的用户身份: {member_add.user_role}，必须是 {valid_roles} 之一"
-            )
+        raise ConflictError(f"用户 {member_add.user_id} 已在群组 {group_id} 中")
+    
+    async def add_members(
+        self,
+        group_id: str,
+        members: List[GroupMemberAdd]
+    ) -> int:
+        """
+        批量添加群组成员
         
-        # 检查用户是否已在群组中
-        existing_member = self.member_repo.get_member(group_id, member_add.user_id)
-        if existing_member:
-            raise ConflictError(f"用户 {member_add.user_id} 已在群组 {group_id} 中")
+        先批量校验群组、用户及成员关系，再通过一条批量 INSERT 写入所有成员，
+        任一成员校验失败时不会写入任何成员。
         
-        # 添加成员
+        Args:
+            group_id: 群组ID
+            members: 成员添加数据列表
+            
+        Returns:
+            int: 添加的成员数量
+            
+        Raises:
+            NotFoundError: 当群组不存在或有用户不存在时抛出
+            ConflictError: 当有用户已在群组中时抛出
+            ValidationError: 当成员列表为空或user_id重复时抛出
+        """
+        if not members:
+            raise ValidationError("成员列表不能为空")
+        
+        user_ids = [member.user_id for member in members]
+        duplicated = sorted(uid for uid, count in Counter(user_ids).items() if count > 1)
+        if duplicated:
+            raise ValidationError(f"成员列表中存在重复的用户: {duplicated}")
+        
+        # 批量验证群组、用户是否存在以及用户是否已在群组中
+        group_exists, existing_user_ids, member_user_ids = (
+            await self.member_repo.get_bulk_membership_status(group_id, user_ids)
+        )
+        if not group_exists:
+            raise NotFoundError(f"群组 {group_id} 不存在")
+        
+        missing = [uid for uid in user_ids if uid not in existing_user_ids]
+        if missing:
+            raise NotFoundError(f"用户 {missing} 不存在")
+        
+        already_in = [uid for uid in user_ids if uid in member_user_ids]
+        if already_in:
+            raise ConflictError(f"用户 {already_in} 已在群组 {group_id} 中")
+        
+        # 批量添加成员
         try:
-            self.member_repo.add_member(
-                group_id=group_id,
-                user_id=member_add.user_id,
-                user_role=member_add.user_role
+            return await self.member_repo.add_members(
+                group_id,
+                [member.model_dump() for member in members]
             )
-            return True
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             if "unique" in str(e).lower() or "uk_group_user" in str(e).lower():
-                raise ConflictError(f"用户 {member_add.user_id} 已在群组 {group_id} 中")
-            raise ValidationError(f"添加成员失败: {str(e)}")
+                raise ConflictError(f"部分用户已在群组 {group_id} 中")
+            raise ValidationError(f"批量添加成员失败: {str(e)}")
     
-    def get_group_members(self, group_id: str) -> List[Dict]:
+    async def get_group_members(self, group_id: str) -> List[Dict]:
         """
         获取群组成员列表
         
@@ -204,13 +260,14 @@ class GroupService:
         Raises:
             NotFoundError: 当群组不存在时抛出
         """
-        # 验证群组是否存在
-        group = self.group_repo.get_by_id(group_id)
-        if not group:
-            raise NotFoundError(f"群组 {group_id} 不存在")
-        
         # 获取成员列表
-        members = self.member_repo.get_members_by_group(group_id)
+        members = await self.member_repo.get_members_by_group(group_id)
+        
+        # 成员列表为空时才需要确认群组是否存在（存在成员即说明群组存在），
+        # 常规路径只需一次查询
+        if not members:
+            if not await self.group_repo.exists(group_id):
+                raise NotFoundError(f"群组 {group_id} 不存在")
         
         # 转换为字典列表
         result = []
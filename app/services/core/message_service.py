@@ -4,14 +4,16 @@
 提供消息相关的业务逻辑处理，包括消息发送、查询等。
 """
 
-from typing import List, Tuple, Optional
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, List, Tuple, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
+from app.config import settings
 from app.repositories.message_repository import MessageRepository
 from app.repositories.group_repository import GroupRepository
 from app.repositories.group_member_repository import GroupMemberRepository
 from app.schemas.message import MessageCreate, MessageResponse, MessageListResponse
+from app.utils.cache import entity_cache
 from app.utils.exceptions import NotFoundError, ValidationError, ConflictError
 from app.utils.id_generator import generate_message_id
 
@@ -28,38 +30,38 @@ class MessageService:
     示例：
         ```python
         from app.services.core.message_service import MessageService
-        from app.db.session import get_db
+        from app.db.session import get_async_db_session
         
-        db = next(get_db())
+        db = get_async_db_session()
         service = MessageService(db)
         
         # 发送消息
-        message_response = service.send_message(
+        message_response = await service.send_message(
             MessageCreate(group_id="group_001", content="你好"),
             from_user_id="user_001"
         )
         
         # 获取消息
-        message_response = service.get_message("msg_001")
+        message_response = await service.get_message("msg_001")
         
         # 获取消息列表（分页）
-        messages, total = service.get_messages("group_001", page=1, page_size=20)
+        messages, total, next_before_id = await service.get_messages("group_001", page=1, page_size=20)
         ```
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         初始化消息服务
         
         Args:
-            db: 数据库会话
+            db: 异步数据库会话
         """
         self.db = db
         self.message_repo = MessageRepository(db)
         self.group_repo = GroupRepository(db)
         self.member_repo = GroupMemberRepository(db)
     
-    def send_message(
+    async def send_message(
         self,
         message_create: MessageCreate,
         from_user_id: str
@@ -80,14 +82,15 @@ class MessageService:
             NotFoundError: 当群组不存在或发送人不在群组中时抛出
             ValidationError: 当创建失败时抛出
         """
-        # 验证群组是否存在
-        group = self.group_repo.get_by_id(message_create.group_id)
-        if not group:
+        # 验证群组是否存在、发送人是否在群组中（一次查询完成）
+        group_exists, _, is_member = await self.member_repo.get_membership_status(
+            message_create.group_id,
+            from_user_id
+        )
+        if not group_exists:
             raise NotFoundError(f"群组 {message_create.group_id} 不存在")
         
-        # 验证发送人是否在群组中
-        member = self.member_repo.get_member(message_create.group_id, from_user_id)
-        if not member:
+        if not is_member:
             raise NotFoundError(
                 f"用户 {from_user_id} 不在群组 {message_create.group_id} 中"
             )
@@ -97,21 +100,21 @@ class MessageService:
         
         # 创建消息
         try:
-            message = self.message_repo.create(
+            message = await self.message_repo.create(
                 message_id=message_id,
                 group_id=message_create.group_id,
                 from_user_id=from_user_id,
                 msg_type="TEXT",  # 默认消息类型为TEXT
                 msg_content=message_create.content
             )
-            return MessageResponse.model_validate(message)
+            return MessageResponse.from_orm_trusted(message)
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             if "message_id" in str(e).lower() or "unique" in str(e).lower():
                 raise ConflictError(f"消息ID冲突，请重试: {str(e)}")
             raise ValidationError(f"发送消息失败: {str(e)}")
     
-    def get_message(self, message_id: str) -> MessageResponse:
+    async def get_message(self, message_id: str) -> MessageResponse:
         """
         获取单条消息
         
@@ -124,38 +127,51 @@ class MessageService:
         Raises:
             NotFoundError: 当消息不存在时抛出
         """
-        message = self.message_repo.get_by_id(message_id)
+        # 消息创建后不再修改，可直接使用缓存
+        cache_key = ("message", message_id)
+        cached = entity_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        message = await self.message_repo.get_by_id(message_id)
         if not message:
             raise NotFoundError(f"消息 {message_id} 不存在")
         
-        return MessageResponse.model_validate(message)
+        message_response = MessageResponse.from_orm_trusted(message)
+        entity_cache.set(cache_key, message_response)
+        return message_response
     
-    def get_messages(
+    async def get_messages(
         self,
         group_id: str,
         page: int = 1,
-        page_size: int = 20
-    ) -> Tuple[List[MessageResponse], int]:
+        page_size: int = 20,
+        before_id: Optional[int] = None
+    ) -> Tuple[List[MessageResponse], Optional[int], Optional[int]]:
         """
         获取消息列表（分页）
         
+        支持两种分页方式：
+        - 页码分页（page）：按 id 倒序（即从新到旧），返回总记录数
+        - 游标分页（before_id）：按 id 倒序返回 id 小于 before_id 的消息，
+          不统计总数，翻页深度不影响查询耗时
+        
+        两种方式均多查询一条判断是否还有更多消息，不依赖群组的冗余消息计数。
+        
         Args:
             group_id: 群组ID
-            page: 页码（从1开始）
+            page: 页码（从1开始），传入 before_id 时忽略
             page_size: 每页数量（1-100）
+            before_id: 游标（上一页最后一条消息的 id），可选
             
         Returns:
-            Tuple[List[MessageResponse], int]: (消息列表, 总记录数)
+            Tuple[List[MessageResponse], Optional[int], Optional[int]]: (消息列表, 总记录数, 下一页游标)，
+            游标分页时总记录数为 None；没有更多消息时下一页游标为 None
             
         Raises:
             NotFoundError: 当群组不存在时抛出
-            ValidationError: 当分页参数无效时抛出
+            ValidationError: 当分页参数无效或页码分页过深时抛出
         """
-        # 验证群组是否存在
-        group = self.group_repo.get_by_id(group_id)
-        if not group:
-            raise NotFoundError(f"群组 {group_id} 不存在")
-        
         # 验证分页参数
         if page < 1:
             raise ValidationError("页码必须 >= 1")
@@ -163,16 +179,68 @@ class MessageService:
         if page_size < 1 or page_size > 100:
             raise ValidationError("每页数量必须在 1-100 之间")
         
+        # OFFSET 需要扫描并丢弃前面所有记录，限制页码分页深度
+        if before_id is None and page * page_size > settings.max_pagination_depth:
+            raise ValidationError(
+                f"页码分页深度不能超过 {settings.max_pagination_depth} 条，请使用 before_id 游标分页"
+            )
+        
         # 获取消息列表
-        messages, total = self.message_repo.get_by_group(
-            group_id=group_id,
-            page=page,
-            page_size=page_size
-        )
+        if before_id is not None:
+            messages = await self.message_repo.get_by_group_before(
+                group_id=group_id,
+                before_id=before_id,
+                limit=page_size + 1
+            )
+            total = None
+            has_more = len(messages) > page_size
+            messages = messages[:page_size]
+        else:
+            messages, total, has_more = await self.message_repo.get_by_group(
+                group_id=group_id,
+                page=page,
+                page_size=page_size
+            )
+        
+        # 群组无消息时才需要确认群组是否存在（存在消息即说明群组存在）
+        if not messages:
+            if not await self.group_repo.exists(group_id):
+                raise NotFoundError(f"群组 {group_id} 不存在")
         
         # 转换为MessageResponse列表
         message_responses = [
-            MessageResponse.model_validate(msg) for msg in messages
+            MessageResponse.from_orm_trusted(msg) for msg in messages
         ]
         
-        return message_responses, total
+        # 下一页游标：本页最后一条消息的 id
+        next_before_id = message_responses[-1].id if has_more and message_responses else None
+        
+        return message_responses, total, next_before_id
+    
+    async def ensure_group_exists(self, group_id: str) -> None:
+        """
+        确认群组存在
+        
+        Args:
+            group_id: 群组ID
+            
+        Raises:
+            NotFoundError: 当群组不存在时抛出
+        """
+        if not await self.group_repo.exists(group_id):
+            raise NotFoundError(f"群组 {group_id} 不存在")
+    
+    async def iter_messages(self, group_id: str) -> AsyncIterator[MessageResponse]:
+        """
+        逐条迭代群组的全部消息（用于流式导出）
+        
+        不校验群组是否存在，调用方应在开始输出前调用 ensure_group_exists。
+        
+        Args:
+            group_id: 群组ID
+            
+        Yields:
+            MessageResponse: 消息信息（按 id 正序，即从旧到新）
+        """
+        async for message in self.message_repo.stream_by_group(group_id):
+            yield MessageResponse.from_orm_trusted(message)
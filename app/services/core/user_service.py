@@ -5,11 +5,12 @@
 """
 
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from app.repositories.user_repository import UserRepository
-from app.schemas.user import UserCreate, UserResponse
+from app.schemas.user import USER_ROLES, VALID_ROLES, UserCreate, UserResponse
+from app.utils.cache import entity_cache
 from app.utils.exceptions import NotFoundError, ValidationError, ConflictError
 from app.utils.id_generator import generate_user_id
 
@@ -27,36 +28,36 @@ class UserService:
     示例：
         ```python
         from app.services.core.user_service import UserService
-        from app.db.session import get_db
+        from app.db.session import get_async_db_session
         
-        db = next(get_db())
+        db = get_async_db_session()
         service = UserService(db)
         
         # 创建用户
-        user_response = service.create_user(UserCreate(
+        user_response = await service.create_user(UserCreate(
             username="张三",
             user_role="PATIENT"
         ))
         
         # 获取用户
-        user_response = service.get_user("user_001")
+        user_response = await service.get_user("user_001")
         
         # 更新用户身份
-        user_response = service.update_user_role("user_001", "DOCTOR")
+        user_response = await service.update_user_role("user_001", "DOCTOR")
         ```
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         初始化用户服务
         
         Args:
-            db: 数据库会话
+            db: 异步数据库会话
         """
         self.db = db
         self.repository = UserRepository(db)
     
-    def create_user(self, user_create: UserCreate) -> UserResponse:
+    async def create_user(self, user_create: UserCreate) -> UserResponse:
         """
         创建用户
         
@@ -67,50 +68,51 @@ class UserService:
             UserResponse: 创建的用户信息
             
         Raises:
-            ValidationError: 当user_role无效时抛出
             ConflictError: 当user_id已存在时抛出
         """
-        # 验证user_role
-        valid_roles = ["PATIENT", "DOCTOR", "AI_ASSISTANT"]
-        if user_create.user_role not in valid_roles:
-            raise ValidationError(
-                f"无效的用户身份: {user_create.user_role}，必须是 {valid_roles} 之一"
-            )
-        
         # 生成user_id
         user_id = generate_user_id()
         
         # 创建用户
         try:
-            user = self.repository.create(
+            user = await self.repository.create(
                 user_id=user_id,
                 username=user_create.username,
                 user_role=user_create.user_role
             )
-            return UserResponse.model_validate(user)
+            return UserResponse.from_orm_trusted(user)
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             # 如果user_id冲突，重新生成（理论上不应该发生）
             if "user_id" in str(e).lower() or "unique" in str(e).lower():
                 raise ConflictError(f"用户ID冲突，请重试: {str(e)}")
             raise ValidationError(f"创建用户失败: {str(e)}")
     
-    def get_user(self, user_id: str) -> Optional[UserResponse]:
+    async def get_user(self, user_id: str) -> Optional[UserResponse]:
         """
         获取用户信息
         
+        优先从实体缓存读取，未命中时查询数据库并写入缓存。
+        
         Args:
             user_id: 用户唯一标识
             
         Returns:
             Optional[UserResponse]: 用户信息，如果不存在返回 None
         """
-        user = self.repository.get_by_id(user_id)
+        cache_key = ("user", user_id)
+        cached = entity_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        user = await self.repository.get_by_id(user_id)
         if not user:
             return None
-        return UserResponse.model_validate(user)
+        user_response = UserResponse.from_orm_trusted(user)
+        entity_cache.set(cache_key, user_response)
+        return user_response
     
-    def update_user_role(self, user_id: str, new_role: str) -> UserResponse:
+    async def update_user_role(self, user_id: str, new_role: str) -> UserResponse:
         """
         更新用户身份标签
         
@@ -125,20 +127,22 @@ class UserService:
             NotFoundError: 当用户不存在时抛出
             ValidationError: 当new_role无效时抛出
         """
-        # 验证new_role
-        valid_roles = ["PATIENT", "DOCTOR", "AI_ASSISTANT"]
-        if new_role not in valid_roles:
+        # 验证new_role（user_role 由 UserCreate 的 Literal 校验，这里的 new_role 是普通字符串）
+        if new_role not in VALID_ROLES:
             raise ValidationError(
-                f"无效的用户身份: {new_role}，必须是 {valid_roles} 之一"
+                f"无效的用户身份: {new_role}，必须是 {list(USER_ROLES)} 之一"
             )
         
         # 获取用户
-        user = self.repository.get_by_id(user_id)
+        user = await self.repository.get_by_id(user_id)
         if not user:
             raise NotFoundError(f"用户 {user_id} 不存在")
         
         # 更新用户身份
         user.user_role = new_role
-        updated_user = self.repository.update(user)
+        updated_user = await self.repository.update(user)
+        
+        # 使缓存失效
+        entity_cache.delete(("user", user_id))
         
-        return UserResponse.model_validate(updated_user)
+        return UserResponse.from_orm_trusted(updated_user)
@@ -5,7 +5,7 @@ WebSocket 服务层
 """
 
 from typing import Optional, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.websocket.manager import manager
 from app.repositories.group_member_repository import GroupMemberRepository
@@ -27,9 +27,9 @@ class WebSocketService:
     示例：
         ```python
         from app.services.core.websocket_service import WebSocketService
-        from app.db.session import get_db
+        from app.db.session import get_async_db_session
         
-        db = next(get_db())
+        db = get_async_db_session()
         service = WebSocketService(db)
         
         # 向群组推送消息
@@ -47,12 +47,12 @@ class WebSocketService:
         ```
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         初始化 WebSocket 服务
         
         Args:
-            db: 数据库会话
+            db: 异步数据库会话
         """
         self.db = db
         self.member_repo = GroupMemberRepository(db)
@@ -93,7 +93,7 @@ class WebSocketService:
             ```
         """
         # 获取群组所有成员
-        members = self.member_repo.get_members_by_group(group_id)
+        members = await self.member_repo.get_members_by_group(group_id)
         
         if not members:
             logger.warning(f"群组 {group_id} 没有成员")
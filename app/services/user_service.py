@@ -5,9 +5,10 @@
 """
 
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
+from app.config import settings
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate, UserUpdate
@@ -27,34 +28,34 @@ class UserService:
     示例：
         ```python
         from app.services.user_service import UserService
-        from app.db.session import get_db
+        from app.db.session import get_async_db_session
         
-        db = next(get_db())
+        db = get_async_db_session()
         service = UserService(db)
         
         # 创建用户
-        user = service.create_user(UserCreate(
+        user = await service.create_user(UserCreate(
             name="张三",
             email="zhangsan@example.com",
             age=25
         ))
         
         # 获取用户
-        user = service.get_user_by_id(user.id)
+        user = await service.get_user_by_id(user.id)
         ```
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         初始化用户服务
         
         Args:
-            db: 数据库会话
+            db: 异步数据库会话
         """
         self.db = db
         self.repository = UserRepository(db)
     
-    def create_user(self, user_data: UserCreate) -> User:
+    async def create_user(self, user_data: UserCreate) -> User:
         """
         创建用户
         
@@ -68,21 +69,21 @@ class UserService:
             ValidationError: 当邮箱已存在时抛出
         """
         # 检查邮箱是否已存在
-        existing_user = self.repository.get_by_email(user_data.email)
+        existing_user = await self.repository.get_by_email(user_data.email)
         if existing_user:
             raise ValidationError(f"邮箱 {user_data.email} 已被使用")
         
         # 创建用户
         try:
-            user = self.repository.create(user_data.model_dump())
-            self.db.commit()
-            self.db.refresh(user)
+            user = await self.repository.create(user_data.model_dump())
+            await self.db.commit()
+            await self.db.refresh(user)
             return user
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise ValidationError(f"创建用户失败: {str(e)}")
     
-    def get_user_by_id(self, user_id: int) -> User:
+    async def get_user_by_id(self, user_id: int) -> User:
         """
         根据 ID 获取用户
         
@@ -95,12 +96,12 @@ class UserService:
         Raises:
             NotFoundError: 当用户不存在时抛出
         """
-        user = self.repository.get_by_id(user_id)
+        user = await self.repository.get_by_id(user_id)
         if not user:
             raise NotFoundError(f"用户 ID {user_id} 不存在")
         return user
     
-    def get_user_by_email(self, email: str) -> Optional[User]:
+    async def get_user_by_email(self, email: str) -> Optional[User]:
         """
         根据邮箱获取用户
         
@@ -110,9 +111,9 @@ class UserService:
         Returns:
             Optional[User]: 用户对象，如果不存在返回 None
         """
-        return self.repository.get_by_email(email)
+        return await self.repository.get_by_email(email)
     
-    def update_user(self, user_id: int, user_data: UserUpdate) -> User:
+    async def update_user(self, user_id: int, user_data: UserUpdate) -> User:
         """
         更新用户
         
@@ -128,11 +129,11 @@ class UserService:
             ValidationError: 当邮箱已被其他用户使用时抛出
         """
         # 获取用户
-        user = self.get_user_by_id(user_id)
+        user = await self.get_user_by_id(user_id)
         
         # 如果更新邮箱，检查是否已被使用
         if user_data.email and user_data.email != user.email:
-            existing_user = self.repository.get_by_email(user_data.email)
+            existing_user = await self.repository.get_by_email(user_data.email)
             if existing_user:
                 raise ValidationError(f"邮箱 {user_data.email} 已被使用")
         
@@ -140,17 +141,17 @@ class UserService:
         update_data = user_data.model_dump(exclude_unset=True)
         if update_data:
             try:
-                updated_user = self.repository.update(user_id, update_data)
-                self.db.commit()
-                self.db.refresh(updated_user)
+                updated_user = await self.repository.update(user_id, update_data)
+                await self.db.commit()
+                await self.db.refresh(updated_user)
                 return updated_user
             except IntegrityError as e:
-                self.db.rollback()
+                await self.db.rollback()
                 raise ValidationError(f"更新用户失败: {str(e)}")
         
         return user
     
-    def delete_user(self, user_id: int) -> None:
+    async def delete_user(self, user_id: int) -> None:
         """
         删除用户
         
@@ -160,11 +161,11 @@ class UserService:
         Raises:
             NotFoundError: 当用户不存在时抛出
         """
-        user = self.get_user_by_id(user_id)
-        self.repository.delete(user_id)
-        self.db.commit()
+        user = await self.get_user_by_id(user_id)
+        await self.repository.delete(user_id)
+        await self.db.commit()
     
-    def get_users(
+    async def get_users(
         self,
         page: int = 1,
         page_size: int = 10,
@@ -180,13 +181,17 @@ class UserService:
             
         Returns:
             PaginationResult[User]: 分页结果
+            
+        Raises:
+            ValidationError: 当页码分页过深时抛出
         """
+        self._check_pagination_depth(page, page_size)
         if is_active is not None:
-            return self.repository.paginate_active_users(page, page_size)
+            return await self.repository.paginate_active_users(page, page_size)
         else:
-            return self.repository.paginate(page=page, page_size=page_size)
+            return await self.repository.paginate(page=page, page_size=page_size)
     
-    def search_users(self, keyword: str, page: int = 1, page_size: int = 10):
+    async def search_users(self, keyword: str, page: int = 1, page_size: int = 10):
         """
         搜索用户
         
@@ -197,6 +202,29 @@ class UserService:
             
         Returns:
             PaginationResult[User]: 分页结果
+            
+        Raises:
+            ValidationError: 当页码分页过深时抛出
+        """
+        self._check_pagination_depth(page, page_size)
+        return await self.repository.search_users(keyword, page, page_size)
+    
+    @staticmethod
+    def _check_pagination_depth(page: int, page_size: int) -> None:
+        """
+        检查页码分页深度
+        
+        OFFSET 分页需要扫描并丢弃前面所有记录，深度越大越慢，超出上限时直接拒绝。
+        
+        Args:
+            page: 页码
+            page_size: 每页数量
+            
+        Raises:
+            ValidationError: 当 page * page_size 超过 settings.max_pagination_depth 时抛出
         """
-        return self.repository.search_users(keyword, page, page_size)
+        if page * page_size > settings.max_pagination_depth:
+            raise ValidationError(
+                f"分页深度不能超过 {settings.max_pagination_depth} 条，请缩小查询范围"
+            )
 
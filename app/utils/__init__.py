@@ -1,16 +1,28 @@
 """
 工具类模块
 
-提供日志、ID 生成、响应格式、异常处理等通用工具。
+提供日志、ID 生成、响应格式、异常处理、缓存等通用工具。
 """
 
-from app.utils.logger import logger, get_logger, setup_logger
+from app.utils.logger import (
+    logger,
+    get_logger,
+    setup_logger,
+    start_queue_logging,
+    stop_queue_logging,
+)
 from app.utils.id_generator import generate_id, generate_short_id, generate_numeric_id
 from app.utils.response import (
     BaseResponse,
     SuccessResponse,
     ErrorResponse,
     success_response,
+    success_json_response,
+    payload_json_response,
+    make_etag,
+    etag_matches,
+    etag_json_response,
+    error_json_response,
     error_response,
 )
 from app.utils.exceptions import (
@@ -22,12 +34,15 @@ from app.utils.exceptions import (
     ConflictError,
     InternalServerError,
 )
+from app.utils.cache import TTLCache, entity_cache
 
 __all__ = [
     # 日志工具
     "logger",
     "get_logger",
     "setup_logger",
+    "start_queue_logging",
+    "stop_queue_logging",
     # ID 生成器
     "generate_id",
     "generate_short_id",
@@ -37,6 +52,12 @@ __all__ = [
     "SuccessResponse",
     "ErrorResponse",
     "success_response",
+    "success_json_response",
+    "payload_json_response",
+    "make_etag",
+    "etag_matches",
+    "etag_json_response",
+    "error_json_response",
     "error_response",
     # 异常类
     "BaseAppException",
@@ -46,5 +67,8 @@ __all__ = [
     "ForbiddenError",
     "ConflictError",
     "InternalServerError",
+    # 缓存
+    "TTLCache",
+    "entity_cache",
 ]
 
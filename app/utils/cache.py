@@ -0,0 +1,114 @@
+"""
+进程内缓存模块
+
+提供带过期时间（TTL）和容量上限（LRU 淘汰）的进程内缓存，
+用于缓存按主键查询的实体（用户、群组、消息），减少重复的数据库往返。
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from app.config import settings
+
+
+class TTLCache:
+    """
+    TTL + LRU 进程内缓存
+
+    - 每个条目在写入 ttl 秒后过期
+    - 条目数超过 max_size 时淘汰最久未使用的条目
+    - ttl <= 0 时缓存禁用，get 始终返回 None
+
+    注意：缓存仅在当前进程内有效，多进程部署时各进程独立缓存，
+    失效操作只作用于当前进程，其他进程最多在 ttl 秒后读到新值。
+
+    示例：
+        ```python
+        from app.utils.cache import TTLCache
+
+        cache = TTLCache(max_size=1000, ttl=60)
+        cache.set(("user", "user_001"), user_response)
+        user_response = cache.get(("user", "user_001"))
+        cache.delete(("user", "user_001"))
+        ```
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60):
+        """
+        初始化缓存
+
+        Args:
+            max_size: 最大条目数
+            ttl: 条目过期时间（秒），<= 0 表示禁用缓存
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """缓存是否启用"""
+        return self.ttl > 0 and self.max_size > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        获取缓存值
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[Any]: 缓存值，未命中或已过期返回 None
+        """
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        写入缓存值
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+        """
+        if not self.enabled:
+            return
+
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        删除缓存值（数据更新时调用，使缓存失效）
+
+        Args:
+            key: 缓存键
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# 实体缓存（用户、群组、消息按主键查询的结果）
+# 缓存键格式：(实体类型, 实体ID)，例如 ("user", "user_001")
+entity_cache = TTLCache(
+    max_size=settings.entity_cache_max_size,
+    ttl=settings.entity_cache_ttl,
+)
@@ -7,10 +7,12 @@
 
 import json
 import logging
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.config import settings
 
@@ -162,6 +164,85 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+# ==================== 后台线程输出日志 ====================
+
+class _InProcessQueueHandler(QueueHandler):
+    """
+    进程内队列日志处理器
+    
+    标准 QueueHandler 会在入队前格式化消息并清除 exc_info（为跨进程序列化做准备），
+    进程内队列无需序列化：这里只合并消息参数，保留 exc_info，
+    由后台线程中的 JSONFormatter 照常输出 exception 字段。
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# 已切换为队列输出的日志记录器：名称 -> (队列监听器, 原处理器列表)
+_queue_listeners: Dict[str, Tuple[QueueListener, List[logging.Handler]]] = {}
+
+
+def start_queue_logging(name: str = "app") -> None:
+    """
+    将日志记录器的输出切换到后台线程
+    
+    用 QueueHandler 替换记录器现有的处理器，由 QueueListener 在后台线程中
+    调用原处理器格式化并写出日志。请求处理中的日志调用只需入队，
+    不再同步执行 JSON 格式化和 stdout/文件写入。重复调用无效果。
+    
+    Args:
+        name: 日志记录器名称，默认为全局记录器 "app"
+        
+    Example:
+        ```python
+        from app.utils.logger import start_queue_logging, stop_queue_logging
+        
+        start_queue_logging()   # 应用启动时
+        stop_queue_logging()    # 应用关闭时，写出队列中剩余的日志
+        ```
+    """
+    if name in _queue_listeners:
+        return
+    
+    target = logging.getLogger(name)
+    handlers = list(target.handlers)
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    
+    target.handlers = [_InProcessQueueHandler(log_queue)]
+    listener.start()
+    _queue_listeners[name] = (listener, handlers)
+
+
+def stop_queue_logging(name: str = "app") -> None:
+    """
+    停止后台线程输出，恢复日志记录器原来的处理器
+    
+    会等待队列中剩余的日志全部写出。未切换时调用无效果。
+    
+    Args:
+        name: 日志记录器名称，默认为全局记录器 "app"
+    """
+    entry = _queue_listeners.pop(name, None)
+    if entry is None:
+        return
+    
+    listener, handlers = entry
+    logging.getLogger(name).handlers = handlers
+    listener.stop()
+
+
 # 导出全局日志记录器
-__all__ = ["logger", "get_logger", "setup_logger", "JSONFormatter", "TextFormatter"]
+__all__ = [
+    "logger",
+    "get_logger",
+    "setup_logger",
+    "start_queue_logging",
+    "stop_queue_logging",
+    "JSONFormatter",
+    "TextFormatter",
+]
 
@@ -4,12 +4,25 @@
 提供 FastAPI 统一响应格式，便于前端处理。
 """
 
-from typing import Any, Dict, Generic, Optional, TypeVar
+import hashlib
+import time
+from datetime import datetime
+from typing import Any, Dict, Generic, Optional, Tuple, TypeVar
 
+from fastapi import Request, status
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
+from pydantic_core import to_json
 
 T = TypeVar("T")
 
+# 响应外层结构 JSON 前缀缓存：(message, code, 数据字段名) -> bytes
+_ENVELOPE_PREFIXES: Dict[Tuple[str, int, str], bytes] = {}
+_ENVELOPE_PREFIX_CACHE_SIZE = 256
+
+# 秒级时间戳字符串缓存：[整秒, 格式化结果]
+_SECOND_TIMESTAMP: list = [0, ""]
+
 
 class BaseResponse(BaseModel, Generic[T]):
     """
@@ -92,6 +105,280 @@ def success_response(
     }
 
 
+def _envelope_prefix(message: str, code: int, field: str = "data") -> bytes:
+    """
+    获取响应外层结构的 JSON 前缀（按 message、code、数据字段名缓存）
+
+    Args:
+        message: 响应消息
+        code: 状态码
+        field: 紧随其后的数据字段名（成功响应为 data，错误响应为 details）
+
+    Returns:
+        bytes: 形如 ``{"code":200,"message":"...","data":`` 的 JSON 字节
+    """
+    key = (message, code, field)
+    prefix = _ENVELOPE_PREFIXES.get(key)
+    if prefix is None:
+        prefix = _build_envelope_prefix(message, code, field)
+        # 路由中的 message 基本都是固定文案，数量有限；超出上限时不再缓存
+        if len(_ENVELOPE_PREFIXES) < _ENVELOPE_PREFIX_CACHE_SIZE:
+            _ENVELOPE_PREFIXES[key] = prefix
+    return prefix
+
+
+def _build_envelope_prefix(message: Any, code: int, field: str) -> bytes:
+    """生成响应外层结构的 JSON 前缀（不缓存；message 不是字符串时按 str() 输出无法序列化的对象）"""
+    return (
+        b'{"code":' + to_json(code)
+        + b',"message":' + to_json(message, fallback=str)
+        + b',"' + field.encode() + b'":'
+    )
+
+
+def success_json_response(
+    data: Optional[Any] = None,
+    message: str = "success",
+    code: int = 200,
+    status_code: int = 200,
+) -> Response:
+    """
+    创建成功响应（直接序列化为 JSON）
+    
+    响应格式与 success_response 一致，但不构建中间字典、也不经过 FastAPI 的
+    jsonable_encoder：外层结构的 JSON 前缀按 message 预先生成并缓存，
+    每次请求只由 pydantic-core 序列化 data 本身，再拼接为响应字节。
+    
+    Args:
+        data: 响应数据（Pydantic 模型，或可被 pydantic-core 序列化的字典、列表等）
+        message: 响应消息
+        code: 状态码
+        status_code: HTTP 状态码
+        
+    Returns:
+        Response: JSON 响应
+        
+    Example:
+        ```python
+        from app.utils.response import success_json_response
+        
+        return success_json_response(
+            data=MessageListResponse(messages=messages, total=total, page=1, page_size=20),
+            message="获取消息列表成功"
+        )
+        ```
+    """
+    body = _envelope_body(to_json(data), message, code)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def payload_json_response(
+    payload: bytes,
+    message: str = "success",
+    code: int = 200,
+    status_code: int = 200,
+) -> Response:
+    """
+    创建成功响应（data 已预先序列化为 JSON 字节）
+    
+    与 success_json_response 相同，但跳过 data 的序列化，适用于内容固定、
+    可在启动时序列化一次并反复使用的数据（如健康检查）。
+    
+    Args:
+        payload: data 的 JSON 字节
+        message: 响应消息
+        code: 状态码
+        status_code: HTTP 状态码
+        
+    Returns:
+        Response: JSON 响应
+        
+    Example:
+        ```python
+        from pydantic_core import to_json
+        from app.utils.response import payload_json_response
+        
+        _VERSION_PAYLOAD = to_json({"version": "1.0.0"})
+        
+        return payload_json_response(_VERSION_PAYLOAD, message="版本信息获取成功")
+        ```
+    """
+    body = _envelope_body(payload, message, code)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def _envelope_body(payload: bytes, message: str, code: int) -> bytes:
+    """
+    将已序列化的 data 拼接为完整的响应体
+
+    Args:
+        payload: data 的 JSON 字节
+        message: 响应消息
+        code: 状态码
+
+    Returns:
+        bytes: 完整响应体 JSON 字节
+    """
+    return b"".join((
+        _envelope_prefix(message, code),
+        payload,
+        b',"timestamp":',
+        to_json(datetime.now().isoformat()),
+        b"}",
+    ))
+
+
+def make_etag(payload: bytes) -> str:
+    """
+    根据响应数据生成弱 ETag
+    
+    ETag 由 data 序列化后的内容摘要生成，数据任一字段变化 ETag 即变化，
+    不依赖 updated_at 的时间精度（同一秒内的多次更新也能区分）。
+    
+    Args:
+        payload: data 的 JSON 字节
+        
+    Returns:
+        str: 弱 ETag，例如 W/"3f2a9c..."
+    """
+    return f'W/"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    判断请求头 If-None-Match 是否与 ETag 匹配（弱比较）
+    
+    Args:
+        if_none_match: If-None-Match 请求头的值，可包含多个以逗号分隔的 ETag 或 *
+        etag: 当前资源的 ETag
+        
+    Returns:
+        bool: 匹配返回 True
+    """
+    if not if_none_match:
+        return False
+    
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def etag_json_response(
+    request: Request,
+    data: BaseModel,
+    message: str = "success",
+    code: int = 200,
+) -> Response:
+    """
+    创建带 ETag 的成功响应
+    
+    客户端的 If-None-Match 与 ETag 匹配时直接返回 304（无响应体），省去外层结构拼接和传输；
+    否则返回与 success_json_response 相同的响应，并附带 ETag 响应头。
+    data 只序列化一次，同时用于计算 ETag 和生成响应体。
+    
+    Args:
+        request: 当前请求
+        data: 响应数据（Pydantic 模型）
+        message: 响应消息
+        code: 状态码
+        
+    Returns:
+        Response: 304 响应或 JSON 响应
+        
+    Example:
+        ```python
+        from app.utils.response import etag_json_response
+        
+        return etag_json_response(request, group_response, message="获取群组成功")
+        ```
+    """
+    payload = to_json(data)
+    etag = make_etag(payload)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return Response(
+        content=_envelope_body(payload, message, code),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
+def _now_iso_seconds() -> str:
+    """
+    获取当前时间的秒级 ISO 格式字符串（本地时间，例如 2024-01-01T12:00:00）
+
+    结果在同一秒内复用，只有跨秒时才重新格式化。
+
+    Returns:
+        str: 时间戳字符串
+    """
+    now = int(time.time())
+    if now != _SECOND_TIMESTAMP[0]:
+        _SECOND_TIMESTAMP[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now))
+        _SECOND_TIMESTAMP[0] = now
+    return _SECOND_TIMESTAMP[1]
+
+
+def error_json_response(
+    code: int,
+    message: str,
+    details: Optional[Any] = None,
+    status_code: Optional[int] = None,
+    include_details: bool = True,
+) -> Response:
+    """
+    创建错误响应（直接序列化为 JSON，供异常处理器使用）
+    
+    不构建中间字典，由 pydantic-core 分别序列化外层字段、details 和时间戳，再拼接为响应字节。
+    错误消息常包含 ID 等动态内容，外层前缀不进入 success_json_response 的前缀缓存，
+    避免大量一次性的错误文案占满缓存。
+    时间戳精确到秒，同一秒内的错误响应复用同一个格式化结果。
+    details 中无法直接序列化的对象（如验证错误 ctx 中的异常实例）按 str() 输出。
+    
+    Args:
+        code: 错误状态码（响应体中的 code）
+        message: 错误消息
+        details: 可选的错误详情
+        status_code: HTTP 状态码，默认与 code 相同
+        include_details: 为 False 时响应中不包含 details 字段（如 HTTP 异常响应）
+        
+    Returns:
+        Response: JSON 响应，格式为 {"code", "message", "details", "timestamp"}，
+        include_details=False 时为 {"code", "message", "timestamp"}
+        
+    Example:
+        ```python
+        from app.utils.response import error_json_response
+        
+        return error_json_response(code=404, message="用户不存在")
+        ```
+    """
+    # HTTPException.detail 作为 message 时可能是字典、列表等
+    if include_details:
+        body = b"".join((
+            _build_envelope_prefix(message, code, "details"),
+            to_json(details, fallback=str),
+            b',"timestamp":',
+            to_json(_now_iso_seconds()),
+            b"}",
+        ))
+    else:
+        body = b"".join((
+            _build_envelope_prefix(message, code, "timestamp"),
+            to_json(_now_iso_seconds()),
+            b"}",
+        ))
+    return Response(
+        content=body,
+        status_code=code if status_code is None else status_code,
+        media_type="application/json",
+    )
+
+
 def error_response(
     message: str = "error",
     code: int = 400,
@@ -130,6 +417,12 @@ __all__ = [
     "SuccessResponse",
     "ErrorResponse",
     "success_response",
+    "success_json_response",
+    "payload_json_response",
+    "make_etag",
+    "etag_matches",
+    "etag_json_response",
+    "error_json_response",
     "error_response",
 ]
 
@@ -25,8 +25,13 @@ class WebSocketHandler:
     
     提供 WebSocket 连接处理的基础框架，包括连接建立、消息接收、错误处理等。
     子类可以继承此类并重写特定方法来扩展功能。
+    
+    每个连接创建一个处理器实例，使用 __slots__ 省去实例 __dict__；
+    子类新增实例属性时需在自己的 __slots__ 中声明。
     """
     
+    __slots__ = ("user_id", "websocket")
+    
     def __init__(self, user_id: str):
         """
         初始化处理器
@@ -234,6 +239,8 @@ class SimpleWebSocketHandler(WebSocketHandler):
     可以作为其他处理器的参考或直接使用。
     """
     
+    __slots__ = ()
+    
     async def on_connect(self, websocket: WebSocket) -> None:
         """连接建立时发送欢迎消息"""
         await super().on_connect(websocket)
@@ -7,11 +7,11 @@ IM WebSocket 处理器模块
 import json
 from typing import Optional
 from fastapi import WebSocket, WebSocketDisconnect
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.websocket.handler import WebSocketHandler
 from app.websocket.manager import manager
-from app.db.session import get_db_session
+from app.db.session import get_async_db_session
 from app.services.core.message_service import MessageService
 from app.services.core.websocket_service import WebSocketService
 from app.schemas.message import MessageCreate
@@ -39,6 +39,8 @@ class IMWebSocketHandler(WebSocketHandler):
         ```
     """
     
+    __slots__ = ("db",)
+    
     def __init__(self, user_id: str):
         """
         初始化 IM WebSocket 处理器
@@ -47,7 +49,7 @@ class IMWebSocketHandler(WebSocketHandler):
             user_id: 用户 ID
         """
         super().__init__(user_id)
-        self.db: Optional[Session] = None
+        self.db: Optional[AsyncSession] = None
     
     async def on_connect(self, websocket: WebSocket) -> None:
         """
@@ -141,7 +143,7 @@ class IMWebSocketHandler(WebSocketHandler):
                 return
             
             # 创建消息服务（每次消息处理都创建新的数据库会话，确保事务隔离）
-            db = get_db_session()
+            db = get_async_db_session()
             try:
                 message_service = MessageService(db)
                 websocket_service = WebSocketService(db)
@@ -154,13 +156,13 @@ class IMWebSocketHandler(WebSocketHandler):
                 
                 # 发送消息（通过消息服务）
                 try:
-                    message_response = message_service.send_message(
+                    message_response = await message_service.send_message(
                         message_create,
                         self.user_id
                     )
                     
                     # 提交事务
-                    db.commit()
+                    await db.commit()
                     
                     # 推送新消息通知给群组其他成员（排除发送人）
                     await websocket_service.send_message_to_group(
@@ -187,18 +189,18 @@ class IMWebSocketHandler(WebSocketHandler):
                     })
                     
                 except NotFoundError as e:
-                    db.rollback()
+                    await db.rollback()
                     await self.send_error(e.message, "NOT_FOUND")
                 except ValidationError as e:
-                    db.rollback()
+                    await db.rollback()
                     await self.send_error(e.message, "VALIDATION_ERROR")
                 except Exception as e:
-                    db.rollback()
+                    await db.rollback()
                     logger.error(f"发送消息失败 (用户 {self.user_id}): {e}", exc_info=True)
                     await self.send_error("发送消息失败", "SEND_MESSAGE_FAILED")
             finally:
                 # 关闭数据库会话
-                db.close()
+                await db.close()
         
         except Exception as e:
             logger.error(f"处理发送消息请求失败 (用户 {self.user_id}): {e}", exc_info=True)
@@ -10,7 +10,7 @@ WebSocket 连接管理器模块
 
 import json
 import logging
-from typing import Dict, Set, Optional, Any
+from typing import Dict, List, Set, Optional, Any
 from fastapi import WebSocket
 
 from app.utils.logger import get_logger
@@ -27,7 +27,7 @@ class ConnectionManager:
     支持按用户 ID 管理连接，一个用户可以拥有多个连接（多设备登录）。
     """
     
-    def __init__(self):
+    def __init__(self) -> None:
         """
         初始化连接管理器
         
@@ -38,6 +38,8 @@ class ConnectionManager:
         self.active_connections: Dict[str, Set[WebSocket]] = {}
         # 反向映射：{websocket: user_id}，用于快速查找连接所属的用户
         self.connection_to_user: Dict[WebSocket, str] = {}
+        # 活跃连接总数（注册/注销时维护，统计时无需遍历所有用户）
+        self._connection_count = 0
     
     async def connect(self, websocket: WebSocket, user_id: str) -> None:
         """
@@ -62,6 +64,8 @@ class ConnectionManager:
         if user_id not in self.active_connections:
             self.active_connections[user_id] = set()
         
+        if websocket not in self.connection_to_user:
+            self._connection_count += 1
         self.active_connections[user_id].add(websocket)
         self.connection_to_user[websocket] = user_id
         
@@ -97,7 +101,8 @@ class ConnectionManager:
                     del self.active_connections[user_id]
             
             # 从反向映射中移除
-            self.connection_to_user.pop(websocket, None)
+            del self.connection_to_user[websocket]
+            self._connection_count -= 1
             
             logger.info(f"WebSocket 连接已注销: 用户 {user_id}")
         
@@ -188,7 +193,7 @@ class ConnectionManager:
             message_text = json.dumps(message, ensure_ascii=False)
         
         # 收集所有连接
-        all_connections = []
+        all_connections: List[WebSocket] = []
         for user_id, connections in self.active_connections.items():
             if exclude_user and user_id == exclude_user:
                 continue
@@ -235,7 +240,16 @@ class ConnectionManager:
         Returns:
             int: 所有用户的活跃连接总数
         """
-        return sum(len(connections) for connections in self.active_connections.values())
+        return self._connection_count
+    
+    def get_connected_users_count(self) -> int:
+        """
+        获取已连接的用户数
+        
+        Returns:
+            int: 至少有一个活跃连接的用户数
+        """
+        return len(self.active_connections)
     
     def get_connected_users(self) -> Set[str]:
         """
@@ -3,20 +3,22 @@ Pytest 配置和共享 Fixture
 
 提供所有测试文件共享的 fixture 和配置，包括：
 - 测试数据库配置
-- 数据库会话 fixture
+- 数据库会话 fixture（同步及异步）
 - 测试客户端 fixture
 - 其他通用测试工具
 """
 
 import sys
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 # 将项目根目录添加到 Python 路径
 project_root = Path(__file__).parent.parent
@@ -24,6 +26,8 @@ sys.path.insert(0, str(project_root))
 
 from app.main import app
 from app.db.base import Base, BaseModel
+from app.db import session as session_module
+from app.db.session import get_async_db_session, get_db
 from app.config import settings
 
 
@@ -32,6 +36,9 @@ from app.config import settings
 # 使用 SQLite 内存数据库进行测试（快速、隔离）
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
+# 异步测试同样使用 SQLite 内存数据库（aiosqlite 驱动）
+TEST_ASYNC_DATABASE_URL = "sqlite+aiosqlite://"
+
 
 @pytest.fixture(scope="session")
 def test_engine():
@@ -89,6 +96,84 @@ def db_session(test_engine) -> Generator[Session, None, None]:
         db.close()
 
 
+def _create_test_tables(connection) -> None:
+    """
+    创建所有测试表及索引
+    
+    SQLite（与 PostgreSQL 相同）的索引名在整个数据库内唯一，而部分模型在不同表上使用了同名索引
+    （如 idx_user_id），与初始迁移的 create_index_if_not_exists 一致：同名索引已存在时跳过。
+    """
+    index_names = set()
+    for table in BaseModel.metadata.sorted_tables:
+        connection.execute(CreateTable(table))
+        for index in table.indexes:
+            if index.name not in index_names:
+                connection.execute(CreateIndex(index))
+                index_names.add(index.name)
+
+
+@pytest.fixture(scope="function")
+async def async_tables(monkeypatch) -> AsyncGenerator[AsyncEngine, None]:
+    """
+    创建异步测试数据库引擎及测试表（函数级别）
+    
+    与 test_engine 一样使用 SQLite 内存数据库，不连接 DATABASE_URL 指向的数据库。
+    应用的异步会话工厂和 get_db 依赖在测试期间改为使用该引擎，
+    因此 get_async_db_session() 及请求处理中创建的会话都连接到测试数据库。
+    每个测试使用独立的事件循环，测试结束后释放引擎（内存数据库随之删除）。
+    
+    Yields:
+        AsyncEngine: 异步测试数据库引擎
+    """
+    engine = create_async_engine(
+        TEST_ASYNC_DATABASE_URL,
+        poolclass=StaticPool,  # 所有会话共用同一个连接，共享同一个内存数据库
+        echo=False,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(_create_test_tables)
+    
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(session_module, "_AsyncSessionLocal", session_factory)
+    
+    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        db = session_factory()
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await db.close()
+    
+    app.dependency_overrides[get_db] = override_get_db
+    
+    try:
+        yield engine
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await engine.dispose()
+
+
+@pytest.fixture(scope="function")
+async def async_db_session(async_tables) -> AsyncGenerator[AsyncSession, None]:
+    """
+    创建异步测试数据库会话（函数级别）
+    
+    每个测试函数都会创建新的测试数据库和会话，测试结束后回滚并关闭会话。
+    
+    Yields:
+        AsyncSession: 异步数据库会话实例
+    """
+    session = get_async_db_session()
+    try:
+        yield session
+    finally:
+        await session.rollback()
+        await session.close()
+
+
 # ==================== 测试客户端 Fixture ====================
 
 @pytest.fixture
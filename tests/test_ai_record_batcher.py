@@ -0,0 +1,115 @@
+"""
+AI交互记录批量写入测试模块
+
+测试 AIRecordBatcher 的功能，包括：
+- 未启动时提交
+- 按批次大小和时间间隔写入
+- 停止时写入剩余记录
+- 队列已满时丢弃
+- 违反约束时逐条重试
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+# 将项目根目录添加到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.db.session import get_async_db_session
+from app.models.ai_interaction_record import AIInteractionRecord
+from app.services.core.ai_record_batcher import AIRecordBatcher
+
+
+# ==================== 测试辅助函数 ====================
+
+def make_record(index: int) -> dict:
+    """创建测试记录"""
+    return {
+        "record_id": f"record_{index:03d}",
+        "group_id": "group_001",
+        "user_message_id": f"msg_{index:03d}",
+        "request_content": {"prompt": f"问题{index}"},
+        "status": 1,
+    }
+
+
+async def count_records() -> int:
+    """统计已写入的记录数"""
+    db = get_async_db_session()
+    try:
+        return (await db.execute(select(func.count()).select_from(AIInteractionRecord))).scalar_one()
+    finally:
+        await db.close()
+
+
+# ==================== 批量写入测试 ====================
+
+async def test_submit_before_start():
+    """测试未启动时提交记录"""
+    batcher = AIRecordBatcher()
+    assert batcher.submit(make_record(1)) is False
+    assert batcher.running is False
+
+
+async def test_flush_on_stop(async_tables):
+    """测试停止时写入所有剩余记录"""
+    batcher = AIRecordBatcher(batch_size=2, flush_interval=10)
+    await batcher.start()
+
+    for i in range(5):
+        assert batcher.submit(make_record(i)) is True
+
+    await batcher.stop()
+    assert batcher.running is False
+    assert await count_records() == 5
+
+    # 停止后不再接收记录
+    assert batcher.submit(make_record(99)) is False
+
+
+async def test_flush_on_interval(async_tables):
+    """测试未满一批时按时间间隔写入"""
+    batcher = AIRecordBatcher(batch_size=100, flush_interval=0.05)
+    await batcher.start()
+
+    batcher.submit(make_record(1))
+    await asyncio.sleep(0.3)
+    assert await count_records() == 1
+
+    # 写入的 JSON 内容可直接读回为字典
+    db = get_async_db_session()
+    try:
+        record = (await db.execute(select(AIInteractionRecord))).scalars().first()
+        assert record.request_content == {"prompt": "问题1"}
+    finally:
+        await db.close()
+
+    await batcher.stop()
+
+
+async def test_queue_full():
+    """测试队列已满时丢弃记录"""
+    batcher = AIRecordBatcher(max_queue_size=1)
+    await batcher.start()
+    # 停止后台任务，使队列不被消费
+    batcher._task.cancel()
+
+    assert batcher.submit(make_record(1)) is True
+    assert batcher.submit(make_record(2)) is False
+
+
+async def test_duplicate_record_retried_one_by_one(async_tables):
+    """测试批次中有重复 record_id 时逐条重试，只丢弃出错的记录"""
+    batcher = AIRecordBatcher(batch_size=10, flush_interval=10)
+    await batcher.start()
+
+    for i in range(5):
+        batcher.submit(make_record(i))
+    batcher.submit(make_record(2))
+
+    await batcher.stop()
+    assert await count_records() == 5
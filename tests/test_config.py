@@ -124,6 +124,10 @@ def test_config_cors_origins():
         assert len(config.cors_origins) == 2
         assert "http://localhost:3000" in config.cors_origins
         assert "http://localhost:8080" in config.cors_origins
+        # 解析结果缓存在实例上，重复访问返回同一个列表
+        assert config.cors_origins is config.cors_origins
+        # 派生属性不参与序列化
+        assert "cors_origins" not in config.model_dump()
 
 
 def test_config_environment_methods():
@@ -190,3 +194,43 @@ def test_config_database_url_methods():
         with pytest.raises(ValueError, match="database_url 未配置"):
             config.get_database_url_sync()
 
+
+
+def test_config_db_pool_settings():
+    """测试异步连接池配置"""
+    # 测试默认值
+    with patch.dict("os.environ", {}, clear=True):
+        config = Settings()
+        assert config.db_pool_size is None
+        assert config.db_effective_io_concurrency == 1
+        assert config.db_max_overflow == 10
+        assert config.db_pool_timeout == 30
+        assert config.db_pool_recycle == 1800
+        assert config.db_pool_use_lifo is True
+        assert config.db_query_cache_size == 1200
+    
+    # 测试从环境变量读取
+    with patch.dict("os.environ", {"DB_POOL_SIZE": "20", "DB_MAX_OVERFLOW": "5"}):
+        config = Settings()
+        assert config.db_pool_size == 20
+        assert config.db_max_overflow == 5
+    
+    # 测试无效的连接池大小
+    with patch.dict("os.environ", {"DB_POOL_SIZE": "0"}):
+        with pytest.raises(Exception):
+            Settings()
+
+
+def test_config_max_pagination_depth():
+    """测试分页深度配置"""
+    with patch.dict("os.environ", {}, clear=True):
+        config = Settings()
+        assert config.max_pagination_depth == 10000
+    
+    with patch.dict("os.environ", {"MAX_PAGINATION_DEPTH": "500"}):
+        config = Settings()
+        assert config.max_pagination_depth == 500
+    
+    with patch.dict("os.environ", {"MAX_PAGINATION_DEPTH": "0"}):
+        with pytest.raises(Exception):
+            Settings()
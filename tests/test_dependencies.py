@@ -20,7 +20,7 @@ from app.dependencies import (
     create_permission_dependency,
 )
 from app.utils.exceptions import UnauthorizedError, ForbiddenError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 # ==================== 测试辅助类 ====================
@@ -36,24 +36,24 @@ class MockUser:
 
 # ==================== 数据库依赖测试 ====================
 
-def test_get_db():
+async def test_get_db():
     """测试数据库依赖"""
     print("\n=== 测试数据库依赖 ===")
     
-    # 测试 get_db 是一个生成器函数
+    # 测试 get_db 是一个异步生成器函数
     db_gen = get_db()
-    assert db_gen is not None, "get_db 应该返回生成器"
+    assert db_gen is not None, "get_db 应该返回异步生成器"
     
     # 获取数据库会话
-    db = next(db_gen)
+    db = await db_gen.__anext__()
     assert db is not None, "数据库会话不应为 None"
-    assert isinstance(db, Session), "应该返回 Session 对象"
+    assert isinstance(db, AsyncSession), "应该返回 AsyncSession 对象"
     
     # 测试会话可以正常使用
     try:
         # 测试查询（如果数据库可用）
         from sqlalchemy import text
-        result = db.execute(text("SELECT 1"))
+        result = await db.execute(text("SELECT 1"))
         assert result is not None
     except Exception:
         # 如果数据库不可用，至少验证会话对象存在
@@ -61,8 +61,8 @@ def test_get_db():
     
     # 关闭生成器
     try:
-        next(db_gen)
-    except StopIteration:
+        await db_gen.__anext__()
+    except StopAsyncIteration:
         pass
     
     print("✓ 数据库依赖测试通过")
@@ -419,12 +419,21 @@ def test_create_permission_dependency():
     # 创建权限检查依赖
     require_delete_user = create_permission_dependency(resource="user", action="delete")
     assert callable(require_delete_user), "应该返回可调用对象"
+    assert require_delete_user.__name__ == "require_user_delete", "依赖函数应按资源/操作命名"
     
     # 测试依赖函数
     result_user = require_delete_user(user=mock_user)
     assert result_user is not None, "应该返回用户对象"
     assert result_user.id == "user_123", "用户 ID 应该正确"
     
+    # 测试无权限的依赖
+    require_manage_admin = create_permission_dependency(resource="admin", action="manage")
+    try:
+        require_manage_admin(user=mock_user)
+        assert False, "应该抛出 ForbiddenError"
+    except ForbiddenError as e:
+        assert e.code == 403, "错误代码应该是 403"
+    
     # 清理
     set_permission_check_function(None)
     
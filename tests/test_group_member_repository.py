@@ -0,0 +1,120 @@
+"""
+群组成员 Repository 测试模块
+
+测试 GroupMemberRepository 的功能，包括：
+- 批量添加、移除成员后分页总数缓存失效
+- 批量添加时跳过已在群组中的用户
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+# 将项目根目录添加到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.config import settings
+from app.repositories import base as repository_base
+from app.repositories.group_member_repository import GroupMemberRepository
+from app.repositories.group_repository import GroupRepository
+from app.repositories.user_repository import UserRepository
+
+
+# ==================== 测试 Fixtures ====================
+
+@pytest.fixture
+async def repository(async_db_session) -> GroupMemberRepository:
+    """创建群组 group_001 及用户 user_001 ~ user_003，返回成员 Repository"""
+    users = UserRepository(async_db_session)
+    for i in range(1, 4):
+        await users.create(user_id=f"user_00{i}", username=f"用户{i}")
+    await GroupRepository(async_db_session).create(group_id="group_001", group_name="医疗咨询群", created_by="user_001")
+    return GroupMemberRepository(async_db_session)
+
+
+@pytest.fixture
+def count_cache(monkeypatch):
+    """缓存所有分页总数，测试结束后清空缓存"""
+    monkeypatch.setattr(settings, "count_cache_min_total", 0)
+    repository_base._count_cache.clear()
+    yield
+    repository_base._count_cache.clear()
+
+
+# ==================== 分页总数缓存测试 ====================
+
+async def test_add_members_invalidates_count_cache(repository: GroupMemberRepository, count_cache):
+    """测试批量添加成员后分页总数缓存失效"""
+    await repository.add_members("group_001", [
+        {"user_id": "user_001", "user_role": "DOCTOR"},
+        {"user_id": "user_002", "user_role": "PATIENT"},
+    ])
+    assert (await repository.paginate(with_total=True)).total == 2
+
+    await repository.add_members("group_001", [{"user_id": "user_003", "user_role": "PATIENT"}])
+    assert (await repository.paginate(with_total=True)).total == 3
+
+
+async def test_remove_member_invalidates_count_cache(repository: GroupMemberRepository, count_cache):
+    """测试移除成员后分页总数缓存失效"""
+    await repository.add_members("group_001", [
+        {"user_id": "user_001", "user_role": "DOCTOR"},
+        {"user_id": "user_002", "user_role": "PATIENT"},
+    ])
+    assert (await repository.paginate(with_total=True)).total == 2
+
+    assert await repository.remove_member("group_001", "user_002") is True
+    assert (await repository.paginate(with_total=True)).total == 1
+
+    assert await repository.remove_member("group_001", "user_002") is False
+
+
+# ==================== 批量添加测试 ====================
+
+async def test_add_members_ignore_existing(repository: GroupMemberRepository):
+    """测试跳过已在群组中的用户，返回值只统计实际插入的成员"""
+    await repository.add_members("group_001", [{"user_id": "user_001", "user_role": "DOCTOR"}])
+
+    count = await repository.add_members("group_001", [
+        {"user_id": "user_001", "user_role": "PATIENT"},
+        {"user_id": "user_002", "user_role": "PATIENT"},
+        {"user_id": "user_003", "user_role": "PATIENT"},
+    ], ignore_existing=True)
+    assert count == 2
+
+    members = await repository.get_members_by_group("group_001")
+    assert sorted((member.user_id, member.user_role) for member in members) == [
+        ("user_001", "DOCTOR"),
+        ("user_002", "PATIENT"),
+        ("user_003", "PATIENT"),
+    ]
+
+    # 全部已在群组中时不插入
+    assert await repository.add_members("group_001", [
+        {"user_id": "user_002", "user_role": "DOCTOR"},
+    ], ignore_existing=True) == 0
+
+
+async def test_add_members_ignore_existing_without_on_conflict(repository: GroupMemberRepository, monkeypatch):
+    """测试不支持 ON CONFLICT 的数据库（如 MySQL）先查询已有成员再写入其余用户"""
+    monkeypatch.delitem(repository_base._UPSERT_INSERTS, "sqlite")
+    await repository.add_members("group_001", [{"user_id": "user_001", "user_role": "DOCTOR"}])
+
+    count = await repository.add_members("group_001", [
+        {"user_id": "user_001", "user_role": "PATIENT"},
+        {"user_id": "user_002", "user_role": "PATIENT"},
+    ], ignore_existing=True)
+    assert count == 1
+    assert len(await repository.get_members_by_group("group_001")) == 2
+
+
+async def test_add_members_existing_raises(repository: GroupMemberRepository):
+    """测试未指定 ignore_existing 时用户已在群组中抛出 IntegrityError"""
+    await repository.add_members("group_001", [{"user_id": "user_001", "user_role": "DOCTOR"}])
+
+    with pytest.raises(IntegrityError):
+        await repository.add_members("group_001", [{"user_id": "user_001", "user_role": "DOCTOR"}])
+    await repository.db.rollback()
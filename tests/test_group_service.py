@@ -0,0 +1,143 @@
+"""
+群组服务测试模块
+
+测试 GroupService 的成员管理，包括：
+- 添加成员（INSERT ... SELECT WHERE EXISTS 一条语句完成校验和插入）
+- 批量添加成员（服务层校验及接口状态码）
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+# 将项目根目录添加到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.main import app
+from app.repositories.group_repository import GroupRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.group import GroupMemberAdd
+from app.services.core.group_service import GroupService
+from app.utils.exceptions import ConflictError, NotFoundError, ValidationError
+
+
+# ==================== 测试 Fixtures ====================
+
+@pytest.fixture
+async def service(async_db_session) -> GroupService:
+    """创建群组 group_001 及用户 user_001 ~ user_003（尚无成员），返回群组服务"""
+    users = UserRepository(async_db_session)
+    for i in range(1, 4):
+        await users.create(user_id=f"user_00{i}", username=f"用户{i}")
+    await GroupRepository(async_db_session).create(group_id="group_001", group_name="医疗咨询群", created_by="user_001")
+    return GroupService(async_db_session)
+
+
+async def member_ids(service: GroupService, group_id: str = "group_001") -> list:
+    """读取群组成员的 user_id（按加入时间排序）"""
+    return [member["user_id"] for member in await service.get_group_members(group_id)]
+
+
+# ==================== 添加成员测试 ====================
+
+async def test_add_member(service: GroupService):
+    """测试添加成员"""
+    assert await service.add_member("group_001", GroupMemberAdd(user_id="user_002", user_role="PATIENT")) is True
+
+    members = await service.get_group_members("group_001")
+    assert [(member["user_id"], member["user_role"]) for member in members] == [("user_002", "PATIENT")]
+    assert members[0]["joined_at"] is not None
+
+
+async def test_add_member_already_in_group(service: GroupService):
+    """测试用户已在群组中时抛出 ConflictError（重复插入被忽略，不报完整性错误）"""
+    await service.add_member("group_001", GroupMemberAdd(user_id="user_002", user_role="PATIENT"))
+
+    assert await service.member_repo.try_add_member("group_001", "user_002", "DOCTOR") is False
+    with pytest.raises(ConflictError):
+        await service.add_member("group_001", GroupMemberAdd(user_id="user_002", user_role="DOCTOR"))
+    assert await member_ids(service) == ["user_002"]
+
+
+async def test_add_member_group_not_found(service: GroupService):
+    """测试群组不存在时抛出 NotFoundError"""
+    with pytest.raises(NotFoundError, match="群组"):
+        await service.add_member("group_missing", GroupMemberAdd(user_id="user_002", user_role="PATIENT"))
+
+
+async def test_add_member_user_not_found(service: GroupService):
+    """测试用户不存在时抛出 NotFoundError，且不写入成员"""
+    with pytest.raises(NotFoundError, match="用户"):
+        await service.add_member("group_001", GroupMemberAdd(user_id="user_missing", user_role="PATIENT"))
+    assert await member_ids(service) == []
+
+
+# ==================== 批量添加成员测试 ====================
+
+def bulk(*user_ids: str) -> list:
+    """构建批量添加的成员列表"""
+    return [GroupMemberAdd(user_id=user_id, user_role="PATIENT") for user_id in user_ids]
+
+
+async def test_add_members(service: GroupService):
+    """测试批量添加成员"""
+    assert await service.add_members("group_001", bulk("user_001", "user_002")) == 2
+    assert sorted(await member_ids(service)) == ["user_001", "user_002"]
+
+
+async def test_add_members_duplicated_user(service: GroupService):
+    """测试成员列表中 user_id 重复时抛出 ValidationError"""
+    with pytest.raises(ValidationError, match="重复"):
+        await service.add_members("group_001", bulk("user_001", "user_002", "user_001"))
+    assert await member_ids(service) == []
+
+
+async def test_add_members_not_found(service: GroupService):
+    """测试群组或用户不存在时抛出 NotFoundError，且不写入任何成员"""
+    with pytest.raises(NotFoundError, match="群组"):
+        await service.add_members("group_missing", bulk("user_001"))
+
+    with pytest.raises(NotFoundError, match="user_missing"):
+        await service.add_members("group_001", bulk("user_001", "user_missing"))
+    assert await member_ids(service) == []
+
+
+async def test_add_members_already_in_group(service: GroupService):
+    """测试有用户已在群组中时抛出 ConflictError，且不写入其他成员"""
+    await service.add_members("group_001", bulk("user_002"))
+
+    with pytest.raises(ConflictError, match="user_002"):
+        await service.add_members("group_001", bulk("user_001", "user_002", "user_003"))
+    assert await member_ids(service) == ["user_002"]
+
+
+async def test_add_members_api(service: GroupService):
+    """测试批量添加成员接口的状态码"""
+    url = "/api/group/{}/members/bulk"
+    payload = {"members": [{"user_id": "user_001", "user_role": "DOCTOR"}]}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(url.format("group_001"), json=payload)
+        assert response.status_code == 201
+        assert response.json()["data"] == {"count": 1}
+
+        response = await client.post(url.format("group_001"), json=payload)
+        assert response.status_code == 409
+
+        response = await client.post(url.format("group_missing"), json=payload)
+        assert response.status_code == 404
+
+        response = await client.post(
+            url.format("group_001"),
+            json={"members": [{"user_id": "user_missing", "user_role": "DOCTOR"}]},
+        )
+        assert response.status_code == 404
+
+        response = await client.post(
+            url.format("group_001"),
+            json={"members": [{"user_id": "user_002", "user_role": "DOCTOR"}] * 2},
+        )
+        assert response.status_code == 400
@@ -99,6 +99,25 @@ def test_health_check_database_status(client):
     assert database_status in ["connected", "disconnected", "error"]
 
 
+def test_health_check_database_status_cached(client):
+    """测试健康检查接口缓存数据库状态"""
+    import app.main as main_module
+    
+    # 清除缓存，确保第一次请求会检查数据库
+    main_module._health_db_status[0] = float("-inf")
+    
+    with patch("app.main.check_connection", return_value=True) as mock_check:
+        first = client.get("/health").json()
+        second = client.get("/health").json()
+    
+    assert first["data"]["database"] == "connected"
+    assert second["data"]["database"] == "connected"
+    # 缓存有效期内只检查一次数据库
+    assert mock_check.call_count == 1
+    
+    main_module._health_db_status[0] = float("-inf")
+
+
 # ==================== 版本信息接口测试 ====================
 
 def test_version_endpoint(client):
@@ -134,6 +153,34 @@ def test_cors_headers(client):
     assert "access-control-allow-origin" in response.headers or response.status_code == 200
 
 
+def test_cors_preflight_allowed_headers(client):
+    """测试 CORS 预检请求的请求头校验"""
+    origin = settings.cors_origins[0] if settings.cors_origins else "http://localhost:3000"
+    
+    # 允许的请求头
+    response = client.options(
+        "/health",
+        headers={
+            "Origin": origin,
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": "authorization, if-none-match",
+        },
+    )
+    assert response.status_code == 200
+    assert "GET" in response.headers["access-control-allow-methods"]
+    
+    # 未列出的请求头
+    response = client.options(
+        "/health",
+        headers={
+            "Origin": origin,
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": "x-unknown-header",
+        },
+    )
+    assert response.status_code == 400
+
+
 def test_cors_allow_origins(client):
     """测试 CORS 允许的源"""
     # 测试来自允许源的请求
@@ -185,6 +232,7 @@ def test_http_exception_handler(client):
     data = response.json()
     assert data["code"] == 404
     assert data["message"] == "资源未找到"
+    assert "details" not in data
     assert "timestamp" in data
     
     # 注意：不需要清理测试路由，因为 FastAPI 的路由是只读的
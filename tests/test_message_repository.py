@@ -0,0 +1,96 @@
+"""
+消息 Repository 测试模块
+
+测试 MessageRepository 的功能，包括：
+- 批量创建、删除消息时同步维护群组的 message_count
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+
+# 将项目根目录添加到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.models.group import Group
+from app.repositories import base as repository_base
+from app.repositories.group_repository import GroupRepository
+from app.repositories.message_repository import MessageRepository
+
+
+# ==================== 测试 Fixtures ====================
+
+@pytest.fixture
+async def repository(async_db_session) -> MessageRepository:
+    """创建群组 group_001、group_002，并批量写入 group_001 的 3 条和 group_002 的 2 条消息"""
+    groups = GroupRepository(async_db_session)
+    await groups.create(group_id="group_001", group_name="群组1", created_by="user_001")
+    await groups.create(group_id="group_002", group_name="群组2", created_by="user_001")
+
+    repository = MessageRepository(async_db_session)
+    await repository.create_many([
+        make_message(f"msg_{i}", "group_001" if i < 3 else "group_002") for i in range(5)
+    ])
+    return repository
+
+
+def make_message(message_id: str, group_id: str) -> dict:
+    """创建测试消息数据"""
+    return {
+        "message_id": message_id,
+        "group_id": group_id,
+        "from_user_id": "user_001",
+        "msg_type": "TEXT",
+        "msg_content": "你好",
+    }
+
+
+async def message_counts(db) -> dict:
+    """读取各群组的 message_count"""
+    result = await db.execute(select(Group.group_id, Group.message_count).order_by(Group.group_id))
+    return dict(result.all())
+
+
+async def message_ids(db, group_id: str) -> list:
+    """读取群组消息的主键（从旧到新）"""
+    return [message.id async for message in MessageRepository(db).stream_by_group(group_id)]
+
+
+# ==================== 消息计数测试 ====================
+
+async def test_create_many_increments_message_count(repository: MessageRepository):
+    """测试批量创建消息后按群组递增计数"""
+    assert await message_counts(repository.db) == {"group_001": 3, "group_002": 2}
+
+    await repository.create_many([make_message("msg_9", "group_002")], return_defaults=False)
+    assert await message_counts(repository.db) == {"group_001": 3, "group_002": 3}
+
+
+async def test_delete_decrements_message_count(repository: MessageRepository):
+    """测试删除消息后递减所属群组的计数"""
+    first_id = (await message_ids(repository.db, "group_001"))[0]
+
+    assert await repository.delete(first_id) is True
+    assert await message_counts(repository.db) == {"group_001": 2, "group_002": 2}
+
+    # 消息不存在时计数不变
+    assert await repository.delete(first_id) is False
+    assert await message_counts(repository.db) == {"group_001": 2, "group_002": 2}
+
+
+async def test_delete_many_decrements_message_count(repository: MessageRepository, monkeypatch):
+    """测试分批删除多个群组的消息后按群组递减计数"""
+    monkeypatch.setitem(repository_base._IN_BATCH_SIZES, "sqlite", 2)
+    ids = (await message_ids(repository.db, "group_001"))[:2] + (await message_ids(repository.db, "group_002"))[:1]
+
+    assert await repository.delete_many(ids + [99999]) == 3
+    assert await message_counts(repository.db) == {"group_001": 1, "group_002": 1}
+
+
+async def test_delete_all_resets_message_count(repository: MessageRepository):
+    """测试删除所有消息后计数归零"""
+    assert await repository.delete_all() == 5
+    assert await message_counts(repository.db) == {"group_001": 0, "group_002": 0}
@@ -0,0 +1,154 @@
+"""
+消息服务测试模块
+
+测试 MessageService 的消息列表查询，包括：
+- 页码分页与 before_id 游标分页的衔接
+- 是否还有更多消息（has_more）及下一页游标
+- 发送消息后群组消息计数及消息总数
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select, update
+
+# 将项目根目录添加到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.models.group import Group
+from app.models.message import Message
+from app.repositories.group_member_repository import GroupMemberRepository
+from app.repositories.group_repository import GroupRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.message import MessageCreate
+from app.services.core.message_service import MessageService
+from app.utils.exceptions import NotFoundError
+
+
+# ==================== 测试 Fixtures ====================
+
+@pytest.fixture
+async def group_id(async_db_session) -> str:
+    """创建群组及群组成员 user_001，返回群组ID"""
+    await UserRepository(async_db_session).create(user_id="user_001", username="张医生", user_role="DOCTOR")
+    await GroupRepository(async_db_session).create(group_id="group_001", group_name="医疗咨询群", created_by="user_001")
+    await GroupMemberRepository(async_db_session).add_member("group_001", "user_001", "DOCTOR")
+    return "group_001"
+
+
+async def send_messages(service: MessageService, group_id: str, count: int) -> None:
+    """
+    发送 count 条消息
+    
+    发送后将创建时间改为与插入顺序相反：created_at 精度有限（同一秒内发送）或取自事务开始时间时，
+    创建时间的先后与 id 的先后不一定一致。
+    """
+    for i in range(count):
+        message = await service.send_message(MessageCreate(group_id=group_id, content=f"消息{i}"), "user_001")
+        await service.db.execute(
+            update(Message)
+            .where(Message.id == message.id)
+            .values(created_at=datetime(2026, 1, 1) - timedelta(seconds=i))
+        )
+    await service.db.commit()
+
+
+# ==================== 消息列表测试 ====================
+
+async def test_page_then_cursor_covers_all_messages(async_db_session, group_id):
+    """测试页码分页第一页之后，沿 next_before_id 翻页能不重不漏地取回所有消息"""
+    service = MessageService(async_db_session)
+    await send_messages(service, group_id, 5)
+
+    messages, total, next_before_id = await service.get_messages(group_id, page=1, page_size=2)
+    assert total == 5
+    seen = [message.id for message in messages]
+
+    while next_before_id is not None:
+        messages, total, next_before_id = await service.get_messages(
+            group_id, page_size=2, before_id=next_before_id
+        )
+        assert total is None
+        seen.extend(message.id for message in messages)
+
+    # 从新到旧，每条消息恰好出现一次
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 5
+
+
+async def test_cursor_has_more_uses_extra_row(async_db_session, group_id):
+    """测试游标分页多查询一条判断是否还有更多消息"""
+    service = MessageService(async_db_session)
+    await send_messages(service, group_id, 4)
+
+    messages, total, next_before_id = await service.get_messages(group_id, page_size=2, before_id=10**9)
+    assert total is None
+    assert [message.id for message in messages] == [4, 3]
+    assert next_before_id == 3
+
+    # 剩余消息恰好一页：没有多出的一条，不再返回游标
+    messages, _, next_before_id = await service.get_messages(group_id, page_size=2, before_id=next_before_id)
+    assert [message.id for message in messages] == [2, 1]
+    assert next_before_id is None
+
+
+async def test_last_full_page_has_no_cursor(async_db_session, group_id):
+    """测试页码分页最后一页恰好满页时不返回游标"""
+    service = MessageService(async_db_session)
+    await send_messages(service, group_id, 4)
+
+    messages, total, next_before_id = await service.get_messages(group_id, page=2, page_size=2)
+    assert total == 4
+    assert [message.id for message in messages] == [2, 1]
+    assert next_before_id is None
+
+
+async def test_page_two_then_cursor(async_db_session, group_id):
+    """测试从页码分页的中间页切换到游标分页"""
+    service = MessageService(async_db_session)
+    await send_messages(service, group_id, 6)
+
+    messages, total, next_before_id = await service.get_messages(group_id, page=2, page_size=2)
+    assert total == 6
+    assert [message.id for message in messages] == [4, 3]
+    assert next_before_id == 3
+
+    messages, _, next_before_id = await service.get_messages(group_id, page_size=2, before_id=next_before_id)
+    assert [message.id for message in messages] == [2, 1]
+    assert next_before_id is None
+
+
+async def test_page_has_more_ignores_message_count(async_db_session, group_id):
+    """测试页码分页是否还有更多消息由多查询的一条得出，不受群组消息计数偏差影响"""
+    service = MessageService(async_db_session)
+    await send_messages(service, group_id, 6)
+    await async_db_session.execute(update(Group).where(Group.group_id == group_id).values(message_count=4))
+    await async_db_session.commit()
+
+    messages, total, next_before_id = await service.get_messages(group_id, page=2, page_size=2)
+    assert total == 4
+    assert [message.id for message in messages] == [4, 3]
+    assert next_before_id == 3
+
+
+async def test_get_messages_group_not_found(async_db_session):
+    """测试群组不存在时抛出 NotFoundError"""
+    with pytest.raises(NotFoundError):
+        await MessageService(async_db_session).get_messages("group_missing")
+
+
+async def test_send_message_updates_message_count(async_db_session, group_id):
+    """测试发送消息递增群组的消息计数，消息列表的总数读取该计数"""
+    service = MessageService(async_db_session)
+    await send_messages(service, group_id, 3)
+
+    count = await async_db_session.scalar(select(Group.message_count).where(Group.group_id == group_id))
+    assert count == 3
+
+    # 第一页满页时总数来自群组计数
+    messages, total, _ = await service.get_messages(group_id, page=1, page_size=2)
+    assert len(messages) == 2
+    assert total == 3
@@ -15,7 +15,7 @@ from typing import Optional
 
 import pytest
 from sqlalchemy import Column, String, Integer, Boolean
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 # 将项目根目录添加到 Python 路径
@@ -23,8 +23,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from app.db.base import BaseModel
-from app.db.database import get_engine, close_engine
-from app.db.session import SessionLocal, get_db_session
+from app.repositories import base as repository_base
 from app.repositories.base import (
     BaseRepository,
     PaginationParams,
@@ -47,46 +46,21 @@ class UserModel(BaseModel):
 class UserRepository(BaseRepository[UserModel]):
     """测试用户 Repository"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(UserModel, db)
 
 
 # ==================== 测试 Fixtures ====================
 
-@pytest.fixture(scope="function")
-def db_session():
-    """
-    创建测试数据库会话
-    
-    每个测试函数都会创建一个新的会话，测试结束后自动回滚。
-    """
-    # 创建表
-    engine = get_engine()
-    BaseModel.metadata.create_all(bind=engine)
-    
-    # 创建会话
-    db = SessionLocal()
-    
-    try:
-        yield db
-    finally:
-        # 回滚所有更改
-        db.rollback()
-        # 关闭会话
-        db.close()
-        # 删除表
-        BaseModel.metadata.drop_all(bind=engine)
-
-
 @pytest.fixture
-def repository(db_session: Session) -> UserRepository:
+def repository(async_db_session: AsyncSession) -> UserRepository:
     """创建测试 Repository 实例"""
-    return UserRepository(db_session)
+    return UserRepository(async_db_session)
 
 
 # ==================== Create 操作测试 ====================
 
-def test_create(repository: UserRepository):
+async def test_create(repository: UserRepository):
     """测试创建单条记录"""
     user_data = {
         "name": "张三",
@@ -95,7 +69,7 @@ def test_create(repository: UserRepository):
         "is_active": True
     }
     
-    user = repository.create(user_data)
+    user = await repository.create(user_data)
     
     assert user is not None
     assert user.id is not None
@@ -107,7 +81,20 @@ def test_create(repository: UserRepository):
     assert user.updated_at is not None
 
 
-def test_create_many(repository: UserRepository):
+async def test_create_without_returning(repository: UserRepository, monkeypatch):
+    """测试不支持 INSERT ... RETURNING 的数据库（如 MySQL）创建后加载服务端默认值"""
+    user = await repository.create({"name": "张三", "email": "zhangsan@example.com"})
+    # 模拟插入时未取回服务端默认值：属性处于过期状态，异步会话中访问会失败
+    repository.db.expire(user, ["created_at", "updated_at"])
+    monkeypatch.setattr(repository.db.get_bind().dialect, "insert_returning", False)
+    
+    await repository._load_server_defaults(user)
+    
+    assert {"created_at", "updated_at"} <= vars(user).keys()
+    assert user.created_at is not None
+
+
+async def test_create_many(repository: UserRepository):
     """测试批量创建记录"""
     users_data = [
         {"name": "张三", "email": "zhangsan@example.com", "age": 25},
@@ -115,16 +102,50 @@ def test_create_many(repository: UserRepository):
         {"name": "王五", "email": "wangwu@example.com", "age": 28},
     ]
     
-    users = repository.create_many(users_data)
+    users = await repository.create_many(users_data)
     
     assert len(users) == 3
     assert all(user.id is not None for user in users)
     assert users[0].name == "张三"
     assert users[1].name == "李四"
     assert users[2].name == "王五"
+    # 主键、Python 默认值和服务端默认值均已加载
+    assert users[0].id < users[1].id < users[2].id
+    assert all(user.is_active is True for user in users)
+    assert all(user.created_at is not None for user in users)
+    assert await repository.get_count() == 3
+    
+    # 空列表不执行写入
+    assert await repository.create_many([]) == []
+
+
+async def test_create_many_without_returning(repository: UserRepository, monkeypatch):
+    """测试不支持 executemany RETURNING 的数据库（如 MySQL）的批量创建"""
+    dialect = repository.db.get_bind().dialect
+    monkeypatch.setattr(dialect, "insert_executemany_returning_sort_by_parameter_order", False)
+    
+    users = await repository.create_many([
+        {"name": "张三", "email": "zhangsan@example.com"},
+        {"name": "李四", "email": "lisi@example.com"},
+    ])
+    
+    assert [user.name for user in users] == ["张三", "李四"]
+    assert all(user.id is not None for user in users)
+    assert all(user.created_at is not None for user in users)
+
+
+async def test_create_many_without_defaults(repository: UserRepository):
+    """测试批量创建时不取回实例"""
+    result = await repository.create_many([
+        {"name": "张三", "email": "zhangsan@example.com"},
+        {"name": "李四", "email": "lisi@example.com"},
+    ], return_defaults=False)
+    
+    assert result == []
+    assert await repository.get_count() == 2
 
 
-def test_create_with_unique_constraint(repository: UserRepository):
+async def test_create_with_unique_constraint(repository: UserRepository):
     """测试创建时违反唯一性约束"""
     user_data = {
         "name": "张三",
@@ -133,107 +154,132 @@ def test_create_with_unique_constraint(repository: UserRepository):
     }
     
     # 创建第一条记录
-    repository.create(user_data)
+    await repository.create(user_data)
     
     # 尝试创建相同邮箱的记录（应该失败）
     with pytest.raises(IntegrityError):
-        repository.create(user_data)
+        await repository.create(user_data)
 
 
 # ==================== Read 操作测试 ====================
 
-def test_get_by_id(repository: UserRepository):
+async def test_get_by_id(repository: UserRepository):
     """测试根据 ID 获取记录"""
     # 创建测试数据
-    user = repository.create({
+    user = await repository.create({
         "name": "张三",
         "email": "zhangsan@example.com",
         "age": 25
     })
     
     # 根据 ID 获取
-    found_user = repository.get_by_id(user.id)
+    found_user = await repository.get_by_id(user.id)
     
     assert found_user is not None
     assert found_user.id == user.id
     assert found_user.name == "张三"
     assert found_user.email == "zhangsan@example.com"
+    # 同一会话中已加载的记录直接从标识映射返回
+    assert found_user is user
 
 
-def test_get_by_id_not_found(repository: UserRepository):
+async def test_get_by_id_not_found(repository: UserRepository):
     """测试根据不存在的 ID 获取记录"""
-    user = repository.get_by_id(99999)
+    user = await repository.get_by_id(99999)
     assert user is None
 
 
-def test_get_all(repository: UserRepository):
+async def test_get_all(repository: UserRepository):
     """测试获取所有记录"""
     # 创建多条测试数据
-    repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
-    repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
-    repository.create({"name": "王五", "email": "wangwu@example.com", "age": 28})
+    await repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
+    await repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
+    await repository.create({"name": "王五", "email": "wangwu@example.com", "age": 28})
     
     # 获取所有记录
-    users = repository.get_all()
+    users = await repository.get_all()
     
     assert len(users) == 3
     assert all(user.id is not None for user in users)
 
 
-def test_get_all_with_pagination(repository: UserRepository):
+async def test_get_all_with_pagination(repository: UserRepository):
     """测试分页获取记录"""
     # 创建多条测试数据
     for i in range(10):
-        repository.create({
+        await repository.create({
             "name": f"用户{i}",
             "email": f"user{i}@example.com",
             "age": 20 + i
         })
     
     # 获取前 5 条
-    users = repository.get_all(skip=0, limit=5)
+    users = await repository.get_all(skip=0, limit=5)
     assert len(users) == 5
     
     # 获取第 6-10 条
-    users = repository.get_all(skip=5, limit=5)
+    users = await repository.get_all(skip=5, limit=5)
     assert len(users) == 5
 
 
-def test_get_count(repository: UserRepository):
+async def test_stream_all(repository: UserRepository):
+    """测试流式读取所有记录"""
+    await repository.create_many([
+        {"name": f"用户{i}", "email": f"user{i}@example.com"} for i in range(5)
+    ])
+    
+    names = [user.name async for user in repository.stream_all(batch_size=2)]
+    assert names == [f"用户{i}" for i in range(5)]
+
+
+async def test_get_count(repository: UserRepository):
     """测试获取记录总数"""
     # 初始数量应该为 0
-    assert repository.get_count() == 0
+    assert await repository.get_count() == 0
     
     # 创建几条记录
-    repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
-    repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
+    await repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
+    await repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
     
     # 数量应该为 2
-    assert repository.get_count() == 2
+    assert await repository.get_count() == 2
+
+
+async def test_get_approximate_count(repository: UserRepository):
+    """测试获取估算总数（无统计信息的数据库返回精确总数）"""
+    await repository.create_many([
+        {"name": f"用户{i}", "email": f"user{i}@example.com"} for i in range(3)
+    ])
+    
+    approximate_total = await repository.get_approximate_count()
+    assert isinstance(approximate_total, int)
+    assert approximate_total >= 0
+    if repository.db.get_bind().dialect.name not in ("postgresql", "mysql"):
+        assert approximate_total == 3
 
 
-def test_exists(repository: UserRepository):
+async def test_exists(repository: UserRepository):
     """测试检查记录是否存在"""
     # 创建测试数据
-    user = repository.create({
+    user = await repository.create({
         "name": "张三",
         "email": "zhangsan@example.com",
         "age": 25
     })
     
     # 应该存在
-    assert repository.exists(user.id) is True
+    assert await repository.exists(user.id) is True
     
     # 不存在的 ID
-    assert repository.exists(99999) is False
+    assert await repository.exists(99999) is False
 
 
 # ==================== Update 操作测试 ====================
 
-def test_update(repository: UserRepository):
+async def test_update(repository: UserRepository):
     """测试更新记录"""
     # 创建测试数据
-    user = repository.create({
+    user = await repository.create({
         "name": "张三",
         "email": "zhangsan@example.com",
         "age": 25
@@ -242,7 +288,7 @@ def test_update(repository: UserRepository):
     original_updated_at = user.updated_at
     
     # 更新记录
-    updated_user = repository.update(user.id, {"name": "李四", "age": 30})
+    updated_user = await repository.update(user.id, {"name": "李四", "age": 30})
     
     assert updated_user is not None
     assert updated_user.id == user.id
@@ -250,18 +296,21 @@ def test_update(repository: UserRepository):
     assert updated_user.age == 30
     assert updated_user.email == "zhangsan@example.com"  # 未更新的字段保持不变
     # 注意：updated_at 可能会更新，但取决于数据库配置
+    # 提交后过期的 updated_at 已重新加载，异步会话中可直接访问
+    assert "updated_at" in vars(updated_user)
+    assert updated_user.updated_at is not None
 
 
-def test_update_not_found(repository: UserRepository):
+async def test_update_not_found(repository: UserRepository):
     """测试更新不存在的记录"""
-    updated_user = repository.update(99999, {"name": "新名称"})
+    updated_user = await repository.update(99999, {"name": "新名称"})
     assert updated_user is None
 
 
-def test_update_or_create_create(repository: UserRepository):
+async def test_update_or_create_create(repository: UserRepository):
     """测试更新或创建 - 创建新记录"""
     # 记录不存在，应该创建
-    user = repository.update_or_create(
+    user = await repository.update_or_create(
         filter_data={"email": "zhangsan@example.com"},
         update_data={"name": "张三"},
         create_data={"name": "张三", "email": "zhangsan@example.com", "age": 25}
@@ -274,17 +323,17 @@ def test_update_or_create_create(repository: UserRepository):
     assert user.age == 25
 
 
-def test_update_or_create_update(repository: UserRepository):
+async def test_update_or_create_update(repository: UserRepository):
     """测试更新或创建 - 更新现有记录"""
     # 先创建一条记录
-    user = repository.create({
+    user = await repository.create({
         "name": "张三",
         "email": "zhangsan@example.com",
         "age": 25
     })
     
     # 记录存在，应该更新
-    updated_user = repository.update_or_create(
+    updated_user = await repository.update_or_create(
         filter_data={"email": "zhangsan@example.com"},
         update_data={"name": "李四", "age": 30}
     )
@@ -294,14 +343,31 @@ def test_update_or_create_update(repository: UserRepository):
     assert updated_user.name == "李四"
     assert updated_user.age == 30
     assert updated_user.email == "zhangsan@example.com"
+    
+    # 只有一条记录（未重复插入）
+    assert await repository.get_count() == 1
+
+
+async def test_update_or_create_non_unique_filter(repository: UserRepository):
+    """测试更新或创建 - 过滤字段不是唯一键时先查询再更新"""
+    user = await repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
+    
+    updated_user = await repository.update_or_create(
+        filter_data={"name": "张三"},
+        update_data={"age": 26}
+    )
+    
+    assert updated_user.id == user.id
+    assert updated_user.age == 26
+    assert repository._build_upsert({"name": "张三"}, {"name": "张三"}, {"age": 26}) is None
 
 
 # ==================== Delete 操作测试 ====================
 
-def test_delete(repository: UserRepository):
+async def test_delete(repository: UserRepository):
     """测试删除记录"""
     # 创建测试数据
-    user = repository.create({
+    user = await repository.create({
         "name": "张三",
         "email": "zhangsan@example.com",
         "age": 25
@@ -310,25 +376,25 @@ def test_delete(repository: UserRepository):
     user_id = user.id
     
     # 删除记录
-    result = repository.delete(user_id)
+    result = await repository.delete(user_id)
     
     assert result is True
     # 验证记录已被删除
-    assert repository.get_by_id(user_id) is None
+    assert await repository.get_by_id(user_id) is None
 
 
-def test_delete_not_found(repository: UserRepository):
+async def test_delete_not_found(repository: UserRepository):
     """测试删除不存在的记录"""
-    result = repository.delete(99999)
+    result = await repository.delete(99999)
     assert result is False
 
 
-def test_delete_many(repository: UserRepository):
+async def test_delete_many(repository: UserRepository):
     """测试批量删除记录"""
     # 创建多条测试数据
-    user1 = repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
-    user2 = repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
-    user3 = repository.create({"name": "王五", "email": "wangwu@example.com", "age": 28})
+    user1 = await repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
+    user2 = await repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
+    user3 = await repository.create({"name": "王五", "email": "wangwu@example.com", "age": 28})
     
     # 保存 ID（在删除之前）
     user1_id = user1.id
@@ -336,45 +402,60 @@ def test_delete_many(repository: UserRepository):
     user3_id = user3.id
     
     # 批量删除
-    deleted_count = repository.delete_many([user1_id, user2_id])
+    deleted_count = await repository.delete_many([user1_id, user2_id])
     
     assert deleted_count == 2
     # 验证记录已被删除
-    assert repository.get_by_id(user1_id) is None
-    assert repository.get_by_id(user2_id) is None
+    assert await repository.get_by_id(user1_id) is None
+    assert await repository.get_by_id(user2_id) is None
     # 第三条记录应该还在
-    assert repository.get_by_id(user3_id) is not None
+    assert await repository.get_by_id(user3_id) is not None
+
+
+async def test_delete_many_in_batches(repository: UserRepository, monkeypatch):
+    """测试批量删除时按批拆分 IN 列表"""
+    dialect_name = repository.db.get_bind().dialect.name
+    monkeypatch.setitem(repository_base._IN_BATCH_SIZES, dialect_name, 2)
+    users = await repository.create_many([
+        {"name": f"用户{i}", "email": f"user{i}@example.com"} for i in range(5)
+    ])
+    
+    # 空列表直接返回，不执行 DELETE
+    assert await repository.delete_many([]) == 0
+    
+    assert await repository.delete_many([user.id for user in users[:4]] + [99999]) == 4
+    assert await repository.get_count() == 1
 
 
-def test_delete_all(repository: UserRepository):
+async def test_delete_all(repository: UserRepository):
     """测试删除所有记录"""
     # 创建多条测试数据
-    repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
-    repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
-    repository.create({"name": "王五", "email": "wangwu@example.com", "age": 28})
+    await repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
+    await repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
+    await repository.create({"name": "王五", "email": "wangwu@example.com", "age": 28})
     
     # 删除所有记录
-    deleted_count = repository.delete_all()
+    deleted_count = await repository.delete_all()
     
     assert deleted_count == 3
     # 验证所有记录已被删除
-    assert repository.get_count() == 0
+    assert await repository.get_count() == 0
 
 
 # ==================== 分页查询测试 ====================
 
-def test_paginate_basic(repository: UserRepository):
+async def test_paginate_basic(repository: UserRepository):
     """测试基本分页查询"""
     # 创建多条测试数据
     for i in range(15):
-        repository.create({
+        await repository.create({
             "name": f"用户{i}",
             "email": f"user{i}@example.com",
             "age": 20 + i
         })
     
     # 第一页，每页 10 条
-    result = repository.paginate(page=1, page_size=10)
+    result = await repository.paginate(page=1, page_size=10)
     
     assert result.total == 15
     assert result.page == 1
@@ -385,18 +466,18 @@ def test_paginate_basic(repository: UserRepository):
     assert result.has_prev is False
 
 
-def test_paginate_second_page(repository: UserRepository):
+async def test_paginate_second_page(repository: UserRepository):
     """测试第二页分页查询"""
     # 创建多条测试数据
     for i in range(15):
-        repository.create({
+        await repository.create({
             "name": f"用户{i}",
             "email": f"user{i}@example.com",
             "age": 20 + i
         })
     
     # 第二页，每页 10 条
-    result = repository.paginate(page=2, page_size=10)
+    result = await repository.paginate(page=2, page_size=10)
     
     assert result.total == 15
     assert result.page == 2
@@ -407,18 +488,18 @@ def test_paginate_second_page(repository: UserRepository):
     assert result.has_prev is True
 
 
-def test_paginate_with_order(repository: UserRepository):
+async def test_paginate_with_order(repository: UserRepository):
     """测试带排序的分页查询"""
     # 创建多条测试数据
     for i in range(5):
-        repository.create({
+        await repository.create({
             "name": f"用户{i}",
             "email": f"user{i}@example.com",
             "age": 20 + i
         })
     
     # 按年龄降序排列
-    result = repository.paginate(
+    result = await repository.paginate(
         page=1,
         page_size=10,
         order_by="age",
@@ -431,9 +512,9 @@ def test_paginate_with_order(repository: UserRepository):
     assert ages == sorted(ages, reverse=True)
 
 
-def test_paginate_empty(repository: UserRepository):
+async def test_paginate_empty(repository: UserRepository):
     """测试空结果的分页查询"""
-    result = repository.paginate(page=1, page_size=10)
+    result = await repository.paginate(page=1, page_size=10)
     
     assert result.total == 0
     assert result.page == 1
@@ -444,16 +525,16 @@ def test_paginate_empty(repository: UserRepository):
     assert result.has_prev is False
 
 
-def test_paginate_to_dict(repository: UserRepository):
+async def test_paginate_to_dict(repository: UserRepository):
     """测试分页结果转换为字典"""
     # 创建测试数据
-    repository.create({
+    await repository.create({
         "name": "张三",
         "email": "zhangsan@example.com",
         "age": 25
     })
     
-    result = repository.paginate(page=1, page_size=10)
+    result = await repository.paginate(page=1, page_size=10)
     data = result.to_dict()
     
     assert "items" in data
@@ -467,105 +548,212 @@ def test_paginate_to_dict(repository: UserRepository):
     assert data["pagination"]["has_prev"] is False
 
 
+async def test_paginate_without_total(repository: UserRepository):
+    """测试不统计总数的分页查询"""
+    for i in range(15):
+        await repository.create({
+            "name": f"用户{i}",
+            "email": f"user{i}@example.com",
+            "age": 20 + i
+        })
+    
+    result = await repository.paginate(page=1, page_size=10, with_total=False)
+    assert result.total is None
+    assert result.total_pages is None
+    assert len(result.items) == 10
+    assert result.has_next is True
+    
+    result = await repository.paginate(page=2, page_size=10, with_total=False)
+    assert len(result.items) == 5
+    assert result.has_next is False
+    assert result.has_prev is True
+
+
+async def test_paginate_total_cached(repository: UserRepository, monkeypatch):
+    """测试分页总数缓存及写入后失效"""
+    from app.config import settings
+    from app.repositories import base as base_module
+    
+    monkeypatch.setattr(settings, "count_cache_min_total", 2)
+    base_module._count_cache.clear()
+    
+    for i in range(3):
+        await repository.create({"name": f"用户{i}", "email": f"user{i}@example.com"})
+    
+    assert (await repository.paginate(page=1, page_size=10)).total == 3
+    
+    # 绕过 Repository 直接删除：缓存的总数不变
+    await repository.db.execute(UserModel.__table__.delete().where(UserModel.name == "用户0"))
+    await repository.db.commit()
+    assert (await repository.paginate(page=1, page_size=10)).total == 3
+    
+    # 通过 Repository 写入后缓存失效
+    await repository.create({"name": "用户3", "email": "user3@example.com"})
+    assert (await repository.paginate(page=1, page_size=10)).total == 3
+    
+    base_module._count_cache.clear()
+
+
+async def test_paginate_keyset(repository: UserRepository):
+    """测试游标分页逐页读取"""
+    for i in range(15):
+        await repository.create({
+            "name": f"用户{i}",
+            "email": f"user{i}@example.com",
+            "age": 20 + i // 3  # 每 3 个用户年龄相同
+        })
+    
+    # 按年龄倒序翻页（年龄相同的记录由 id 区分，跨页不重复、不遗漏）
+    seen = []
+    cursor = None
+    for _ in range(10):
+        result = await repository.paginate_keyset(cursor=cursor, page_size=4, order_by="age")
+        seen.extend((user.age, user.id) for user in result.items)
+        if not result.has_next:
+            assert result.next_cursor is None
+            break
+        assert len(result.items) == 4
+        cursor = result.next_cursor
+    
+    assert len(seen) == 15
+    assert len(set(seen)) == 15
+    assert seen == sorted(seen, reverse=True)
+
+
+async def test_paginate_keyset_with_order_and_filter(repository: UserRepository):
+    """测试游标分页的升序排序和过滤条件"""
+    for i in range(6):
+        await repository.create({
+            "name": f"用户{i}",
+            "email": f"user{i}@example.com",
+            "age": 20 + i,
+            "is_active": i % 2 == 0
+        })
+    
+    first = await repository.paginate_keyset(page_size=2, order_by="age", order_desc=False, is_active=True)
+    assert [user.age for user in first.items] == [20, 22]
+    assert first.has_next is True
+    
+    second = await repository.paginate_keyset(
+        cursor=first.next_cursor, page_size=2, order_by="age", order_desc=False, is_active=True
+    )
+    assert [user.age for user in second.items] == [24]
+    assert second.has_next is False
+    assert second.to_dict()["pagination"]["next_cursor"] is None
+    
+    with pytest.raises(ValueError):
+        await repository.paginate_keyset(order_by="not_exists")
+
+
 # ==================== 通用查询测试 ====================
 
-def test_filter_by(repository: UserRepository):
+async def test_filter_by(repository: UserRepository):
     """测试条件过滤查询"""
     # 创建测试数据
-    repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25, "is_active": True})
-    repository.create({"name": "李四", "email": "lisi@example.com", "age": 30, "is_active": True})
-    repository.create({"name": "王五", "email": "wangwu@example.com", "age": 28, "is_active": False})
+    await repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25, "is_active": True})
+    await repository.create({"name": "李四", "email": "lisi@example.com", "age": 30, "is_active": True})
+    await repository.create({"name": "王五", "email": "wangwu@example.com", "age": 28, "is_active": False})
     
     # 单条件过滤
-    users = repository.filter_by(name="张三")
+    users = await repository.filter_by(name="张三")
     assert len(users) == 1
     assert users[0].name == "张三"
     
     # 多条件过滤
-    users = repository.filter_by(is_active=True)
+    users = await repository.filter_by(is_active=True)
     assert len(users) == 2
 
 
-def test_filter_one(repository: UserRepository):
+async def test_filter_one(repository: UserRepository):
     """测试单条记录查询"""
     # 创建测试数据
-    repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
+    await repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
     
     # 查询单条记录
-    user = repository.filter_one(email="zhangsan@example.com")
+    user = await repository.filter_one(email="zhangsan@example.com")
     
     assert user is not None
     assert user.name == "张三"
     assert user.email == "zhangsan@example.com"
 
 
-def test_filter_one_not_found(repository: UserRepository):
+async def test_filter_one_not_found(repository: UserRepository):
     """测试查询不存在的单条记录"""
-    user = repository.filter_one(email="notfound@example.com")
+    user = await repository.filter_one(email="notfound@example.com")
     assert user is None
 
 
-def test_filter_by_dict(repository: UserRepository):
+async def test_filter_by_dict(repository: UserRepository):
     """测试字典条件过滤"""
     # 创建测试数据
-    repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25, "is_active": True})
+    await repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25, "is_active": True})
     
     # 使用字典过滤
-    users = repository.filter_by_dict({"name": "张三", "is_active": True})
+    users = await repository.filter_by_dict({"name": "张三", "is_active": True})
     
     assert len(users) == 1
     assert users[0].name == "张三"
 
 
-def test_search(repository: UserRepository):
+async def test_search(repository: UserRepository):
     """测试关键字搜索"""
     # 创建测试数据
-    repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
-    repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
-    repository.create({"name": "张五", "email": "zhangwu@example.com", "age": 28})
+    await repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
+    await repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
+    await repository.create({"name": "张五", "email": "zhangwu@example.com", "age": 28})
     
     # 在 name 和 email 字段中搜索 "张"
-    users = repository.search(["name", "email"], "张")
+    users = await repository.search(["name", "email"], "张")
     
     assert len(users) == 2
     assert all("张" in user.name or "张" in user.email for user in users)
+    
+    # 只返回指定字段（行元组）
+    rows = await repository.search(["name", "email"], "张", fields=["id", "name"])
+    assert sorted(name for _, name in rows) == ["张三", "张五"]
+    assert all(len(row) == 2 for row in rows)
+    
+    # 返回字段不存在时抛出 ValueError
+    with pytest.raises(ValueError):
+        await repository.search(["name", "email"], "张", fields=["nickname"])
 
 
-def test_search_empty_keyword(repository: UserRepository):
+async def test_search_empty_keyword(repository: UserRepository):
     """测试空关键字搜索"""
-    repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
+    await repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
     
     # 空关键字应该返回空列表
-    users = repository.search(["name", "email"], "")
+    users = await repository.search(["name", "email"], "")
     assert len(users) == 0
 
 
-def test_search_with_pagination(repository: UserRepository):
+async def test_search_with_pagination(repository: UserRepository):
     """测试带分页的关键字搜索"""
     # 创建多条测试数据
     for i in range(10):
-        repository.create({
+        await repository.create({
             "name": f"用户{i}",
             "email": f"user{i}@example.com",
             "age": 20 + i
         })
     
     # 搜索并分页
-    users = repository.search(["name", "email"], "用户", skip=0, limit=5)
+    users = await repository.search(["name", "email"], "用户", skip=0, limit=5)
     
     assert len(users) <= 5
 
 
-def test_query_builder(repository: UserRepository):
+async def test_query_builder(repository: UserRepository):
     """测试查询构建器"""
     # 创建测试数据
-    repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
-    repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
-    repository.create({"name": "王五", "email": "wangwu@example.com", "age": 28})
+    await repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
+    await repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
+    await repository.create({"name": "王五", "email": "wangwu@example.com", "age": 28})
     
     # 使用查询构建器进行复杂查询
-    query = repository.query_builder()
-    users = query.filter(UserModel.age >= 25, UserModel.age <= 30).all()
+    stmt = repository.query_builder().where(UserModel.age >= 25, UserModel.age <= 30)
+    result = await repository.db.execute(stmt)
+    users = result.scalars().all()
     
     assert len(users) == 3
     assert all(25 <= user.age <= 30 for user in users)
@@ -599,19 +787,19 @@ def test_pagination_params():
 
 # ==================== PaginationResult 测试 ====================
 
-def test_pagination_result(db_session: Session):
+async def test_pagination_result(async_db_session: AsyncSession):
     """测试分页结果类"""
     # 创建实际的测试数据
-    repository = UserRepository(db_session)
+    repository = UserRepository(async_db_session)
     for i in range(1, 6):
-        repository.create({
+        await repository.create({
             "name": f"用户{i}",
             "email": f"user{i}@example.com",
             "age": 20 + i
         })
     
     # 创建分页结果
-    result = repository.paginate(page=1, page_size=5)
+    result = await repository.paginate(page=1, page_size=5)
     
     assert len(result.items) == 5
     assert result.total == 5
@@ -620,21 +808,23 @@ def test_pagination_result(db_session: Session):
     assert result.total_pages == 1
     assert result.has_next is False
     assert result.has_prev is False
+    # 总页数和是否有下一页首次访问后缓存在实例上
+    assert {"total_pages", "has_next"} <= vars(result).keys()
 
 
-def test_pagination_result_last_page(db_session: Session):
+async def test_pagination_result_last_page(async_db_session: AsyncSession):
     """测试最后一页的分页结果"""
-    repository = UserRepository(db_session)
+    repository = UserRepository(async_db_session)
     # 创建 20 条记录
     for i in range(20):
-        repository.create({
+        await repository.create({
             "name": f"用户{i}",
             "email": f"user{i}@example.com",
             "age": 20 + i
         })
     
     # 获取最后一页（第 4 页，每页 5 条）
-    result = repository.paginate(page=4, page_size=5)
+    result = await repository.paginate(page=4, page_size=5)
     
     assert result.total == 20
     assert result.total_pages == 4
@@ -643,36 +833,44 @@ def test_pagination_result_last_page(db_session: Session):
     assert len(result.items) == 5  # 最后一页有 5 条记录
 
 
+def test_pagination_result_without_total():
+    """测试未统计总数且未给出 has_next 时的分页结果"""
+    result = PaginationResult(items=[], total=None, page=1, page_size=5)
+    
+    assert result.total_pages is None
+    assert result.has_next is False
+
+
 # ==================== 集成测试 ====================
 
-def test_repository_full_workflow(repository: UserRepository):
+async def test_repository_full_workflow(repository: UserRepository):
     """测试 Repository 完整工作流程"""
     # 1. 创建多条记录
-    user1 = repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
-    user2 = repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
+    user1 = await repository.create({"name": "张三", "email": "zhangsan@example.com", "age": 25})
+    user2 = await repository.create({"name": "李四", "email": "lisi@example.com", "age": 30})
     
     # 2. 查询记录
-    found_user = repository.get_by_id(user1.id)
+    found_user = await repository.get_by_id(user1.id)
     assert found_user is not None
     assert found_user.name == "张三"
     
     # 3. 更新记录（只更新 name，age 保持不变）
-    updated_user = repository.update(user1.id, {"name": "张三更新"})
+    updated_user = await repository.update(user1.id, {"name": "张三更新"})
     assert updated_user is not None
     assert updated_user.name == "张三更新"
     assert updated_user.age == 25  # age 应该保持不变
     
     # 4. 分页查询
-    result = repository.paginate(page=1, page_size=10)
+    result = await repository.paginate(page=1, page_size=10)
     assert result.total == 2
     
     # 5. 条件查询（查询 age=25 的记录，应该还有一条，因为只更新了 name）
-    users = repository.filter_by(age=25)
+    users = await repository.filter_by(age=25)
     assert len(users) == 1  # 更新后 age 仍然是 25
     
     # 6. 删除记录
-    assert repository.delete(user1.id) is True
-    assert repository.get_count() == 1
+    assert await repository.delete(user1.id) is True
+    assert await repository.get_count() == 1
 
 
 # ==================== 运行所有测试 ====================
@@ -1,10 +1,15 @@
 # 测试工具类模块
 import sys
 import json
+import time
 import logging
 import tempfile
 from pathlib import Path
 from io import StringIO
+from unittest.mock import patch
+
+from fastapi import Request
+from pydantic import BaseModel
 
 # 将项目根目录添加到 Python 路径
 project_root = Path(__file__).parent.parent
@@ -15,6 +20,8 @@ from app.utils.logger import (
     logger,
     get_logger,
     setup_logger,
+    start_queue_logging,
+    stop_queue_logging,
     JSONFormatter,
     TextFormatter,
 )
@@ -32,6 +39,12 @@ from app.utils.response import (
     SuccessResponse,
     ErrorResponse,
     success_response,
+    success_json_response,
+    payload_json_response,
+    make_etag,
+    etag_matches,
+    etag_json_response,
+    error_json_response,
     error_response,
 )
 
@@ -46,6 +59,9 @@ from app.utils.exceptions import (
     InternalServerError,
 )
 
+# 测试缓存
+from app.utils.cache import TTLCache
+
 
 # ==================== 日志工具测试 ====================
 
@@ -154,6 +170,38 @@ def test_get_logger():
     print("✓ 获取日志记录器测试通过")
 
 
+def test_queue_logging():
+    """测试日志切换到后台线程输出"""
+    print("\n=== 测试后台线程输出日志 ===")
+    
+    stream = StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JSONFormatter())
+    test_logger = logging.getLogger("test_queue")
+    test_logger.setLevel(logging.INFO)
+    test_logger.handlers = [handler]
+    test_logger.propagate = False
+    
+    start_queue_logging("test_queue")
+    assert test_logger.handlers != [handler], "应替换为队列处理器"
+    
+    test_logger.info("队列日志 %s", "参数")
+    try:
+        raise ValueError("测试异常")
+    except ValueError:
+        test_logger.exception("捕获异常")
+    
+    # 停止后写出剩余日志并恢复原处理器
+    stop_queue_logging("test_queue")
+    assert test_logger.handlers == [handler]
+    
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[0]["message"] == "队列日志 参数"
+    assert "ValueError: 测试异常" in lines[1]["exception"], "应保留异常堆栈"
+    
+    print("✓ 后台线程输出日志测试通过")
+
+
 # ==================== ID 生成器测试 ====================
 
 def test_generate_id_basic():
@@ -278,6 +326,92 @@ def test_success_response():
     print("✓ 成功响应测试通过")
 
 
+def test_success_json_response():
+    """测试直接序列化为 JSON 的成功响应"""
+    print("\n=== 测试 JSON 成功响应 ===")
+    
+    class ItemList(BaseModel):
+        items: list[str]
+        total: int
+    
+    response = success_json_response(
+        data=ItemList(items=["张三", "李四"], total=2),
+        message="获取列表成功"
+    )
+    
+    assert response.status_code == 200
+    assert response.media_type == "application/json"
+    body = json.loads(response.body)
+    assert body["code"] == 200
+    assert body["message"] == "获取列表成功"
+    assert body["data"] == {"items": ["张三", "李四"], "total": 2}
+    assert "timestamp" in body
+    assert list(body.keys()) == ["code", "message", "data", "timestamp"]
+    
+    # 字典数据、None 数据，以及相同 message 复用缓存的前缀
+    response = success_json_response(data={"members": []}, message="获取列表成功")
+    assert json.loads(response.body)["data"] == {"members": []}
+    assert json.loads(response.body)["message"] == "获取列表成功"
+    
+    response = success_json_response(message="操作成功", code=201, status_code=201)
+    assert response.status_code == 201
+    body = json.loads(response.body)
+    assert body["code"] == 201
+    assert body["data"] is None
+    
+    # 预先序列化的 data 与直接传入 data 的响应格式一致
+    response = payload_json_response(b'{"status":"healthy"}', message="服务运行正常")
+    body = json.loads(response.body)
+    assert body["data"] == {"status": "healthy"}
+    assert list(body.keys()) == ["code", "message", "data", "timestamp"]
+    
+    print("✓ JSON 成功响应测试通过")
+
+
+def test_etag_json_response():
+    """测试 ETag 条件响应"""
+    print("\n=== 测试 ETag 条件响应 ===")
+    
+    class Item(BaseModel):
+        id: int
+        name: str
+    
+    etag = make_etag('{"id":1,"name":"张三"}'.encode())
+    assert etag.startswith('W/"')
+    assert make_etag('{"id":1,"name":"李四"}'.encode()) != etag
+    
+    # 弱比较、多个候选值、*
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches(f'W/"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('W/"other"', etag)
+    
+    # 无 If-None-Match：返回完整响应和 ETag
+    request = Request({"type": "http", "headers": []})
+    response = etag_json_response(request, Item(id=1, name="张三"), message="获取成功")
+    assert response.status_code == 200
+    assert response.headers["ETag"] == etag
+    body = json.loads(response.body)
+    assert body["message"] == "获取成功"
+    assert body["data"] == {"id": 1, "name": "张三"}
+    
+    # If-None-Match 匹配：返回 304，无响应体
+    request = Request({"type": "http", "headers": [(b"if-none-match", etag.encode())]})
+    response = etag_json_response(request, Item(id=1, name="张三"))
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.body == b""
+    
+    # 数据变化后 ETag 不再匹配
+    response = etag_json_response(request, Item(id=1, name="李四"))
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    
+    print("✓ ETag 条件响应测试通过")
+
+
 def test_error_response():
     """测试错误响应"""
     print("\n=== 测试错误响应 ===")
@@ -292,6 +426,49 @@ def test_error_response():
     print("✓ 错误响应测试通过")
 
 
+def test_error_json_response():
+    """测试错误响应（直接序列化）"""
+    print("\n=== 测试错误响应（直接序列化） ===")
+    
+    response = error_json_response(code=404, message="用户不存在")
+    assert response.status_code == 404
+    assert response.media_type == "application/json"
+    body = json.loads(response.body)
+    assert body["code"] == 404
+    assert body["message"] == "用户不存在"
+    assert body["details"] is None
+    assert len(body["timestamp"]) == len("2024-01-01T12:00:00"), "时间戳应精确到秒"
+    
+    # HTTP 状态码可与 code 不同；无法直接序列化的详情按字符串输出
+    response = error_json_response(
+        code=422,
+        message="请求数据验证失败",
+        details=[{"ctx": {"error": ValueError("bad")}}],
+        status_code=400,
+    )
+    assert response.status_code == 400
+    body = json.loads(response.body)
+    assert body["code"] == 422
+    assert body["details"] == [{"ctx": {"error": "bad"}}]
+    
+    # message 非字符串（如 HTTPException 的 detail 为字典）时同样可以序列化
+    response = error_json_response(code=400, message={"reason": "bad"})
+    assert json.loads(response.body)["message"] == {"reason": "bad"}
+    
+    # 不包含 details 字段
+    body = json.loads(error_json_response(code=405, message="Method Not Allowed", include_details=False).body)
+    assert set(body) == {"code", "message", "timestamp"}
+    
+    # 错误消息常包含动态内容，不进入成功响应的前缀缓存
+    from app.utils import response as response_module
+    cached = len(response_module._ENVELOPE_PREFIXES)
+    for i in range(3):
+        error_json_response(code=404, message=f"群组 group_{i} 不存在")
+    assert len(response_module._ENVELOPE_PREFIXES) == cached
+    
+    print("✓ 错误响应（直接序列化）测试通过")
+
+
 def test_base_response_model():
     """测试基础响应模型"""
     print("\n=== 测试基础响应模型 ===")
@@ -406,6 +583,68 @@ def test_internal_server_error():
     print("✓ 内部服务器错误异常测试通过")
 
 
+# ==================== 缓存测试 ====================
+
+def test_ttl_cache_basic():
+    """测试缓存读写和删除"""
+    print("\n=== 测试缓存读写 ===")
+    
+    cache = TTLCache(max_size=10, ttl=60)
+    
+    assert cache.get(("user", "user_001")) is None
+    
+    cache.set(("user", "user_001"), {"username": "张三"})
+    assert cache.get(("user", "user_001")) == {"username": "张三"}
+    assert len(cache) == 1
+    
+    cache.delete(("user", "user_001"))
+    assert cache.get(("user", "user_001")) is None
+    
+    # 删除不存在的键不应报错
+    cache.delete(("user", "not_exist"))
+    
+    print("✓ 缓存读写测试通过")
+
+
+def test_ttl_cache_expiration():
+    """测试缓存过期"""
+    print("\n=== 测试缓存过期 ===")
+    
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("key", "value")
+    
+    with patch("app.utils.cache.time.monotonic", return_value=time.monotonic() + 61):
+        assert cache.get("key") is None
+    assert len(cache) == 0
+    
+    # ttl <= 0 时禁用缓存
+    disabled_cache = TTLCache(max_size=10, ttl=0)
+    disabled_cache.set("key", "value")
+    assert disabled_cache.get("key") is None
+    
+    print("✓ 缓存过期测试通过")
+
+
+def test_ttl_cache_lru_eviction():
+    """测试缓存容量上限（LRU 淘汰）"""
+    print("\n=== 测试缓存 LRU 淘汰 ===")
+    
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    
+    # 访问 a，使 b 成为最久未使用的条目
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    
+    print("✓ 缓存 LRU 淘汰测试通过")
+
+
 # ==================== 主测试函数 ====================
 
 def run_all_tests():
@@ -421,6 +660,7 @@ def run_all_tests():
         test_logger_text_format()
         test_logger_file_output()
         test_get_logger()
+        test_queue_logging()
         
         # ID 生成器测试
         test_generate_id_basic()
@@ -433,7 +673,10 @@ def run_all_tests():
         
         # 统一响应格式测试
         test_success_response()
+        test_success_json_response()
+        test_etag_json_response()
         test_error_response()
+        test_error_json_response()
         test_base_response_model()
         
         # 自定义异常类测试
@@ -445,6 +688,11 @@ def run_all_tests():
         test_conflict_error()
         test_internal_server_error()
         
+        # 缓存测试
+        test_ttl_cache_basic()
+        test_ttl_cache_expiration()
+        test_ttl_cache_lru_eviction()
+        
         print("\n" + "=" * 60)
         print("✓ 所有测试通过！")
         print("=" * 60)
@@ -198,6 +198,47 @@ def test_connection_manager_send_personal_message(client):
         assert hasattr(manager, 'send_personal_message')
 
 
+def test_connection_manager_counts(clean_manager):
+    """测试连接数和用户数计数"""
+    import asyncio
+    
+    class FakeWebSocket:
+        async def accept(self):
+            pass
+    
+    ws1, ws2, ws3 = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    
+    async def connect_all():
+        await clean_manager.connect(ws1, "user1")
+        await clean_manager.connect(ws2, "user1")
+        await clean_manager.connect(ws3, "user2")
+        # 重复注册同一连接不重复计数
+        await clean_manager.connect(ws3, "user2")
+    
+    asyncio.run(connect_all())
+    assert clean_manager.get_total_connections_count() == 3
+    assert clean_manager.get_connected_users_count() == 2
+    
+    clean_manager.disconnect(ws1)
+    clean_manager.disconnect(ws1)  # 重复注销不重复计数
+    assert clean_manager.get_total_connections_count() == 2
+    
+    clean_manager.disconnect(ws2)
+    assert clean_manager.get_total_connections_count() == 1
+    assert clean_manager.get_connected_users_count() == 1
+
+
+def test_handler_slots():
+    """测试处理器使用 __slots__，实例不创建 __dict__"""
+    from app.websocket import SimpleWebSocketHandler, IMWebSocketHandler
+    
+    for handler_class in (SimpleWebSocketHandler, IMWebSocketHandler):
+        handler = handler_class("user1")
+        assert handler.user_id == "user1"
+        assert handler.websocket is None
+        assert not hasattr(handler, "__dict__")
+
+
 # ==================== 统计接口测试 ====================
 
 def test_websocket_stats_endpoint(client):
@@ -226,14 +267,23 @@ def test_websocket_stats_with_connections(client):
     with client.websocket_connect("/ws/stats_user") as websocket:
         websocket.receive_json()  # 接收欢迎消息
         
-        # 获取统计信息
+        # 获取统计信息（默认不列出用户）
         response = client.get("/ws/stats")
         assert response.status_code == 200
         
         data = response.json()["data"]
         assert data["total_connections"] >= 1
         assert data["connected_users_count"] >= 1
+        assert data["connected_users"] == []
+        
+        # verbose=1 时返回用户列表
+        data = client.get("/ws/stats", params={"verbose": 1}).json()["data"]
         assert "stats_user" in data["connected_users"]
+    
+    # 断开后计数同步减少
+    data = client.get("/ws/stats").json()["data"]
+    assert data["total_connections"] == manager.get_total_connections_count()
+    assert "stats_user" not in manager.get_connected_users()
 
 
 # ==================== 错误处理测试 ====================
@@ -269,7 +319,7 @@ def test_websocket_multiple_users(client):
             ws2.receive_json()  # 接收欢迎消息
             
             # 检查统计信息
-            response = client.get("/ws/stats")
+            response = client.get("/ws/stats", params={"verbose": 1})
             data = response.json()["data"]
             
             assert data["total_connections"] >= 2